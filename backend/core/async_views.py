@@ -0,0 +1,79 @@
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial, wraps
+from django.conf import settings
+from django.db import close_old_connections
+from core.server_timing import timed
+import asyncio
+import contextvars
+import threading
+
+
+# Bounded thread pools for blocking view work under ASGI. A handful of slow
+# analytics requests queue up in their own pool instead of occupying the
+# threads that serve quick CRUD requests.
+POOL_SIZE_SETTINGS = {
+    'analytics': ('ANALYTICS_EXECUTOR_WORKERS', 2),
+    'batch': ('BATCH_EXECUTOR_WORKERS', 2),
+}
+
+_executors = {}
+_executors_lock = threading.Lock()
+
+
+def get_executor(pool):
+    with _executors_lock:
+        if pool not in _executors:
+            setting, default = POOL_SIZE_SETTINGS[pool]
+            _executors[pool] = ThreadPoolExecutor(
+                max_workers=getattr(settings, setting, default),
+                thread_name_prefix=f'{pool}-view'
+            )
+        return _executors[pool]
+
+
+def _run_view(view, request, *args, **kwargs):
+    # Pool threads outlive requests, so apply CONN_MAX_AGE the way the
+    # request_started/request_finished signals do for regular requests
+    close_old_connections()
+    try:
+        response = view(request, *args, **kwargs)
+        # Render here too; serializing a large report is blocking work as well
+        if hasattr(response, 'render') and callable(response.render):
+            with timed('render'):
+                response = response.render()
+        return response
+    finally:
+        close_old_connections()
+
+
+def async_view(view_class, pool='analytics', **initkwargs):
+    """
+    Async Django view that runs a DRF APIView in the bounded ``pool``.
+
+    The wrapper keeps ``cls`` and exposes the plain view as ``sync_view``, so
+    the batch endpoint can call it directly from its own worker threads.
+    """
+    sync_view = view_class.as_view(**initkwargs)
+
+    # wraps() also carries over csrf_exempt; Django 4.2's decorator would make the view sync
+    @wraps(sync_view)
+    async def view(request, *args, **kwargs):
+        loop = asyncio.get_running_loop()
+        # Run in a copy of this context so the request's timing and routing apply
+        return await loop.run_in_executor(
+            get_executor(pool), contextvars.copy_context().run,
+            partial(_run_view, sync_view, request, *args, **kwargs)
+        )
+
+    view.sync_view = sync_view
+    return view
+
+
+def serving_view(view_class, pool='analytics', **initkwargs):
+    """
+    ``view_class.as_view()`` for WSGI, or its ``async_view`` wrapper when the
+    app is served through vendingapp.asgi (settings.ASYNC_VIEWS).
+    """
+    if getattr(settings, 'ASYNC_VIEWS', False):
+        return async_view(view_class, pool=pool, **initkwargs)
+    return view_class.as_view(**initkwargs)
@@ -0,0 +1,93 @@
+from collections import OrderedDict
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db.models.signals import post_save, post_delete
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.settings import api_settings
+import copy
+import threading
+import time
+
+
+class UserCache:
+    """
+    Small per-process TTL cache of authenticated users, keyed by
+    (user id, token version). Entries for a user are evicted when the user
+    row is saved or deleted.
+    """
+
+    def __init__(self, ttl, max_size):
+        self.ttl = ttl
+        self.max_size = max_size
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            user, expires_at = entry
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return user
+
+    def set(self, key, user):
+        if self.ttl <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (user, time.monotonic() + self.ttl)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def evict_user(self, user_id):
+        user_id = str(user_id)
+        with self._lock:
+            for key in [key for key in self._entries if key[0] == user_id]:
+                del self._entries[key]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+user_cache = UserCache(
+    ttl=getattr(settings, 'AUTH_USER_CACHE_TTL', 30),
+    max_size=getattr(settings, 'AUTH_USER_CACHE_SIZE', 1024),
+)
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """
+    JWTAuthentication that skips the user query for recently seen tokens.
+
+    The cache key includes the token's password-hash claim (simplejwt's
+    CHECK_REVOKE_TOKEN), so tokens issued before a password change never match
+    a user cached after it. Saving or deleting a user evicts it in this process;
+    other processes see the change within AUTH_USER_CACHE_TTL seconds.
+    """
+
+    def get_user(self, validated_token):
+        user_id = validated_token.get(api_settings.USER_ID_CLAIM)
+        key = (str(user_id), validated_token.get(api_settings.REVOKE_TOKEN_CLAIM))
+
+        user = user_cache.get(key)
+        if user is None:
+            # Looks the user up and applies the is_active and revocation checks
+            user = super().get_user(validated_token)
+            user_cache.set(key, user)
+
+        # Requests may set attributes on request.user; keep the cached copy clean
+        return copy.copy(user)
+
+
+def evict_cached_user(sender, instance, **kwargs):
+    """Drop a user from the cache when its password, is_active flag or anything else changes"""
+    user_cache.evict_user(getattr(instance, api_settings.USER_ID_FIELD))
+
+
+post_save.connect(evict_cached_user, sender=get_user_model(), dispatch_uid='evict_cached_user_on_save')
+post_delete.connect(evict_cached_user, sender=get_user_model(), dispatch_uid='evict_cached_user_on_delete')
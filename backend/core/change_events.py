@@ -0,0 +1,94 @@
+from asgiref.sync import sync_to_async
+from datetime import timedelta
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+from core.models import ChangeEvent, Machine
+import asyncio
+import threading
+
+
+# Wakes streams in this process as soon as an event is stored; streams in other
+# processes pick it up on their next poll of the ChangeEvent table
+_new_event = threading.Condition()
+# The same for async streams (ASGI): (loop, asyncio.Event) per waiting stream
+_async_waiters = set()
+_async_waiters_lock = threading.Lock()
+
+
+def _ids(values):
+    return sorted({int(value) for value in values if value is not None})
+
+
+def publish_change(kind, locations=(), machines=(), products=()):
+    """
+    Notify change stream clients once the current transaction commits.
+    Rolled-back writes publish nothing. Locations are derived from ``machines``
+    when not given; an empty scope list means the change may touch any of them.
+    """
+    payload = {
+        'kind': kind,
+        'locations': _ids(locations),
+        'machines': _ids(machines),
+        'products': _ids(products),
+    }
+    transaction.on_commit(lambda: _store_event(payload))
+
+
+def _store_event(payload):
+    if payload['machines'] and not payload['locations']:
+        payload['locations'] = _ids(
+            Machine.objects.filter(id__in=payload['machines']).values_list('location_id', flat=True)
+        )
+    event = ChangeEvent.objects.create(**payload)
+
+    # Prune now and then instead of on every write
+    if event.id % 100 == 0:
+        retention = getattr(settings, 'CHANGE_EVENT_RETENTION_HOURS', 24)
+        ChangeEvent.objects.filter(created_at__lt=timezone.now() - timedelta(hours=retention)).delete()
+
+    with _new_event:
+        _new_event.notify_all()
+    with _async_waiters_lock:
+        waiters = list(_async_waiters)
+    for loop, waiter in waiters:
+        loop.call_soon_threadsafe(waiter.set)
+
+
+def latest_version():
+    return ChangeEvent.objects.order_by('-id').values_list('id', flat=True).first() or 0
+
+
+def events_after(version, limit=100):
+    return list(ChangeEvent.objects.filter(id__gt=version).order_by('id')[:limit])
+
+
+def wait_for_events(version, timeout):
+    """Events newer than ``version``, waiting up to ``timeout`` seconds for one to arrive"""
+    events = events_after(version)
+    if events or timeout <= 0:
+        return events
+
+    with _new_event:
+        _new_event.wait(timeout)
+    return events_after(version)
+
+
+async def await_events(version, timeout):
+    """wait_for_events for async streams: waits on the event loop instead of holding a thread"""
+    waiter = (asyncio.get_running_loop(), asyncio.Event())
+    # Registered before the first read so an event stored in between still wakes us
+    with _async_waiters_lock:
+        _async_waiters.add(waiter)
+    try:
+        events = await sync_to_async(events_after)(version)
+        if events or timeout <= 0:
+            return events
+        try:
+            await asyncio.wait_for(waiter[1].wait(), timeout)
+        except asyncio.TimeoutError:
+            pass
+    finally:
+        with _async_waiters_lock:
+            _async_waiters.discard(waiter)
+    return await sync_to_async(events_after)(version)
@@ -0,0 +1,153 @@
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from contextlib import contextmanager
+from contextvars import ContextVar
+from django.conf import settings
+from django.core.cache import caches
+from django.db import DatabaseError, connections
+from rest_framework.permissions import SAFE_METHODS
+import logging
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+
+# Alias that reads in the current request or command go to; None means default
+_read_alias = ContextVar('read_alias', default=None)
+
+_replica_down_until = 0.0
+_replica_lock = threading.Lock()
+
+PIN_COOKIE = 'primary_pin'
+
+
+def replica_configured():
+    return getattr(settings, 'REPLICA_DATABASE_ALIAS', 'replica') in settings.DATABASES
+
+
+def replica_alias():
+    """
+    The replica alias when it is configured and reachable, otherwise None.
+    A replica that fails to connect is skipped for REPLICA_RETRY_SECONDS.
+    """
+    global _replica_down_until
+    if not replica_configured() or time.monotonic() < _replica_down_until:
+        return None
+    alias = getattr(settings, 'REPLICA_DATABASE_ALIAS', 'replica')
+    try:
+        connections[alias].ensure_connection()
+    except DatabaseError:
+        logger.warning('Replica database %s unavailable; reading from primary', alias, exc_info=True)
+        with _replica_lock:
+            _replica_down_until = time.monotonic() + getattr(settings, 'REPLICA_RETRY_SECONDS', 30)
+        return None
+    return alias
+
+
+@contextmanager
+def replica_reads(enabled=True):
+    """Send ORM reads inside the block to the replica, when there is a usable one"""
+    token = _read_alias.set(replica_alias() if enabled else None)
+    try:
+        yield
+    finally:
+        _read_alias.reset(token)
+
+
+def read_connection():
+    """Connection for raw SQL reads, following the same routing as the ORM"""
+    return connections[_read_alias.get() or 'default']
+
+
+class ReplicaRouter:
+    """
+    Reads go to the replica only inside replica_reads(), i.e. analytics and
+    report views and the analytics cache warmup. Everything else, and every
+    write, uses the primary.
+    """
+
+    def db_for_read(self, model, **hints):
+        return _read_alias.get()
+
+    def db_for_write(self, model, **hints):
+        return 'default'
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Replica rows are copies of primary rows
+        return True
+
+
+def pin_cache():
+    """Shared by all worker processes (settings.CACHES['replica_pins']), unlike the default cache"""
+    return caches['replica_pins']
+
+
+def _user_pin_key(user_id):
+    return f'replica_pin_user:{user_id}'
+
+
+def pin_to_primary(request, response):
+    """Keep this client, and this user, reading from the primary while the replica catches up"""
+    seconds = getattr(settings, 'REPLICA_STICKY_SECONDS', 15)
+    response.set_cookie(PIN_COOKIE, '1', max_age=seconds, httponly=True, samesite='Lax')
+    user = getattr(request, 'user', None)
+    if user is not None and user.is_authenticated:
+        pin_cache().set(_user_pin_key(user.pk), True, seconds)
+
+
+def is_pinned_to_primary(request):
+    if request.COOKIES.get(PIN_COOKIE):
+        return True
+    user = getattr(request, 'user', None)
+    return bool(user is not None and user.is_authenticated and pin_cache().get(_user_pin_key(user.pk)))
+
+
+class ReplicaStickinessMiddleware:
+    """
+    After a successful write, pin the client to the primary for
+    REPLICA_STICKY_SECONDS so a driver who just saved a visit sees it in
+    their reports. DRF sets request.user for JWT requests during the view.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        response = self.get_response(request)
+        if self.should_pin(request, response):
+            pin_to_primary(request, response)
+        return response
+
+    async def __acall__(self, request):
+        response = await self.get_response(request)
+        if self.should_pin(request, response):
+            # Reads the session user and writes the pin cache: blocking work, but only after writes
+            await sync_to_async(pin_to_primary)(request, response)
+        return response
+
+    def should_pin(self, request, response):
+        return request.method not in SAFE_METHODS and response.status_code < 400 and replica_configured()
+
+
+class ReplicaReadViewMixin:
+    """APIView mixin that serves the view's reads from the replica unless the client is pinned"""
+
+    def dispatch(self, request, *args, **kwargs):
+        token = _read_alias.set(None)
+        try:
+            return super().dispatch(request, *args, **kwargs)
+        finally:
+            _read_alias.reset(token)
+
+    def initial(self, request, *args, **kwargs):
+        # Authentication runs here, so the user is known for stickiness
+        super().initial(request, *args, **kwargs)
+        if replica_configured() and not is_pinned_to_primary(request):
+            _read_alias.set(replica_alias())
@@ -0,0 +1,197 @@
+from datetime import timedelta
+from decimal import Decimal, ROUND_CEILING, ROUND_HALF_UP
+from django.contrib.auth.models import User
+from django.utils import timezone
+from core.models import (
+    Location, Machine, Product, MachineItemPrice, Visit, VisitMachineRestock, RestockEntry, ProductCost,
+    Supplier, WholesalePurchase
+)
+import random
+
+
+BATCH_SIZE = 2000
+MACHINE_TYPES = ['Snack', 'Soda', 'Combo']
+SUPPLIERS = ["Sam's Club", 'Costco', 'Restaurant Depot', 'Walmart']
+CENT = Decimal('0.01')
+PRICE_STEP = Decimal('0.25')
+
+
+def _price_for(unit_cost, markup):
+    """Shelf price for ``unit_cost``, rounded up to a quarter like the real machines"""
+    steps = (unit_cost * markup / PRICE_STEP).to_integral_value(rounding=ROUND_CEILING)
+    return max(steps, 2) * PRICE_STEP
+
+
+def _chunks(items, size):
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+def generate_fleet(locations=20, machines_per_location=3, products=40, slots=20, weeks=52,
+                   seed=0, username='fleet-driver', end=None, purchase_weeks=4,
+                   batch_size=BATCH_SIZE, progress=None):
+    """
+    Create a synthetic fleet with a weekly visit history in bulk.
+
+    Every location is visited about once a week (some weeks are skipped) and
+    every machine restocked to its slot capacity. Units sold between visits
+    follow a per-slot demand rate, so the demand analytics have something to
+    find. Products are bought every ``purchase_weeks`` at a drifting unit
+    cost, and machine prices follow each product's latest cost.
+
+    The same ``seed`` and ``end`` (default: now, to the second) give the same
+    dataset. Visits, restocks and entries are written ``batch_size`` rows at a
+    time per group of locations, so memory stays flat however many weeks are
+    generated. ``progress(name, count)`` is called after each batch. Returns
+    the created row counts.
+    """
+    rng = random.Random(seed)
+    end = (end or timezone.now()).replace(microsecond=0)
+    start = end - timedelta(weeks=weeks)
+    user, _ = User.objects.get_or_create(username=username)
+    counts = dict.fromkeys([
+        'locations', 'machines', 'products', 'suppliers', 'purchases', 'cost_records', 'machine_items',
+        'visits', 'machine_restocks', 'restock_entries'
+    ], 0)
+
+    def report(name, count):
+        counts[name] += count
+        if progress:
+            progress(name, counts[name])
+
+    created_locations = Location.objects.bulk_create([
+        Location(name=f'Fleet Location {number}', address=f'{number} Fleet Way', route=f'R{number % 5}')
+        for number in range(1, locations + 1)
+    ], batch_size=batch_size)
+    report('locations', len(created_locations))
+
+    created_products = Product.objects.bulk_create([
+        Product(
+            name=f'Fleet Product {number}',
+            product_type='Soda' if number % 2 else 'Snack',
+            inventory_quantity=1000000
+        )
+        for number in range(1, products + 1)
+    ], batch_size=batch_size)
+    report('products', len(created_products))
+
+    # Cost history: a purchase every purchase_weeks whose unit cost drifts a
+    # few percent each time, mostly upwards
+    suppliers = [
+        Supplier.objects.get_or_create(name=name)[0] for name in SUPPLIERS
+    ]
+    report('suppliers', len(suppliers))
+    purchase_dates = [start + timedelta(weeks=week) for week in range(0, weeks + 1, max(purchase_weeks, 1))]
+    purchases, latest_cost = [], {}
+    for product in created_products:
+        unit_cost = Decimal(rng.randint(30, 120)) / 100
+        for date in purchase_dates:
+            unit_cost = max(CENT * 10, (unit_cost * Decimal(rng.uniform(0.97, 1.05))).quantize(CENT, ROUND_HALF_UP))
+            quantity = rng.choice([24, 36, 48, 96])
+            purchases.append(WholesalePurchase(
+                product=product, supplier=rng.choice(suppliers), quantity=quantity,
+                total_cost=unit_cost * quantity, purchased_at=date - timedelta(hours=rng.randint(0, 72)),
+                inventory_updated=True
+            ))
+        latest_cost[product.id] = unit_cost
+    for batch in _chunks(purchases, batch_size):
+        # bulk_create skips the post_save signal, so the cost records are written here
+        WholesalePurchase.objects.bulk_create(batch)
+        records = [
+            ProductCost(
+                product_id=purchase.product_id, purchase=purchase, date=purchase.purchased_at,
+                quantity=purchase.quantity, unit_cost=purchase.unit_cost.quantize(CENT),
+                total_cost=purchase.total_cost
+            )
+            for purchase in batch
+        ]
+        ProductCost.objects.bulk_create(records)
+        report('purchases', len(batch))
+        report('cost_records', len(records))
+
+    machines = Machine.objects.bulk_create([
+        Machine(name=f'Machine {number}', location=location, machine_type=MACHINE_TYPES[number % 3])
+        for location in created_locations
+        for number in range(1, machines_per_location + 1)
+    ], batch_size=batch_size)
+    report('machines', len(machines))
+
+    # Each slot: (product, capacity, mean units sold per day); shelf prices
+    # were repriced along with the cost drift and end at a markup on the latest cost
+    slot_plan = {
+        machine.id: [
+            (product, rng.randint(8, 20), rng.uniform(0.2, 3.0))
+            for product in rng.sample(created_products, min(slots, len(created_products)))
+        ]
+        for machine in machines
+    }
+    items = [
+        MachineItemPrice(
+            machine=machine, product=product, slot=slot,
+            price=_price_for(latest_cost[product.id], Decimal(rng.uniform(1.8, 3.2))),
+            current_stock=capacity
+        )
+        for machine in machines
+        for slot, (product, capacity, rate) in enumerate(slot_plan[machine.id], start=1)
+    ]
+    for batch in _chunks(items, batch_size):
+        MachineItemPrice.objects.bulk_create(batch)
+        report('machine_items', len(batch))
+
+    machines_by_location = {}
+    for machine in machines:
+        machines_by_location.setdefault(machine.location_id, []).append(machine)
+
+    # Visit history, a few locations at a time: about batch_size restock entries per group
+    entries_per_location = max(1, weeks * machines_per_location * min(slots, len(created_products)))
+    group_size = max(1, batch_size // entries_per_location)
+    stock = {}
+    previous_date = {}
+    for location_group in _chunks(created_locations, group_size):
+        visits = Visit.objects.bulk_create([
+            Visit(
+                location=location, user=user,
+                visit_date=end - timedelta(weeks=week, hours=rng.randint(0, 48))
+            )
+            for location in location_group
+            for week in range(weeks, 0, -1)
+            # Holidays and sick days
+            if rng.random() >= 0.05
+        ], batch_size=batch_size)
+        report('visits', len(visits))
+
+        restocks = VisitMachineRestock.objects.bulk_create([
+            VisitMachineRestock(visit=visit, machine=machine)
+            for visit in visits
+            for machine in machines_by_location.get(visit.location_id, [])
+        ], batch_size=batch_size)
+        report('machine_restocks', len(restocks))
+
+        entries = []
+        for restock in restocks:
+            visit = restock.visit
+            for product, capacity, rate in slot_plan[restock.machine_id]:
+                key = (restock.machine_id, product.id)
+                days = (visit.visit_date - previous_date.get(key, visit.visit_date - timedelta(weeks=1))).days
+                sold = min(stock.get(key, capacity), int(rng.expovariate(1 / (rate * max(days, 1)))))
+                stock_before = stock.get(key, capacity) - sold
+                discarded = 1 if stock_before and rng.random() < 0.05 else 0
+                restocked = capacity - stock_before + discarded
+                entries.append(RestockEntry(
+                    visit_machine_restock=restock, product=product,
+                    stock_before=stock_before, discarded=discarded, restocked=restocked,
+                    # Known here, so bulk_create need not look them up
+                    visit_date=visit.visit_date, machine_id=restock.machine_id,
+                    location_id=visit.location_id
+                ))
+                stock[key] = capacity
+                previous_date[key] = visit.visit_date
+            if len(entries) >= batch_size:
+                RestockEntry.objects.bulk_create(entries, batch_size=batch_size)
+                report('restock_entries', len(entries))
+                entries = []
+        if entries:
+            RestockEntry.objects.bulk_create(entries, batch_size=batch_size)
+            report('restock_entries', len(entries))
+
+    return counts
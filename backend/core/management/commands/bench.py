@@ -0,0 +1,259 @@
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext, override_settings
+from django.utils import timezone
+from rest_framework.test import APIClient
+from core.fleet_generator import generate_fleet
+from core.management.commands.benchmark_serving import percentile
+from core.models import Location, MachineItemPrice
+from core.query_plans import analyze_tables
+import django
+import json
+import os
+import platform
+import statistics
+import time
+import tracemalloc
+
+
+DEFAULT_BASELINE = os.path.join(settings.BASE_DIR, 'backend', 'benchmarks', 'baseline.json')
+
+# Dataset sizes: generate_fleet arguments
+SIZES = {
+    'small': {'locations': 5, 'machines_per_location': 2, 'products': 20, 'slots': 10, 'weeks': 26},
+    'medium': {'locations': 20, 'machines_per_location': 3, 'products': 40, 'slots': 20, 'weeks': 52},
+    'large': {'locations': 100, 'machines_per_location': 5, 'products': 80, 'slots': 24, 'weeks': 104},
+}
+
+# (name, method, url, vendor or None). GETs run cold (empty cache) and warm;
+# the analytics cache is the only cache, so list endpoints only run cold.
+CASES = [
+    ('dashboard', 'get', '/api/dashboard/?days=30', None),
+    ('demand', 'get', '/api/analytics/demand/?days=30', None),
+    ('revenue-profit', 'get', '/api/analytics/revenue-profit/?days=30', None),
+    ('stock-levels', 'get', '/api/analytics/stock-levels/?location={location}', None),
+    ('advanced-demand', 'get', '/api/analytics/advanced-demand/?days=90', 'postgresql'),
+    ('current-stock', 'get', '/api/inventory/current-stock/', None),
+    ('restock-summary', 'get', '/api/inventory/restock-summary/?days=30', None),
+    ('stock-coverage', 'get', '/api/inventory/stock-coverage/', None),
+    ('products', 'get', '/api/products/', None),
+    ('visits', 'get', '/api/visits/', None),
+    ('restock-entries', 'get', '/api/restock-entries/', None),
+    ('machine-items', 'get', '/api/machine-items/?machine={machine}', None),
+    ('bulk-save', 'post', '/api/visits/bulk-save/', None),
+]
+WARM_CASES = {'dashboard', 'demand', 'revenue-profit', 'stock-levels', 'advanced-demand',
+              'current-stock', 'restock-summary', 'stock-coverage'}
+
+
+def summarize(latencies, queries, peak):
+    return {
+        'p50_ms': round(percentile(latencies, 0.5), 2),
+        'p95_ms': round(percentile(latencies, 0.95), 2),
+        'max_ms': round(max(latencies), 2),
+        'queries': int(statistics.median(queries)),
+        'peak_kb': round(peak / 1024, 1),
+    }
+
+
+def compare(results, baseline, threshold):
+    """
+    Regressions of ``results`` against ``baseline``: a p50 latency or peak
+    memory more than ``threshold`` above it, or any extra queries.
+    """
+    regressions = []
+    for size, cases in results.items():
+        for case, modes in cases.items():
+            for mode, stats in modes.items():
+                base = baseline.get(size, {}).get(case, {}).get(mode)
+                if not base:
+                    continue
+                label = f'{size}/{case}/{mode}'
+                if stats['queries'] > base['queries']:
+                    regressions.append(f"{label}: {stats['queries']} queries (baseline {base['queries']})")
+                for metric in ('p50_ms', 'peak_kb'):
+                    if stats[metric] > base[metric] * (1 + threshold):
+                        regressions.append(f'{label}: {metric} {stats[metric]} (baseline {base[metric]})')
+    return regressions
+
+
+class Command(BaseCommand):
+    help = (
+        'Benchmark the analytics, list and bulk-save endpoints on generated datasets, cold and warm, '
+        'and compare latency, query counts and peak memory against a stored baseline'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--sizes', default='small,medium',
+            help=f"Comma-separated dataset sizes: {', '.join(SIZES)} (default: small,medium)"
+        )
+        parser.add_argument('--repeat', type=int, default=5, help='Measured requests per case and mode (default: 5)')
+        parser.add_argument('--only', help='Comma-separated case names to run')
+        parser.add_argument('--seed', type=int, default=0, help='Dataset seed (default: 0)')
+        parser.add_argument('--output', help='Write the results to this JSON file')
+        parser.add_argument(
+            '--baseline', default=DEFAULT_BASELINE,
+            help='Baseline JSON to compare against (default: backend/benchmarks/baseline.json)'
+        )
+        parser.add_argument(
+            '--threshold', type=float, default=0.25,
+            help='Allowed slowdown or memory growth over the baseline, as a fraction (default: 0.25)'
+        )
+        parser.add_argument('--update-baseline', action='store_true', help='Write the results as the new baseline')
+
+    def handle(self, *args, **options):
+        sizes = [size.strip() for size in options['sizes'].split(',')]
+        unknown = [size for size in sizes if size not in SIZES]
+        if unknown:
+            raise CommandError(f"Unknown size(s): {', '.join(unknown)}")
+        only = {name.strip() for name in options['only'].split(',')} if options['only'] else None
+        if Location.objects.exists():
+            # Results are only comparable between runs on the same generated data
+            raise CommandError('bench needs an empty database, e.g. DATABASE_URL=sqlite:///bench.sqlite3')
+
+        results = {}
+        for size in sizes:
+            self.stdout.write(f'== {size} ==')
+            results[size] = self.run_size(size, only, options)
+
+        report = {
+            'meta': {
+                'created_at': timezone.now().isoformat(),
+                'vendor': connection.vendor,
+                'python': platform.python_version(),
+                'django': django.get_version(),
+                'repeat': options['repeat'],
+                'seed': options['seed'],
+            },
+            'results': results,
+        }
+        if options['output']:
+            self.write_json(options['output'], report)
+        if options['update_baseline']:
+            self.write_json(options['baseline'], report)
+            self.stdout.write(self.style.SUCCESS(f"Baseline written to {options['baseline']}"))
+            return
+
+        self.check_baseline(results, options)
+
+    def run_size(self, size, only, options):
+        results = {}
+        with transaction.atomic():
+            # Fixed to the day: the same seed gives the same data relative to "now",
+            # which is what the analytics date windows look at
+            end = timezone.now().replace(hour=0, minute=0, second=0, microsecond=0)
+            generate_fleet(seed=options['seed'], end=end, username='bench-driver', **SIZES[size])
+            analyze_tables()
+            user = get_user_model().objects.get(username='bench-driver')
+            client = APIClient()
+            client.force_authenticate(user=user)
+            placeholders = self.get_placeholders()
+
+            with override_settings(
+                ALLOWED_HOSTS=[*settings.ALLOWED_HOSTS, 'testserver'],
+                SERVER_TIMING_LOG_SAMPLE_RATE=0, SERVER_TIMING_SLOW_MS=float('inf'),
+            ):
+                for name, method, url, vendor in CASES:
+                    if (only and name not in only) or (vendor and vendor != connection.vendor):
+                        continue
+                    url = url.format(**placeholders)
+                    modes = ['cold', 'warm'] if name in WARM_CASES else ['cold']
+                    results[name] = {
+                        mode: self.measure(client, method, url, placeholders, mode, options['repeat'])
+                        for mode in modes
+                    }
+                    for mode, stats in results[name].items():
+                        self.stdout.write(
+                            f"{name:<18}{mode:<6}p50 {stats['p50_ms']:>9.1f} ms  p95 {stats['p95_ms']:>9.1f} ms  "
+                            f"{stats['queries']:>4} queries  peak {stats['peak_kb']:>9.1f} KB"
+                        )
+            # Never keep the generated fleet
+            transaction.set_rollback(True)
+        cache.clear()
+        return results
+
+    def get_placeholders(self):
+        items = list(
+            MachineItemPrice.objects.order_by('machine_id', 'slot').values('machine_id', 'product_id', 'current_stock')
+        )
+        machine = items[0]['machine_id']
+        return {
+            'location': Location.objects.order_by('id').values_list('id', flat=True).first(),
+            'machine': machine,
+            'bulk_save': {
+                'visit': {
+                    'location': Location.objects.get(machines__id=machine).id,
+                    'visit_date': timezone.now().isoformat(),
+                },
+                'machine_restocks': [{
+                    'machine': machine,
+                    'restock_entries': [
+                        {'product': item['product_id'], 'stock_before': 2, 'discarded': 0, 'restocked': 6}
+                        for item in items if item['machine_id'] == machine
+                    ],
+                }],
+            },
+        }
+
+    def measure(self, client, method, url, placeholders, mode, repeat):
+        def run():
+            if mode == 'cold':
+                cache.clear()
+            self.request(client, method, url, placeholders)
+
+        if mode == 'warm':
+            cache.clear()
+            self.request(client, method, url, placeholders)
+
+        latencies, queries = [], []
+        for _ in range(repeat):
+            with CaptureQueriesContext(connection) as captured:
+                started = time.perf_counter()
+                run()
+                latencies.append((time.perf_counter() - started) * 1000)
+            queries.append(len(captured.captured_queries))
+
+        # tracemalloc slows everything down, so memory gets a run of its own
+        tracemalloc.start()
+        try:
+            run()
+            peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+        return summarize(latencies, queries, peak)
+
+    def request(self, client, method, url, placeholders):
+        if method == 'post':
+            response = client.post(url, placeholders['bulk_save'], format='json')
+        else:
+            response = client.get(url)
+        if response.status_code >= 400:
+            raise CommandError(f'{method.upper()} {url} returned {response.status_code}')
+        return response
+
+    def check_baseline(self, results, options):
+        try:
+            with open(options['baseline']) as f:
+                baseline = json.load(f)['results']
+        except FileNotFoundError:
+            self.stdout.write(self.style.WARNING(
+                f"No baseline at {options['baseline']}; run with --update-baseline to create one."
+            ))
+            return
+
+        regressions = compare(results, baseline, options['threshold'])
+        if regressions:
+            for regression in regressions:
+                self.stdout.write(self.style.ERROR(regression))
+            raise CommandError(f'{len(regressions)} regression(s) against {options["baseline"]}')
+        self.stdout.write(self.style.SUCCESS(f"No regressions over {options['threshold']:.0%} against the baseline."))
+
+    def write_json(self, path, report):
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with open(path, 'w') as f:
+            json.dump(report, f, indent=2, sort_keys=True)
+            f.write('\n')
@@ -0,0 +1,137 @@
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.test import AsyncClient, Client
+from rest_framework_simplejwt.tokens import AccessToken
+from concurrent.futures import ThreadPoolExecutor
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import time
+
+
+def percentile(values, fraction):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(fraction * (len(ordered) - 1))))]
+
+
+class Command(BaseCommand):
+    help = (
+        'Compare tail latency of quick API requests while slow analytics requests run, '
+        'served through the WSGI handler (bounded worker threads) and the ASGI handler '
+        '(async analytics views on their bounded executor)'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--mode', choices=['both', 'wsgi', 'asgi'], default='both')
+        parser.add_argument('--quick', type=int, default=200, help='Number of quick requests (default: 200)')
+        parser.add_argument('--slow', type=int, default=4, help='Number of slow requests (default: 4)')
+        parser.add_argument('--quick-url', default='/api/locations/')
+        parser.add_argument('--slow-url', default='/api/inventory/stock-coverage/')
+        parser.add_argument(
+            '--threads', type=int, default=8,
+            help='WSGI worker threads to emulate, e.g. 4 workers x 2 threads (default: 8)'
+        )
+        parser.add_argument('--user', help='Username to authenticate as (default: first superuser)')
+        parser.add_argument('--json', action='store_true', help='Print raw results as JSON')
+
+    def handle(self, *args, **options):
+        if options['mode'] == 'both':
+            # Routes are chosen when core.urls is imported, so each mode runs in its own process
+            results = [self.run_mode_in_subprocess(mode, options) for mode in ('wsgi', 'asgi')]
+        else:
+            if (options['mode'] == 'asgi') != settings.ASYNC_VIEWS:
+                raise CommandError(f"Run --mode {options['mode']} with ASYNC_VIEWS={options['mode'] == 'asgi'}.")
+            results = [self.run_mode(options)]
+
+        if options['json']:
+            self.stdout.write(json.dumps(results))
+            return
+
+        self.stdout.write(f"{'mode':<6}{'kind':<7}{'count':>7}{'errors':>8}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'max ms':>10}")
+        for result in results:
+            for kind in ('quick', 'slow'):
+                stats = result[kind]
+                self.stdout.write(
+                    f"{result['mode']:<6}{kind:<7}{stats['count']:>7}{stats['errors']:>8}"
+                    f"{stats['p50']:>10.1f}{stats['p95']:>10.1f}{stats['p99']:>10.1f}{stats['max']:>10.1f}"
+                )
+            self.stdout.write(f"{result['mode']:<6}total wall time {result['wall_ms']:.0f} ms")
+
+    def run_mode_in_subprocess(self, mode, options):
+        command = [
+            sys.executable, sys.argv[0], 'benchmark_serving', '--mode', mode, '--json',
+            '--quick', str(options['quick']), '--slow', str(options['slow']),
+            '--quick-url', options['quick_url'], '--slow-url', options['slow_url'],
+            '--threads', str(options['threads']),
+        ]
+        if options['user']:
+            command += ['--user', options['user']]
+
+        env = {**os.environ, 'ASYNC_VIEWS': 'true' if mode == 'asgi' else 'false'}
+        completed = subprocess.run(command, env=env, capture_output=True, text=True)
+        if completed.returncode != 0:
+            raise CommandError(f'{mode} run failed:\n{completed.stderr}')
+        return json.loads(completed.stdout.strip().splitlines()[-1])[0]
+
+    def get_headers(self, username):
+        User = get_user_model()
+        user = User.objects.filter(username=username).first() if username else (
+            User.objects.filter(is_superuser=True).order_by('id').first()
+        )
+        if user is None:
+            raise CommandError('No user to authenticate as; pass --user.')
+        return {'Authorization': f'Bearer {AccessToken.for_user(user)}'}
+
+    def run_mode(self, options):
+        headers = self.get_headers(options['user'])
+        # The test clients send Host: testserver, as the test runner does
+        settings.ALLOWED_HOSTS = [*settings.ALLOWED_HOSTS, 'testserver']
+        # Slow requests go first so the quick ones have to get past them
+        jobs = [('slow', options['slow_url'])] * options['slow'] + [('quick', options['quick_url'])] * options['quick']
+
+        started = time.perf_counter()
+        if settings.ASYNC_VIEWS:
+            timings = asyncio.run(self.run_asgi(jobs, headers))
+        else:
+            timings = self.run_wsgi(jobs, headers, options['threads'])
+        wall_ms = (time.perf_counter() - started) * 1000
+
+        result = {'mode': 'asgi' if settings.ASYNC_VIEWS else 'wsgi', 'wall_ms': wall_ms}
+        for kind in ('quick', 'slow'):
+            latencies = [elapsed for job_kind, elapsed, ok in timings if job_kind == kind]
+            result[kind] = {
+                'count': len(latencies),
+                'errors': sum(1 for job_kind, elapsed, ok in timings if job_kind == kind and not ok),
+                'p50': percentile(latencies, 0.50),
+                'p95': percentile(latencies, 0.95),
+                'p99': percentile(latencies, 0.99),
+                'max': max(latencies, default=0.0),
+            }
+        return result
+
+    def run_wsgi(self, jobs, headers, threads):
+        """Like gunicorn gthread: a fixed number of threads, requests queue behind busy ones"""
+        submitted = time.perf_counter()
+
+        def request(kind, url):
+            response = Client().get(url, headers=headers)
+            # Latency includes time spent waiting for a free thread
+            return kind, (time.perf_counter() - submitted) * 1000, response.status_code < 400
+
+        with ThreadPoolExecutor(max_workers=threads) as executor:
+            return list(executor.map(lambda job: request(*job), jobs))
+
+    async def run_asgi(self, jobs, headers):
+        """Like uvicorn: every request is accepted at once by the event loop"""
+        submitted = time.perf_counter()
+
+        async def request(kind, url):
+            response = await AsyncClient().get(url, headers=headers)
+            return kind, (time.perf_counter() - submitted) * 1000, response.status_code < 400
+
+        return await asyncio.gather(*(request(kind, url) for kind, url in jobs))
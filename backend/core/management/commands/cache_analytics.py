@@ -7,6 +7,7 @@ from core.views.analytics_views import (
     CurrentStockReportView, RestockSummaryView, StockCoverageEstimateView
 )
 from core.models import Location, Machine
+from core.db_routing import replica_reads
 import time
 
 
@@ -39,7 +40,9 @@ class Command(BaseCommand):
         action = options['action']
         
         if action == 'warmup':
-            self.warmup_cache(options)
+            # The views are called directly, so route their reads here
+            with replica_reads():
+                self.warmup_cache(options)
         elif action == 'clear':
             self.clear_cache()
         elif action == 'stats':
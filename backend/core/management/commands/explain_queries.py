@@ -0,0 +1,146 @@
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext, override_settings
+from django.urls import resolve
+from django.utils import timezone
+from rest_framework.test import APIRequestFactory, force_authenticate
+from datetime import timedelta
+from core.fleet_generator import generate_fleet
+from core.models import Location, MachineItemPrice
+from core.query_plans import SUPPORTED_VENDORS, analyze_tables, sequential_scans, table_row_count
+
+
+# Query templates: every analytics and list endpoint with the filters the
+# dashboard and inventory reports send. (name, url, vendor or None)
+QUERY_TEMPLATES = [
+    ('locations', '/api/locations/', None),
+    ('machines', '/api/machines/?location={location}', None),
+    ('products', '/api/products/', None),
+    ('machine-items', '/api/machine-items/?machine={machine}', None),
+    ('visits', '/api/visits/', None),
+    ('visits by location', '/api/visits/?location={location}', None),
+    ('visits updated since', '/api/visits/?updated_since={since}', None),
+    ('restocks by machine', '/api/restocks/?machine={machine}', None),
+    ('restock-entries', '/api/restock-entries/', None),
+    ('restock-entries by product', '/api/restock-entries/?product={product}', None),
+    ('purchases', '/api/purchases/', None),
+    ('product-costs', '/api/product-costs/', None),
+    ('stock-levels', '/api/analytics/stock-levels/?machine={machine}&product={product}', None),
+    ('demand', '/api/analytics/demand/?days=30&location={location}', None),
+    ('revenue-profit', '/api/analytics/revenue-profit/?days=30&location={location}', None),
+    ('dashboard', '/api/dashboard/?days=30&location={location}', None),
+    ('current-stock', '/api/inventory/current-stock/?location={location}', None),
+    ('restock-summary', '/api/inventory/restock-summary/?days=30&location={location}', None),
+    ('stock-coverage', '/api/inventory/stock-coverage/?location={location}', None),
+    ('advanced-demand', '/api/analytics/advanced-demand/?days=30&location={location}', 'postgresql'),
+    ('advanced-demand by machine', '/api/analytics/advanced-demand/?days=90&machine={machine}', 'postgresql'),
+]
+
+
+class Command(BaseCommand):
+    help = (
+        'Run EXPLAIN on the queries behind every analytics and list endpoint and fail '
+        'when one reads a large table with a sequential scan'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--generate', action='store_true',
+            help='Generate a synthetic fleet first; it is rolled back afterwards'
+        )
+        parser.add_argument('--locations', type=int, default=20, help='Locations to generate (default: 20)')
+        parser.add_argument('--weeks', type=int, default=52, help='Weeks of visit history to generate (default: 52)')
+        parser.add_argument(
+            '--max-seq-scan-rows', type=int,
+            default=getattr(settings, 'EXPLAIN_MAX_SEQ_SCAN_ROWS', 10000),
+            help='Fail on sequential scans of tables with more rows than this (default: 10000)'
+        )
+        parser.add_argument('--only', help='Comma-separated template names to check')
+
+    def handle(self, *args, **options):
+        if connection.vendor not in SUPPORTED_VENDORS:
+            raise CommandError(
+                f"explain_queries does not support the {connection.vendor} database; "
+                f"use {' or '.join(SUPPORTED_VENDORS)}."
+            )
+
+        with transaction.atomic():
+            if options['generate']:
+                counts = generate_fleet(locations=options['locations'], weeks=options['weeks'])
+                analyze_tables()
+                self.stdout.write('Generated ' + ', '.join(f'{count} {name}' for name, count in counts.items()))
+
+            regressions = self.check_templates(options)
+            # Never keep the generated fleet
+            transaction.set_rollback(True)
+
+        if regressions:
+            raise CommandError(
+                f"{len(regressions)} query plan regression(s): " + '; '.join(regressions)
+            )
+        self.stdout.write(self.style.SUCCESS('No sequential scans over the row threshold.'))
+
+    def check_templates(self, options):
+        placeholders = self.get_placeholders()
+        only = {name.strip() for name in options['only'].split(',')} if options['only'] else None
+        row_counts = {}
+        regressions = []
+
+        for name, url, vendor in QUERY_TEMPLATES:
+            if (only and name not in only) or (vendor and vendor != connection.vendor):
+                continue
+
+            queries = self.capture_queries(url.format(**placeholders))
+            for sql in queries:
+                for table in sequential_scans(sql):
+                    if table not in row_counts:
+                        row_counts[table] = table_row_count(table)
+                    if row_counts[table] > options['max_seq_scan_rows']:
+                        regressions.append(f'{name}: {table} ({row_counts[table]} rows)')
+                        self.stdout.write(self.style.ERROR(
+                            f'{name}: sequential scan of {table} ({row_counts[table]} rows)\n    {sql[:300]}'
+                        ))
+            self.stdout.write(f'{name}: {len(queries)} queries checked')
+
+        return regressions
+
+    def get_placeholders(self):
+        item = MachineItemPrice.objects.order_by('id').first()
+        location = Location.objects.order_by('id').first()
+        if item is None or location is None:
+            raise CommandError('No data to explain against; run with --generate.')
+        return {
+            'location': item.machine.location_id,
+            'machine': item.machine_id,
+            'product': item.product_id,
+            'since': (timezone.now() - timedelta(days=1)).isoformat().replace('+', '%2B'),
+        }
+
+    def capture_queries(self, url):
+        """SELECT statements run by the view behind ``url``, without the analytics cache"""
+        request = APIRequestFactory().get(url)
+        # Rolled back with everything else in handle()
+        user, _ = get_user_model().objects.get_or_create(username='explain-queries')
+        force_authenticate(request, user=user)
+        match = resolve(request.path)
+        # Call the plain view so queries run on this thread's connection under ASGI too
+        view = getattr(match.func, 'sync_view', match.func)
+
+        with override_settings(
+            CACHES={'default': {'BACKEND': 'django.core.cache.backends.dummy.DummyCache'}},
+            ALLOWED_HOSTS=[*settings.ALLOWED_HOSTS, 'testserver'],
+        ), CaptureQueriesContext(connection) as context:
+            response = view(request, *match.args, **match.kwargs)
+            if hasattr(response, 'render'):
+                response.render()
+        if response.status_code >= 400:
+            raise CommandError(f'{url} returned {response.status_code}')
+
+        statements = []
+        for query in context.captured_queries:
+            sql = query['sql']
+            if sql.lstrip().upper().startswith(('SELECT', 'WITH')) and sql not in statements:
+                statements.append(sql)
+        return statements
@@ -0,0 +1,90 @@
+from datetime import datetime, time as dt_time
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+from core.fleet_generator import BATCH_SIZE, generate_fleet
+import time
+
+
+PROGRESS_EVERY = 100000
+
+
+class Command(BaseCommand):
+    help = 'Generate a synthetic fleet with locations, machines, cost history and years of weekly visits'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--locations', type=int, default=20, help='Locations (default: 20)')
+        parser.add_argument('--machines-per-location', type=int, default=3, help='Machines per location (default: 3)')
+        parser.add_argument('--products', type=int, default=40, help='Products in the catalog (default: 40)')
+        parser.add_argument('--slots', type=int, default=20, help='Products stocked per machine (default: 20)')
+        parser.add_argument('--weeks', type=int, default=52, help='Weeks of visit history (default: 52)')
+        parser.add_argument(
+            '--purchase-weeks', type=int, default=4,
+            help='Weeks between wholesale purchases of each product (default: 4)'
+        )
+        parser.add_argument('--seed', type=int, default=0, help='Random seed (default: 0)')
+        parser.add_argument(
+            '--end-date',
+            help='Date or datetime of the last visit week (default: now); fix it for identical datasets'
+        )
+        parser.add_argument(
+            '--batch-size', type=int, default=BATCH_SIZE,
+            help=f'Rows per bulk insert (default: {BATCH_SIZE})'
+        )
+        parser.add_argument(
+            '--username', default='fleet-driver',
+            help='User the visits are recorded for (default: fleet-driver)'
+        )
+
+    def handle(self, *args, **options):
+        end = self.parse_end_date(options['end_date'])
+        per_location = options['weeks'] * options['machines_per_location'] * min(options['slots'], options['products'])
+        self.stdout.write(
+            f"Generating {options['locations']} locations x {options['machines_per_location']} machines, "
+            f"{options['weeks']} weeks: about {options['locations'] * per_location:,} restock entries"
+        )
+
+        self.last_reported = {}
+        start_time = time.time()
+        # One transaction: nothing is left behind on failure, and SQLite writes much faster
+        with transaction.atomic():
+            counts = generate_fleet(
+                locations=options['locations'],
+                machines_per_location=options['machines_per_location'],
+                products=options['products'],
+                slots=options['slots'],
+                weeks=options['weeks'],
+                seed=options['seed'],
+                username=options['username'],
+                end=end,
+                purchase_weeks=options['purchase_weeks'],
+                batch_size=options['batch_size'],
+                progress=self.report_progress,
+            )
+        duration = time.time() - start_time
+
+        total = sum(counts.values())
+        self.stdout.write(self.style.SUCCESS(
+            f"Created {total:,} rows in {duration:.1f} seconds ({total / max(duration, 0.001):,.0f} rows/s)"
+        ))
+        for name, count in counts.items():
+            self.stdout.write(f'  {name}: {count:,}')
+
+    def report_progress(self, name, count):
+        if count - self.last_reported.get(name, 0) >= PROGRESS_EVERY:
+            self.last_reported[name] = count
+            self.stdout.write(f'  ... {count:,} {name}')
+
+    def parse_end_date(self, value):
+        if not value:
+            return None
+        end = parse_datetime(value)
+        if end is None:
+            date = parse_date(value)
+            if date is None:
+                raise CommandError(f'Invalid --end-date: {value}')
+            end = datetime.combine(date, dt_time.min)
+        if timezone.is_naive(end):
+            end = timezone.make_aware(end)
+        return end
@@ -0,0 +1,69 @@
+from django.core.management.base import BaseCommand, CommandError
+from core.serializers import WholesalePurchaseImportSerializer
+import json
+import time
+
+
+class Command(BaseCommand):
+    help = 'Bulk import wholesale purchases from a CSV or JSON file'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'path',
+            type=str,
+            help='Path to a CSV file (with header row) or a JSON file'
+        )
+
+        parser.add_argument(
+            '--format',
+            type=str,
+            choices=['csv', 'json'],
+            help='File format (default: inferred from the file extension)'
+        )
+
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Validate the file without saving anything'
+        )
+
+    def handle(self, *args, **options):
+        path = options['path']
+        file_format = options['format'] or ('json' if path.lower().endswith('.json') else 'csv')
+
+        try:
+            with open(path, 'rb') as f:
+                content = f.read()
+        except OSError as e:
+            raise CommandError(f"Could not read {path}: {e}")
+
+        if file_format == 'json':
+            data = json.loads(content)
+            rows = data.get('purchases', []) if isinstance(data, dict) else data
+        else:
+            rows = WholesalePurchaseImportSerializer.rows_from_csv(content)
+
+        self.stdout.write(f"Read {len(rows)} purchase rows from {path}")
+
+        serializer = WholesalePurchaseImportSerializer(data={'purchases': rows})
+        if not serializer.is_valid():
+            for error in serializer.row_errors:
+                row_label = f"Row {error['row']}" if error['row'] else "File"
+                self.stdout.write(self.style.ERROR(f"  {row_label}: {error['errors']}"))
+            raise CommandError("Import aborted: fix the rows above and try again. Nothing was saved.")
+
+        if options['dry_run']:
+            self.stdout.write(self.style.SUCCESS(f"Dry run: all {len(rows)} rows are valid"))
+            return
+
+        start_time = time.time()
+        serializer.save()
+        summary = serializer.data
+        duration = time.time() - start_time
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Imported {summary['created']} purchases for {summary['products_updated']} products "
+                f"({summary['total_quantity']} units, ${summary['total_cost']}) in {duration:.2f} seconds"
+            )
+        )
@@ -0,0 +1,265 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+from core.management.commands.benchmark_serving import percentile
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from urllib.error import HTTPError, URLError
+from urllib.request import Request, urlopen
+import json
+import random
+import re
+import sys
+import time
+
+
+# Used without a recorded mix: the dashboard, analytics, restock sheets
+# (current stock, machine items) and bulk saves drivers send through the day
+DEFAULT_MIX = [
+    ('GET', '/api/dashboard/?days=30', 20),
+    ('GET', '/api/analytics/demand/?days=30', 8),
+    ('GET', '/api/analytics/revenue-profit/?days=30', 5),
+    ('GET', '/api/inventory/current-stock/', 15),
+    ('GET', '/api/inventory/restock-summary/?days=30', 5),
+    ('GET', '/api/inventory/stock-coverage/', 5),
+    ('GET', '/api/machine-items/?machine={machine}', 15),
+    ('GET', '/api/visits/', 10),
+    ('GET', '/api/products/', 10),
+    ('POST', '/api/visits/bulk-save/', 7),
+]
+BULK_SAVE_PATH = '/api/visits/bulk-save/'
+# Never replayed: logins, streams and the metrics scrape
+SKIPPED_PATHS = re.compile(r'^/api/(token|direct-auth|changes/stream|migrate|direct-migrate)/|^/metrics')
+ID_RE = re.compile(r'/\d+(?=/|$)')
+
+
+def parse_record(line):
+    """
+    (method, url, weight) from a request_timing log line (see core.server_timing),
+    which may carry a level prefix, or from a mix line {"method", "path", "weight"}
+    """
+    start = line.find('{')
+    if start < 0:
+        return None
+    try:
+        record = json.loads(line[start:])
+    except ValueError:
+        return None
+    if not isinstance(record, dict) or 'path' not in record:
+        return None
+    url = record['path']
+    if record.get('query'):
+        url = f"{url}?{record['query']}"
+    return record.get('method', 'GET').upper(), url, float(record.get('weight', 1))
+
+
+def load_mix(paths):
+    """Request mix from log or mix files: identical requests are merged into one weight"""
+    weights = {}
+    for path in paths:
+        try:
+            handle = sys.stdin if path == '-' else open(path, encoding='utf-8')
+        except OSError as e:
+            raise CommandError(f'Cannot read {path}: {e}')
+        with handle:
+            for record in filter(None, map(parse_record, handle)):
+                method, url, weight = record
+                if not url.startswith('/api/') or SKIPPED_PATHS.match(url):
+                    continue
+                # Bodies are not logged; bulk saves get generated ones and other writes are dropped
+                if method != 'GET' and not url.startswith(BULK_SAVE_PATH):
+                    continue
+                weights[(method, url)] = weights.get((method, url), 0) + weight
+    return [(method, url, weight) for (method, url), weight in weights.items()]
+
+
+def endpoint_name(method, url):
+    return f"{method} {ID_RE.sub('/{id}', url.split('?', 1)[0])}"
+
+
+def send(base_url, token, method, url, body=None, timeout=60):
+    """(status, milliseconds); status 0 when the server could not be reached"""
+    headers = {'Accept': 'application/json'}
+    if token:
+        headers['Authorization'] = f'Bearer {token}'
+    data = None
+    if body is not None:
+        headers['Content-Type'] = 'application/json'
+        data = json.dumps(body).encode()
+
+    started = time.perf_counter()
+    try:
+        with urlopen(Request(base_url + url, data=data, headers=headers, method=method), timeout=timeout) as response:
+            response.read()
+            status = response.status
+    except HTTPError as e:
+        status = e.code
+    except (URLError, OSError):
+        status = 0
+    return status, (time.perf_counter() - started) * 1000
+
+
+def fetch_json(base_url, token, url):
+    headers = {'Accept': 'application/json', 'Authorization': f'Bearer {token}'}
+    with urlopen(Request(base_url + url, headers=headers), timeout=60) as response:
+        return json.loads(response.read())
+
+
+def run_jobs(base_url, token, jobs, threads, timeout):
+    """Send ``jobs`` [(method, url, body)] on ``threads`` threads: [(endpoint, status, ms)]"""
+    def run(job):
+        method, url, body = job
+        status, elapsed = send(base_url, token, method, url, body, timeout)
+        return endpoint_name(method, url), status, elapsed
+
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        return list(executor.map(run, jobs))
+
+
+def _run_jobs_in_process(args):
+    return run_jobs(*args)
+
+
+class Command(BaseCommand):
+    help = (
+        'Replay a recorded request mix (request_timing log lines or a mix file) against a running '
+        'server with thread and process pools, and report throughput and latency per endpoint'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'files', nargs='*',
+            help="request_timing log files or mix files to replay; '-' for stdin (default: built-in mix)"
+        )
+        parser.add_argument('--url', default='http://127.0.0.1:8000', help='Server to replay against')
+        parser.add_argument('--username', help='User to log in as through /api/token/')
+        parser.add_argument('--password', help='Password for --username')
+        parser.add_argument('--token', help='Access token to use instead of logging in')
+        parser.add_argument('--requests', type=int, default=500, help='Requests to send (default: 500)')
+        parser.add_argument('--threads', type=int, default=8, help='Threads per process (default: 8)')
+        parser.add_argument(
+            '--processes', type=int, default=1,
+            help='Processes, each with --threads threads (default: 1)'
+        )
+        parser.add_argument(
+            '--bulk-machines', type=int, default=1,
+            help='Machines the bulk saves are spread over; 1 makes every save touch the same products (default: 1)'
+        )
+        parser.add_argument('--read-only', action='store_true', help='Drop the bulk saves from the mix')
+        parser.add_argument('--seed', type=int, default=0, help='Seed for the request order (default: 0)')
+        parser.add_argument('--timeout', type=float, default=60, help='Seconds per request (default: 60)')
+        parser.add_argument('--json', action='store_true', help='Print the results as JSON')
+
+    def handle(self, *args, **options):
+        base_url = options['url'].rstrip('/')
+        mix = load_mix(options['files']) if options['files'] else DEFAULT_MIX
+        if options['read_only']:
+            mix = [entry for entry in mix if entry[0] == 'GET']
+        if not mix:
+            raise CommandError('No replayable requests in the mix.')
+
+        token = options['token'] or self.login(base_url, options)
+        jobs = self.build_jobs(base_url, token, mix, options)
+        processes = max(1, options['processes'])
+
+        started = time.perf_counter()
+        if processes == 1:
+            results = run_jobs(base_url, token, jobs, options['threads'], options['timeout'])
+        else:
+            shares = [
+                (base_url, token, jobs[number::processes], options['threads'], options['timeout'])
+                for number in range(processes)
+            ]
+            with ProcessPoolExecutor(max_workers=processes) as executor:
+                results = [result for share in executor.map(_run_jobs_in_process, shares) for result in share]
+        wall = time.perf_counter() - started
+
+        report = self.summarize(results, wall)
+        if options['json']:
+            self.stdout.write(json.dumps(report))
+            return
+        self.print_report(report, processes, options['threads'])
+
+    def login(self, base_url, options):
+        if not options['username'] or not options['password']:
+            raise CommandError('Pass --username and --password, or --token.')
+        request = Request(
+            f'{base_url}/api/token/',
+            data=json.dumps({'username': options['username'], 'password': options['password']}).encode(),
+            headers={'Content-Type': 'application/json'}, method='POST'
+        )
+        try:
+            with urlopen(request, timeout=options['timeout']) as response:
+                return json.loads(response.read())['access']
+        except HTTPError as e:
+            raise CommandError(f'Login failed with {e.code}')
+        except URLError as e:
+            raise CommandError(f'Cannot reach {base_url}: {e.reason}')
+
+    def build_jobs(self, base_url, token, mix, options):
+        """The replayed requests, in a seeded order following the mix weights"""
+        machines = fetch_json(base_url, token, f"/api/machines/?page_size={max(options['bulk_machines'], 1)}")
+        machines = machines.get('results', machines)
+        if not machines:
+            raise CommandError('The server has no machines; generate a fleet first (generate_fleet).')
+
+        bulk_saves = []
+        for machine in machines[:options['bulk_machines']]:
+            items = fetch_json(base_url, token, f"/api/machine-items/?machine={machine['id']}&page_size=1000")
+            bulk_saves.append({
+                'visit': {'location': machine['location'], 'visit_date': timezone.now().isoformat()},
+                'machine_restocks': [{
+                    'machine': machine['id'],
+                    'restock_entries': [
+                        {'product': item['product'], 'stock_before': 2, 'discarded': 0, 'restocked': 1}
+                        for item in items.get('results', items)
+                    ],
+                }],
+            })
+
+        rng = random.Random(options['seed'])
+        picks = rng.choices(mix, weights=[weight for _, _, weight in mix], k=options['requests'])
+        jobs = []
+        for number, (method, url, weight) in enumerate(picks):
+            url = url.replace('{machine}', str(machines[number % len(machines)]['id']))
+            body = bulk_saves[number % len(bulk_saves)] if url.startswith(BULK_SAVE_PATH) else None
+            jobs.append((method, url, body))
+        return jobs
+
+    def summarize(self, results, wall):
+        by_endpoint = {}
+        for endpoint, status, elapsed in results:
+            by_endpoint.setdefault(endpoint, []).append((status, elapsed))
+
+        def stats(samples):
+            latencies = [elapsed for status, elapsed in samples]
+            return {
+                'count': len(samples),
+                'errors': sum(1 for status, elapsed in samples if not 200 <= status < 400),
+                'rps': round(len(samples) / wall, 2),
+                'p50': round(percentile(latencies, 0.50), 1),
+                'p95': round(percentile(latencies, 0.95), 1),
+                'p99': round(percentile(latencies, 0.99), 1),
+                'max': round(max(latencies), 1),
+            }
+
+        return {
+            'wall_s': round(wall, 2),
+            'total': stats([(status, elapsed) for _, status, elapsed in results]),
+            'endpoints': {
+                endpoint: stats(samples)
+                for endpoint, samples in sorted(by_endpoint.items(), key=lambda item: -len(item[1]))
+            },
+        }
+
+    def print_report(self, report, processes, threads):
+        self.stdout.write(
+            f"{'endpoint':<44}{'count':>7}{'errors':>8}{'req/s':>9}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'max ms':>10}"
+        )
+        for endpoint, stats in [*report['endpoints'].items(), ('total', report['total'])]:
+            self.stdout.write(
+                f"{endpoint:<44}{stats['count']:>7}{stats['errors']:>8}{stats['rps']:>9.1f}"
+                f"{stats['p50']:>10.1f}{stats['p95']:>10.1f}{stats['p99']:>10.1f}{stats['max']:>10.1f}"
+            )
+        self.stdout.write(
+            f"{report['total']['count']} requests in {report['wall_s']:.1f} s "
+            f"on {processes} process(es) x {threads} thread(s)"
+        )
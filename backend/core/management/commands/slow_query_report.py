@@ -0,0 +1,120 @@
+from collections import Counter
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+import json
+import sys
+
+
+SORT_KEYS = {
+    'total': lambda stats: stats['total_ms'],
+    'count': lambda stats: stats['count'],
+    'max': lambda stats: stats['max_ms'],
+    'mean': lambda stats: stats['total_ms'] / stats['count'],
+}
+
+
+def parse_line(line):
+    """The slow_query record in a log line, which may carry a level or timestamp prefix"""
+    start = line.find('{')
+    if start < 0:
+        return None
+    try:
+        record = json.loads(line[start:])
+    except ValueError:
+        return None
+    return record if isinstance(record, dict) and record.get('event') == 'slow_query' else None
+
+
+def aggregate(records):
+    """Per-fingerprint count, total/max/p95 duration, row counts, calling views and latest plan"""
+    report = {}
+    for record in records:
+        stats = report.setdefault(record['fingerprint_id'], {
+            'fingerprint_id': record['fingerprint_id'],
+            'fingerprint': record['fingerprint'],
+            'example': record.get('sql'),
+            'count': 0,
+            'total_ms': 0.0,
+            'max_ms': 0.0,
+            'durations': [],
+            'max_rows': None,
+            'views': Counter(),
+            'plan': None,
+        })
+        duration = record['duration_ms']
+        stats['count'] += 1
+        stats['total_ms'] += duration
+        stats['durations'].append(duration)
+        if duration >= stats['max_ms']:
+            stats['max_ms'] = duration
+            stats['example'] = record.get('sql')
+        if record.get('rows') is not None:
+            stats['max_rows'] = max(stats['max_rows'] or 0, record['rows'])
+        stats['views'][record.get('view') or '-'] += 1
+        if record.get('plan'):
+            stats['plan'] = record['plan']
+
+    for stats in report.values():
+        durations = sorted(stats.pop('durations'))
+        stats['p95_ms'] = durations[min(len(durations) - 1, int(len(durations) * 0.95))]
+        stats['total_ms'] = round(stats['total_ms'], 1)
+    return list(report.values())
+
+
+class Command(BaseCommand):
+    help = 'Summarize slow query log lines into the top statements by time spent'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'files', nargs='*',
+            help="Log files to read; '-' for stdin (default: SLOW_QUERY_LOG_FILE)"
+        )
+        parser.add_argument('--top', type=int, default=10, help='Statements to show (default: 10)')
+        parser.add_argument(
+            '--sort', choices=sorted(SORT_KEYS), default='total',
+            help='Rank by total, mean or max duration, or by count (default: total)'
+        )
+        parser.add_argument('--plans', action='store_true', help='Show the latest captured plan of each statement')
+        parser.add_argument('--json', action='store_true', help='Output the report as JSON')
+
+    def handle(self, *args, **options):
+        files = options['files'] or [getattr(settings, 'SLOW_QUERY_LOG_FILE', '')]
+        if not all(files):
+            raise CommandError('No log file given and SLOW_QUERY_LOG_FILE is not set.')
+
+        records = []
+        for path in files:
+            try:
+                handle = sys.stdin if path == '-' else open(path, encoding='utf-8')
+            except OSError as e:
+                raise CommandError(f'Cannot read {path}: {e}')
+            with handle:
+                records.extend(record for record in map(parse_line, handle) if record)
+
+        report = sorted(aggregate(records), key=SORT_KEYS[options['sort']], reverse=True)[:options['top']]
+
+        if options['json']:
+            for stats in report:
+                stats['views'] = dict(stats['views'])
+            self.stdout.write(json.dumps(report, indent=2))
+            return
+
+        if not report:
+            self.stdout.write('No slow queries logged.')
+            return
+
+        self.stdout.write(f'{len(records)} slow statements, {len(report)} shown by {options["sort"]}\n')
+        for rank, stats in enumerate(report, 1):
+            views = ', '.join(f'{view} ({count})' for view, count in stats['views'].most_common(3))
+            self.stdout.write(self.style.WARNING(
+                f"{rank}. [{stats['fingerprint_id']}] {stats['count']}x, total {stats['total_ms']:.0f}ms, "
+                f"mean {stats['total_ms'] / stats['count']:.0f}ms, p95 {stats['p95_ms']:.0f}ms, "
+                f"max {stats['max_ms']:.0f}ms, rows {stats['max_rows'] if stats['max_rows'] is not None else '-'}"
+            ))
+            self.stdout.write(f'   views: {views}')
+            self.stdout.write(f"   {stats['fingerprint'][:500]}")
+            if options['plans'] and stats['plan']:
+                self.stdout.write('   plan:')
+                for line in stats['plan'].splitlines():
+                    self.stdout.write(f'     {line}')
+            self.stdout.write('')
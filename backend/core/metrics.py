@@ -0,0 +1,152 @@
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.http import Http404, HttpResponse
+from prometheus_client import (
+    CONTENT_TYPE_LATEST, REGISTRY, CollectorRegistry, Counter, Gauge, Histogram, generate_latest, multiprocess
+)
+from prometheus_client.core import GaugeMetricFamily
+from core.query_timing import add_query_observer
+import hmac
+import os
+import time
+
+# With PROMETHEUS_MULTIPROC_DIR set (gunicorn.conf.py does this), every worker
+# writes its samples to files in that directory and /metrics adds them up, so
+# any worker answers the scrape with the numbers of all of them.
+
+REQUEST_LATENCY = Histogram(
+    'http_request_duration_seconds', 'Request latency by route',
+    ['method', 'route', 'status'],
+    buckets=(0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30),
+)
+REQUESTS_IN_PROGRESS = Gauge(
+    'http_requests_in_progress', 'Requests being served',
+    ['method'], multiprocess_mode='livesum',
+)
+ANALYTICS_CACHE_REQUESTS = Counter(
+    'analytics_cache_requests', 'Analytics cache lookups by key prefix',
+    ['prefix', 'result'],
+)
+DB_QUERY_DURATION = Histogram(
+    'db_query_duration_seconds', 'SQL statement duration by database alias',
+    ['database'],
+    buckets=(0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 5),
+)
+BULK_SAVE_ROWS = Counter(
+    'bulk_save_rows', 'Rows written by the bulk save and import endpoints',
+    ['kind'],
+)
+
+
+def record_analytics_cache(cache_key, hit):
+    # analytics_<prefix>_<params hash>
+    prefix = cache_key.rsplit('_', 1)[0]
+    ANALYTICS_CACHE_REQUESTS.labels(prefix=prefix, result='hit' if hit else 'miss').inc()
+
+
+def record_bulk_rows(kind, rows):
+    if rows:
+        BULK_SAVE_ROWS.labels(kind=kind).inc(rows)
+
+
+def observe_query(sql, params, many, context, elapsed):
+    DB_QUERY_DURATION.labels(database=context['connection'].alias).observe(elapsed)
+
+
+add_query_observer(observe_query)
+
+
+def cache_hit_ratio(families):
+    """analytics_cache_hit_ratio per prefix, from the analytics_cache_requests counters"""
+    totals = {}
+    for family in families:
+        if family.name != 'analytics_cache_requests':
+            continue
+        for sample in family.samples:
+            if sample.name.endswith('_total'):
+                counts = totals.setdefault(sample.labels['prefix'], {'hit': 0.0, 'miss': 0.0})
+                counts[sample.labels['result']] += sample.value
+
+    ratio = GaugeMetricFamily(
+        'analytics_cache_hit_ratio', 'Share of analytics cache lookups that were hits', labels=['prefix']
+    )
+    for prefix, counts in sorted(totals.items()):
+        ratio.add_metric([prefix], counts['hit'] / (counts['hit'] + counts['miss']))
+    return ratio
+
+
+class MetricsSnapshot:
+    """Every worker's metrics (or this process's) plus values derived from them"""
+
+    def __init__(self):
+        if 'PROMETHEUS_MULTIPROC_DIR' in os.environ:
+            self.registry = CollectorRegistry()
+            multiprocess.MultiProcessCollector(self.registry)
+        else:
+            self.registry = REGISTRY
+
+    def collect(self):
+        families = list(self.registry.collect())
+        yield from families
+        yield cache_hit_ratio(families)
+
+
+def metrics_view(request):
+    """
+    Prometheus text exposition. Requires ``Authorization: Bearer <METRICS_TOKEN>``;
+    without a METRICS_TOKEN it is only served with DEBUG on.
+    """
+    token = getattr(settings, 'METRICS_TOKEN', '')
+    if token:
+        if not hmac.compare_digest(request.headers.get('Authorization', ''), f'Bearer {token}'):
+            return HttpResponse('Unauthorized', status=401, content_type='text/plain')
+    elif not settings.DEBUG:
+        raise Http404
+    return HttpResponse(generate_latest(MetricsSnapshot()), content_type=CONTENT_TYPE_LATEST)
+
+
+class PrometheusMetricsMiddleware:
+    """Request latency per route and in-flight requests, exposed on /metrics"""
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        started = self.start(request)
+        status = 500
+        try:
+            response = self.get_response(request)
+            status = response.status_code
+            return response
+        finally:
+            self.finish(request, started, status)
+
+    async def __acall__(self, request):
+        started = self.start(request)
+        status = 500
+        try:
+            response = await self.get_response(request)
+            status = response.status_code
+            return response
+        finally:
+            self.finish(request, started, status)
+
+    def start(self, request):
+        REQUESTS_IN_PROGRESS.labels(method=request.method).inc()
+        return time.perf_counter()
+
+    def finish(self, request, started, status):
+        REQUESTS_IN_PROGRESS.labels(method=request.method).dec()
+        match = getattr(request, 'resolver_match', None)
+        REQUEST_LATENCY.labels(
+            method=request.method,
+            route=match.view_name if match else 'unmatched',
+            status=status,
+        ).observe(time.perf_counter() - started)
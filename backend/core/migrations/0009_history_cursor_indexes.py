@@ -0,0 +1,25 @@
+# Generated by Django 4.2 on 2026-10-19 16:15
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0008_optimize_visit_performance'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='productcost',
+            index=models.Index(fields=['-date', '-id'], name='product_cost_date_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='visit',
+            index=models.Index(fields=['-visit_date', '-id'], name='visit_date_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='wholesalepurchase',
+            index=models.Index(fields=['-purchased_at', '-id'], name='purchase_date_id_idx'),
+        ),
+    ]
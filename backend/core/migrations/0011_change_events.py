@@ -0,0 +1,27 @@
+# Generated by Django 4.2 on 2026-10-19 16:36
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0010_delta_sync'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ChangeEvent',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('visit', 'Visit'), ('purchase', 'Purchase'), ('price', 'Price')], max_length=20)),
+                ('locations', models.JSONField(blank=True, default=list)),
+                ('machines', models.JSONField(blank=True, default=list)),
+                ('products', models.JSONField(blank=True, default=list)),
+                ('created_at', models.DateTimeField(auto_now_add=True, db_index=True)),
+            ],
+            options={
+                'ordering': ['id'],
+            },
+        ),
+    ]
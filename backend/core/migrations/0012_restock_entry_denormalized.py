@@ -0,0 +1,56 @@
+# Generated by Django 4.2 on 2026-10-19 16:46
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def backfill_denormalized_fields(apps, schema_editor):
+    """Copy visit date, machine and location onto existing entries in one UPDATE"""
+    RestockEntry = apps.get_model('core', 'RestockEntry')
+    VisitMachineRestock = apps.get_model('core', 'VisitMachineRestock')
+    db_alias = schema_editor.connection.alias
+    restock = VisitMachineRestock.objects.using(db_alias).filter(id=models.OuterRef('visit_machine_restock_id'))
+    RestockEntry.objects.using(db_alias).update(
+        visit_date=models.Subquery(restock.values('visit__visit_date')[:1]),
+        machine_id=models.Subquery(restock.values('machine_id')[:1]),
+        location_id=models.Subquery(restock.values('machine__location_id')[:1]),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0011_change_events'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='restockentry',
+            name='location',
+            field=models.ForeignKey(db_index=False, editable=False, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='+', to='core.location'),
+        ),
+        migrations.AddField(
+            model_name='restockentry',
+            name='machine',
+            field=models.ForeignKey(db_index=False, editable=False, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='+', to='core.machine'),
+        ),
+        migrations.AddField(
+            model_name='restockentry',
+            name='visit_date',
+            field=models.DateTimeField(editable=False, null=True),
+        ),
+        # Backfill before the indexes are built
+        migrations.RunPython(backfill_denormalized_fields, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='restockentry',
+            index=models.Index(fields=['location', 'visit_date'], name='restock_location_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='restockentry',
+            index=models.Index(fields=['machine', 'product', 'visit_date'], name='restock_machine_prod_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='restockentry',
+            index=models.Index(fields=['-visit_date', '-id'], name='restock_entry_date_id_idx'),
+        ),
+    ]
@@ -0,0 +1,34 @@
+# Generated by Django 4.2 on 2026-10-19 16:49
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0012_restock_entry_denormalized'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='restockentry',
+            index=models.Index(fields=['product', 'visit_machine_restock'], name='restock_product_visit_idx'),
+        ),
+        # 0008 already created these two with RunSQL; only record them in the model state
+        migrations.SeparateDatabaseAndState(
+            state_operations=[
+                migrations.AddIndex(
+                    model_name='visit',
+                    index=models.Index(fields=['location', '-visit_date'], name='idx_visit_location_date'),
+                ),
+                migrations.AddIndex(
+                    model_name='visit',
+                    index=models.Index(fields=['user', '-visit_date'], name='idx_visit_user_date'),
+                ),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='visitmachinerestock',
+            index=models.Index(fields=['machine', 'visit'], name='restock_machine_visit_idx'),
+        ),
+    ]
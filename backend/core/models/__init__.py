@@ -8,6 +8,8 @@ from .visit import Visit
 from .visit_machine_restock import VisitMachineRestock
 from .restock_entry import RestockEntry
 from .product_cost import ProductCost
+from .deletion_log import DeletionLog
+from .change_event import ChangeEvent
 
 __all__ = [
     'Location',
@@ -20,4 +22,6 @@ __all__ = [
     'VisitMachineRestock',
     'RestockEntry',
     'ProductCost',
+    'DeletionLog',
+    'ChangeEvent',
 ] 
\ No newline at end of file
@@ -0,0 +1,36 @@
+from django.db import models
+
+
+class ChangeEvent(models.Model):
+    """
+    Compact notification that visits, purchases or prices changed, streamed to
+    dashboards over server-sent events. The auto-increment id doubles as the
+    data version clients resume from. An empty scope list means the change
+    was not narrowed down to specific rows of that kind.
+    """
+    KIND_CHOICES = [
+        ('visit', 'Visit'),
+        ('purchase', 'Purchase'),
+        ('price', 'Price'),
+    ]
+
+    kind = models.CharField(max_length=20, choices=KIND_CHOICES)
+    locations = models.JSONField(default=list, blank=True)
+    machines = models.JSONField(default=list, blank=True)
+    products = models.JSONField(default=list, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True, db_index=True)
+
+    class Meta:
+        ordering = ['id']
+
+    def __str__(self):
+        return f"{self.kind} change #{self.id}"
+
+    def as_message(self):
+        return {
+            'version': self.id,
+            'kind': self.kind,
+            'locations': self.locations,
+            'machines': self.machines,
+            'products': self.products,
+        }
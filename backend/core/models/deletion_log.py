@@ -0,0 +1,55 @@
+from django.db import models
+from django.db.models.signals import post_delete
+
+
+class DeletionLog(models.Model):
+    """
+    Tombstone for a deleted row, so clients syncing with ?updated_since= can
+    drop it from their local copy. Only the reference data listed in
+    TRACKED_MODELS is logged.
+    """
+    TRACKED_MODELS = (
+        'core.location',
+        'core.machine',
+        'core.product',
+        'core.machineitemprice',
+        'core.supplier',
+    )
+
+    model = models.CharField(max_length=100, help_text="app_label.model_name of the deleted row")
+    object_id = models.PositiveBigIntegerField()
+    deleted_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['model', 'deleted_at'], name='deletion_log_model_date_idx'),
+        ]
+        ordering = ['deleted_at']
+
+    def __str__(self):
+        return f"{self.model} #{self.object_id} deleted at {self.deleted_at}"
+
+    @classmethod
+    def is_tracked(cls, model):
+        return model._meta.label_lower in cls.TRACKED_MODELS
+
+    @classmethod
+    def deleted_since(cls, model, since):
+        """IDs of ``model`` rows deleted at or after ``since``"""
+        return list(
+            cls.objects.filter(model=model._meta.label_lower, deleted_at__gte=since)
+            .order_by()
+            .values_list('object_id', flat=True)
+            .distinct()
+        )
+
+
+def log_deletion(sender, instance, **kwargs):
+    """Record a tombstone when a tracked model row is deleted (including cascades)"""
+    DeletionLog.objects.create(model=sender._meta.label_lower, object_id=instance.pk)
+
+
+# Connected per model: a catch-all receiver would stop Django from fast-deleting
+# cascaded rows of untracked models such as restock entries
+for label in DeletionLog.TRACKED_MODELS:
+    post_delete.connect(log_deletion, sender=label, dispatch_uid=f'deletion_log_{label}')
@@ -6,7 +6,7 @@ class Location(models.Model):
     address = models.TextField()
     route = models.CharField(max_length=50, null=True, blank=True, help_text="Route designation for restocking planning")
     created_at = models.DateTimeField(auto_now_add=True)
-    updated_at = models.DateTimeField(auto_now=True)
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
 
     def __str__(self):
         return self.name 
\ No newline at end of file
@@ -1,4 +1,7 @@
 from django.db import models
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from django.utils import timezone
 
 
 class Machine(models.Model):
@@ -13,7 +16,33 @@ class Machine(models.Model):
     machine_type = models.CharField(max_length=100, choices=MACHINE_TYPE_CHOICES)
     model = models.CharField(max_length=100, blank=True, null=True)
     created_at = models.DateTimeField(auto_now_add=True)
-    updated_at = models.DateTimeField(auto_now=True)
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
 
     def __str__(self):
-        return f"{self.name} - {self.machine_type} at {self.location.name}" 
\ No newline at end of file
+        return f"{self.name} - {self.machine_type} at {self.location.name}"
+
+
+def touch_machines(machine_ids):
+    """
+    Bump updated_at of machines whose serialized rows derive from other tables
+    (location_name, route, product_count), so ?updated_since= syncs list them again
+    """
+    Machine.objects.filter(id__in=set(machine_ids)).update(updated_at=timezone.now())
+
+
+@receiver(post_save, sender='core.Location')
+def touch_location_machines(sender, instance, created, raw=False, **kwargs):
+    if not created and not raw:
+        Machine.objects.filter(location=instance).update(updated_at=timezone.now())
+
+
+@receiver(post_save, sender='core.MachineItemPrice')
+def touch_machine_on_new_item(sender, instance, created, raw=False, **kwargs):
+    if created and not raw:
+        touch_machines([instance.machine_id])
+
+
+@receiver(post_delete, sender='core.MachineItemPrice')
+def touch_machine_on_removed_item(sender, instance, **kwargs):
+    # A no-op when the machine itself is being deleted
+    touch_machines([instance.machine_id])
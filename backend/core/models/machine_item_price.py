@@ -8,7 +8,7 @@ class MachineItemPrice(models.Model):
     slot = models.PositiveIntegerField(help_text="Numeric slot position in the machine", null=True, blank=True, default=1)
     current_stock = models.IntegerField(null=True, blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
-    updated_at = models.DateTimeField(auto_now=True)
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
 
     class Meta:
         unique_together = [
@@ -28,8 +28,19 @@ class MachineItemPrice(models.Model):
     @property
     def profit_margin(self):
         """Calculate profit margin as a percentage"""
-        if not self.product.average_cost or self.price == 0:
+        # Prefer purchase totals annotated on the queryset (see Product.purchase_total_annotations)
+        if hasattr(self, 'purchase_total_quantity'):
+            from core.models.product import Product
+            cost = Product.calculate_average_cost(self.purchase_total_cost, self.purchase_total_quantity)
+        else:
+            cost = self.product.average_cost
+        
+        return self.calculate_profit_margin(self.price, cost)
+    
+    @staticmethod
+    def calculate_profit_margin(price, cost):
+        """Profit margin percentage of ``price`` over unit ``cost``"""
+        if not cost or price == 0:
             return 0
         
-        cost = self.product.average_cost
-        return ((self.price - cost) / self.price) * 100 
\ No newline at end of file
+        return ((price - cost) / price) * 100 
\ No newline at end of file
@@ -1,4 +1,5 @@
 from django.db import models
+from django.db.models import OuterRef, Subquery, Sum
 from decimal import Decimal
 
 
@@ -14,7 +15,7 @@ class Product(models.Model):
     image_url = models.URLField(max_length=255, null=True, blank=True)
     inventory_quantity = models.PositiveIntegerField(default=0, help_text="Current quantity in inventory")
     created_at = models.DateTimeField(auto_now_add=True)
-    updated_at = models.DateTimeField(auto_now=True)
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
 
     class Meta:
         indexes = [
@@ -42,6 +43,10 @@ class Product(models.Model):
     @property
     def average_cost(self):
         """Calculate average cost of this product based on wholesale purchases"""
+        # Use totals annotated by purchase_total_annotations() when available
+        if hasattr(self, 'purchase_total_quantity'):
+            return self.calculate_average_cost(self.purchase_total_cost, self.purchase_total_quantity)
+        
         purchases = self.wholesale_purchases.all()
         if not purchases:
             return Decimal('0.00')
@@ -49,10 +54,57 @@ class Product(models.Model):
         total_quantity = sum(purchase.quantity for purchase in purchases)
         total_cost = sum(purchase.total_cost for purchase in purchases)
         
-        return Decimal(total_cost / total_quantity) if total_quantity > 0 else Decimal('0.00')
+        return self.calculate_average_cost(total_cost, total_quantity)
+    
+    @staticmethod
+    def calculate_average_cost(total_cost, total_quantity):
+        """Average unit cost from summed purchase cost and quantity"""
+        if total_cost is None or not total_quantity or total_quantity <= 0:
+            return Decimal('0.00')
+        return Decimal(total_cost / total_quantity)
+    
+    @staticmethod
+    def purchase_total_annotations(product_ref='pk'):
+        """
+        Subquery annotations with the summed wholesale purchase quantity and cost
+        for the product at ``product_ref``, so average_cost needs no extra queries.
+        Use 'pk' on Product querysets or e.g. 'product' on related models.
+        """
+        from core.models.wholesale_purchase import WholesalePurchase
+        
+        totals = WholesalePurchase.objects.filter(product=OuterRef(product_ref)).values('product')
+        return {
+            'purchase_total_quantity': Subquery(
+                totals.annotate(total=Sum('quantity')).values('total'),
+                output_field=models.IntegerField()
+            ),
+            'purchase_total_cost': Subquery(
+                totals.annotate(total=Sum('total_cost')).values('total'),
+                output_field=models.DecimalField(max_digits=12, decimal_places=2)
+            ),
+        }
+    
+    @staticmethod
+    def latest_cost_annotations(product_ref='pk'):
+        """
+        Subquery annotation with the most recent ProductCost unit cost for the
+        product at ``product_ref``, so latest_unit_cost needs no extra query.
+        """
+        from core.models.product_cost import ProductCost
+        
+        latest = ProductCost.objects.filter(product=OuterRef(product_ref)).order_by('-date', '-id')
+        return {
+            'annotated_latest_unit_cost': Subquery(
+                latest.values('unit_cost')[:1],
+                output_field=models.DecimalField(max_digits=10, decimal_places=2)
+            ),
+        }
     
     @property
     def latest_unit_cost(self):
         """Get the most recent unit cost based on ProductCost entries"""
+        if hasattr(self, 'annotated_latest_unit_cost'):
+            return self.annotated_latest_unit_cost or Decimal('0.00')
+        
         latest_cost = self.cost_history.order_by('-date').first()
         return latest_cost.unit_cost if latest_cost else Decimal('0.00') 
\ No newline at end of file
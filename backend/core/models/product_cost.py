@@ -20,6 +20,7 @@ class ProductCost(models.Model):
         ordering = ['-date']
         indexes = [
             models.Index(fields=['product', '-date']),  # For quick retrieval of latest costs
+            models.Index(fields=['-date', '-id'], name='product_cost_date_id_idx'),  # Cursor pagination of product-costs/
         ]
     
     def __str__(self):
@@ -1,4 +1,32 @@
 from django.db import models
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+from django.utils import timezone
+
+
+def denormalized_values(visit_machine_restock_ids):
+    """visit_date, machine_id and location_id of each VisitMachineRestock id"""
+    from core.models import VisitMachineRestock
+    rows = VisitMachineRestock.objects.filter(id__in=set(visit_machine_restock_ids)).values_list(
+        'id', 'visit__visit_date', 'machine_id', 'machine__location_id'
+    )
+    return {
+        restock_id: {'visit_date': visit_date, 'machine_id': machine_id, 'location_id': location_id}
+        for restock_id, visit_date, machine_id, location_id in rows
+    }
+
+
+class RestockEntryQuerySet(models.QuerySet):
+    def bulk_create(self, objs, *args, **kwargs):
+        # bulk_create skips save(), so fill the copied columns here with one query
+        objs = list(objs)
+        missing = [obj for obj in objs if obj.visit_date is None or obj.machine_id is None or obj.location_id is None]
+        if missing:
+            values = denormalized_values(obj.visit_machine_restock_id for obj in missing)
+            for obj in missing:
+                for field, value in values.get(obj.visit_machine_restock_id, {}).items():
+                    setattr(obj, field, value)
+        return super().bulk_create(objs, *args, **kwargs)
 
 
 class RestockEntry(models.Model):
@@ -8,10 +36,45 @@ class RestockEntry(models.Model):
     discarded = models.IntegerField(default=0)
     restocked = models.IntegerField()
     created_at = models.DateTimeField(auto_now_add=True)
-    updated_at = models.DateTimeField(auto_now=True)
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
+
+    # Copied from visit_machine_restock so date and location windows are index
+    # range scans on this table instead of joins through Visit and Machine.
+    # Kept in sync by save(), bulk_create() and the receivers below.
+    visit_date = models.DateTimeField(null=True, editable=False)
+    machine = models.ForeignKey(
+        'core.Machine', on_delete=models.CASCADE, null=True, editable=False, db_index=False, related_name='+'
+    )
+    location = models.ForeignKey(
+        'core.Location', on_delete=models.CASCADE, null=True, editable=False, db_index=False, related_name='+'
+    )
+
+    objects = RestockEntryQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['location', 'visit_date'], name='restock_location_date_idx'),
+            models.Index(fields=['machine', 'product', 'visit_date'], name='restock_machine_prod_date_idx'),
+            models.Index(fields=['-visit_date', '-id'], name='restock_entry_date_id_idx'),  # Cursor pagination
+            # (visit_machine_restock, product) is idx_restock_entry_visit_machine from 0008
+            models.Index(fields=['product', 'visit_machine_restock'], name='restock_product_visit_idx'),
+        ]
 
     def __str__(self):
         return f"{self.product.name} in {self.visit_machine_restock.machine} restocked: {self.restocked}"
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # save() copies the columns again only when this changes
+        instance._loaded_visit_machine_restock_id = instance.__dict__.get('visit_machine_restock_id')
+        return instance
+
+    def needs_denormalized_values(self):
+        return (
+            self.visit_date is None or self.machine_id is None or self.location_id is None
+            or self.visit_machine_restock_id != getattr(self, '_loaded_visit_machine_restock_id', None)
+        )
     
     def save(self, *args, **kwargs):
         """Update current_stock in MachineItemPrice when restocking and reduce product inventory"""
@@ -22,8 +85,15 @@ class RestockEntry(models.Model):
         # This allows bulk operations to handle inventory updates more efficiently
         skip_inventory_update = kwargs.pop('skip_inventory_update', False)
         
+        # New entries, and entries moved to another visit_machine_restock, copy its columns
+        if self.needs_denormalized_values():
+            values = denormalized_values([self.visit_machine_restock_id]).get(self.visit_machine_restock_id, {})
+            for field, value in values.items():
+                setattr(self, field, value)
+        
         # Call the parent save method
         super().save(*args, **kwargs)
+        self._loaded_visit_machine_restock_id = self.visit_machine_restock_id
         
         # Only perform these actions for new entries and if not skipping updates
         if is_new and not skip_inventory_update:
@@ -36,7 +106,8 @@ class RestockEntry(models.Model):
                     machine=machine,
                     product=self.product
                 ).update(
-                    current_stock=self.stock_before - self.discarded + self.restocked
+                    current_stock=self.stock_before - self.discarded + self.restocked,
+                    updated_at=timezone.now()
                 )
             except Exception:
                 # If the product doesn't exist in the machine yet, we don't update anything
@@ -50,7 +121,8 @@ class RestockEntry(models.Model):
                     id=self.product.id,
                     inventory_quantity__gte=self.restocked  # Ensure sufficient inventory
                 ).update(
-                    inventory_quantity=models.F('inventory_quantity') - self.restocked
+                    inventory_quantity=models.F('inventory_quantity') - self.restocked,
+                    updated_at=timezone.now()
                 )
                 
                 if updated_rows == 0:
@@ -64,4 +136,36 @@ class RestockEntry(models.Model):
             except models.Product.DoesNotExist:
                 raise ValueError("Product not found")
             except ValueError:
-                raise  # Re-raise inventory errors 
\ No newline at end of file
+                raise  # Re-raise inventory errors
+
+
+def sync_restock_entries(entries, values):
+    """Update the copied columns of ``entries`` that differ from ``values``"""
+    entries.exclude(**values).update(**values, updated_at=timezone.now())
+
+
+@receiver(post_save, sender='core.Visit')
+def sync_visit_date(sender, instance, created, raw=False, **kwargs):
+    if not created and not raw:
+        sync_restock_entries(
+            RestockEntry.objects.filter(visit_machine_restock__visit=instance),
+            {'visit_date': instance.visit_date}
+        )
+
+
+@receiver(post_save, sender='core.VisitMachineRestock')
+def sync_visit_machine_restock(sender, instance, created, raw=False, **kwargs):
+    if not created and not raw:
+        sync_restock_entries(
+            RestockEntry.objects.filter(visit_machine_restock=instance),
+            denormalized_values([instance.id])[instance.id]
+        )
+
+
+@receiver(post_save, sender='core.Machine')
+def sync_machine_location(sender, instance, created, raw=False, **kwargs):
+    if not created and not raw:
+        sync_restock_entries(
+            RestockEntry.objects.filter(machine=instance),
+            {'location_id': instance.location_id}
+        )
@@ -10,7 +10,7 @@ class Supplier(models.Model):
     notes = models.TextField(blank=True, default='', help_text="Additional notes about the supplier")
     is_active = models.BooleanField(default=True, help_text="Whether this supplier is currently active")
     created_at = models.DateTimeField(auto_now_add=True)
-    updated_at = models.DateTimeField(auto_now=True)
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
 
     class Meta:
         indexes = [
@@ -26,12 +26,17 @@ class Supplier(models.Model):
     @property
     def purchase_count(self):
         """Return the number of wholesale purchases from this supplier"""
+        # Use the value annotated by SupplierViewSet when available
+        if hasattr(self, 'annotated_purchase_count'):
+            return self.annotated_purchase_count
         return self.wholesale_purchases.count()
     
     @property
     def total_spent(self):
         """Return the total amount spent with this supplier"""
         from decimal import Decimal
+        if hasattr(self, 'annotated_total_spent'):
+            return self.annotated_total_spent or Decimal('0.00')
         return self.wholesale_purchases.aggregate(
             total=models.Sum('total_cost')
         )['total'] or Decimal('0.00') 
\ No newline at end of file
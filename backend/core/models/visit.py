@@ -8,7 +8,16 @@ class Visit(models.Model):
     visit_date = models.DateTimeField()
     notes = models.TextField(blank=True, null=True)
     created_at = models.DateTimeField(auto_now_add=True)
-    updated_at = models.DateTimeField(auto_now=True)
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
+
+    class Meta:
+        indexes = [
+            # Also serves plain visit_date range filters
+            models.Index(fields=['-visit_date', '-id'], name='visit_date_id_idx'),  # Cursor pagination of visits/
+            # Created by 0008_optimize_visit_performance
+            models.Index(fields=['location', '-visit_date'], name='idx_visit_location_date'),
+            models.Index(fields=['user', '-visit_date'], name='idx_visit_user_date'),
+        ]
 
     def __str__(self):
         return f"Visit to {self.location.name} on {self.visit_date.date()}" 
\ No newline at end of file
@@ -6,10 +6,14 @@ class VisitMachineRestock(models.Model):
     machine = models.ForeignKey('core.Machine', on_delete=models.CASCADE, related_name='restocks')
     notes = models.TextField(blank=True, null=True)
     created_at = models.DateTimeField(auto_now_add=True)
-    updated_at = models.DateTimeField(auto_now=True)
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
 
     class Meta:
         unique_together = ('visit', 'machine')
+        indexes = [
+            # The unique (visit, machine) index serves lookups by visit
+            models.Index(fields=['machine', 'visit'], name='restock_machine_visit_idx'),
+        ]
         
     def __str__(self):
         return f"Restock for {self.machine} during {self.visit}" 
\ No newline at end of file
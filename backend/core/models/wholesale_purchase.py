@@ -14,7 +14,12 @@ class WholesalePurchase(models.Model):
     notes = models.TextField(blank=True, default='')
     inventory_updated = models.BooleanField(default=False, help_text="Flag to track if inventory has been updated")
     created_at = models.DateTimeField(auto_now_add=True)
-    updated_at = models.DateTimeField(auto_now=True)
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['-purchased_at', '-id'], name='purchase_date_id_idx'),  # Cursor pagination of purchases/
+        ]
 
     def __str__(self):
         supplier_display = self.supplier or 'Unknown Supplier'
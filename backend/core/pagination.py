@@ -0,0 +1,41 @@
+from rest_framework.pagination import PageNumberPagination, CursorPagination
+from rest_framework.response import Response
+
+
+class StandardResultsSetPagination(PageNumberPagination):
+    """Page number pagination that honours the ?page_size= the frontend sends"""
+    page_size = 50
+    page_size_query_param = 'page_size'
+    max_page_size = 1000
+
+
+class HistoryCursorPagination(CursorPagination):
+    """
+    Keyset pagination for the history endpoints (visits, restocks, purchases, costs).
+
+    Each page is a WHERE on the view's ``ordering`` instead of an OFFSET, and no
+    COUNT(*) is run, so scrolling deep into history costs the same as page 1.
+    Pass ``?count=true`` to get an exact ``count`` when one is really needed.
+    """
+    page_size = 50
+    page_size_query_param = 'page_size'
+    max_page_size = 1000
+    ordering = '-id'
+    count_query_param = 'count'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.count = None
+        if request.query_params.get(self.count_query_param, '').lower() in ('1', 'true', 'yes'):
+            self.count = queryset.count()
+        return super().paginate_queryset(queryset, request, view)
+
+    def get_paginated_response(self, data):
+        response = super().get_paginated_response(data)
+        if self.count is not None:
+            response.data['count'] = self.count
+        return response
+
+    def get_paginated_response_schema(self, schema):
+        schema = super().get_paginated_response_schema(schema)
+        schema['properties']['count'] = {'type': 'integer', 'example': 123}
+        return schema
@@ -0,0 +1,221 @@
+from collections import Counter
+from contextlib import ExitStack
+from django.conf import settings
+from django.core.cache import caches
+from django.db import connections
+from rest_framework.response import Response
+from core.server_timing import SENSITIVE_PARAM_RE
+from core.slow_queries import fingerprint
+import cProfile
+import os
+import pstats
+import sys
+import time
+import uuid
+
+# Project code: call sites are the innermost frames under backend/
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PROFILE_PARAM = '_profile'
+PROFILE_HEADER = 'HTTP_X_PROFILE'
+
+
+def profile_mode(request):
+    """'report' or 'store' when the request asks to be profiled, else None"""
+    value = request.GET.get(PROFILE_PARAM) or request.META.get(PROFILE_HEADER)
+    if not value or not getattr(settings, 'PROFILE_REQUESTS', True):
+        return None
+    return 'store' if value.lower() == 'store' else 'report'
+
+
+def profile_cache():
+    """Shared by all worker processes (settings.CACHES['profiles']), unlike the default cache"""
+    return caches['profiles']
+
+
+def allow_profile(user):
+    """At most PROFILE_RATE_LIMIT profiled requests per user per minute, across all workers"""
+    cache = profile_cache()
+    key = f'profile_rate:{user.pk}'
+    cache.add(key, 0, 60)
+    try:
+        count = cache.incr(key)
+    except ValueError:
+        # Expired between add() and incr()
+        cache.set(key, 1, 60)
+        count = 1
+    return count <= getattr(settings, 'PROFILE_RATE_LIMIT', 6)
+
+
+def _is_project_file(filename):
+    filename = os.path.abspath(filename)
+    return filename.startswith(BACKEND_DIR + os.sep) and 'site-packages' not in filename
+
+
+def _short_path(filename):
+    filename = os.path.abspath(filename)
+    if 'site-packages' + os.sep in filename:
+        return filename.split('site-packages' + os.sep, 1)[1]
+    if filename.startswith(BACKEND_DIR):
+        return os.path.relpath(filename, BACKEND_DIR)
+    return filename
+
+
+def _function_label(func):
+    filename, line, name = func
+    if filename == '~':
+        # Built-ins
+        return name
+    return f'{_short_path(filename)}:{line}({name})'
+
+
+def _call_site(connection):
+    # Other execute wrappers (server timing, metrics, slow query log) sit between the query and its caller
+    wrappers = {
+        getattr(getattr(wrapper, '__func__', wrapper), '__code__', None) for wrapper in connection.execute_wrappers
+    }
+    frame = sys._getframe(2)
+    while frame is not None:
+        if frame.f_code not in wrappers and _is_project_file(frame.f_code.co_filename):
+            return f'{_short_path(frame.f_code.co_filename)}:{frame.f_lineno}({frame.f_code.co_name})'
+        frame = frame.f_back
+    return 'unknown'
+
+
+class RequestProfile:
+    """cProfile plus SQL statements grouped by the project line that ran them"""
+
+    def __init__(self):
+        self.profiler = cProfile.Profile()
+        self.queries = {}
+        self._wrappers = ExitStack()
+        self.running = False
+
+    def record_query(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            elapsed = time.perf_counter() - started
+            site = self.queries.setdefault(
+                _call_site(context['connection']), {'queries': 0, 'time': 0.0, 'statements': Counter()}
+            )
+            site['queries'] += 1
+            site['time'] += elapsed
+            site['statements'][fingerprint(sql)[:300]] += 1
+
+    def start(self):
+        for connection in connections.all():
+            self._wrappers.enter_context(connection.execute_wrapper(self.record_query))
+        self.started = time.perf_counter()
+        self.running = True
+        self.profiler.enable()
+
+    def stop(self):
+        if not self.running:
+            return
+        self.profiler.disable()
+        self.running = False
+        self.elapsed = time.perf_counter() - self.started
+        self._wrappers.close()
+
+    def report(self, limit=None):
+        limit = limit or getattr(settings, 'PROFILE_TOP_FUNCTIONS', 40)
+        stats = pstats.Stats(self.profiler)
+        stats.calc_callees()
+        stats.sort_stats('cumulative')
+
+        functions = []
+        for func in stats.fcn_list[:limit]:
+            calls, total_calls, own_time, cumulative, callers = stats.stats[func]
+            callees = sorted(stats.all_callees.get(func, {}).items(), key=lambda item: -item[1][3])[:3]
+            functions.append({
+                'function': _function_label(func),
+                'calls': total_calls,
+                'own_ms': round(own_time * 1000, 2),
+                'cumulative_ms': round(cumulative * 1000, 2),
+                'callees': [
+                    {'function': _function_label(callee), 'cumulative_ms': round(timing[3] * 1000, 2)}
+                    for callee, timing in callees
+                ],
+            })
+
+        sql = [
+            {
+                'call_site': site,
+                'queries': data['queries'],
+                'total_ms': round(data['time'] * 1000, 2),
+                'statements': [
+                    {'sql': statement, 'count': count} for statement, count in data['statements'].most_common(3)
+                ],
+            }
+            for site, data in sorted(self.queries.items(), key=lambda item: -item[1]['time'])
+        ]
+        return {
+            'total_ms': round(self.elapsed * 1000, 2),
+            'queries': sum(site['queries'] for site in sql),
+            'sql_ms': round(sum(site['total_ms'] for site in sql), 2),
+            'functions': functions,
+            'sql': sql,
+        }
+
+
+class ProfilingViewMixin:
+    """
+    APIView mixin: staff can add ?_profile=1 (or an X-Profile: 1 header) to
+    get a profile of the request instead of its response, or ?_profile=store
+    to get the normal response with an X-Profile-Id that ProfileReportView
+    serves. Requests without the switch only pay for one dict lookup.
+    """
+    _request_profile = None
+
+    def dispatch(self, request, *args, **kwargs):
+        try:
+            return super().dispatch(request, *args, **kwargs)
+        finally:
+            # Exceptions DRF does not handle skip finalize_response
+            if self._request_profile is not None:
+                self._request_profile.stop()
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        mode = profile_mode(request)
+        if mode is None or not request.user.is_staff:
+            return
+        if not allow_profile(request.user):
+            self._profile_skipped = 'rate limited'
+            return
+        self._profile_mode = mode
+        self._request_profile = RequestProfile()
+        self._request_profile.start()
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(request, response, *args, **kwargs)
+        profile = self._request_profile
+        if profile is None:
+            if getattr(self, '_profile_skipped', None):
+                response['X-Profile-Skipped'] = self._profile_skipped
+            return response
+
+        # Rendering is part of what is being profiled
+        if hasattr(response, 'render') and not response.is_rendered:
+            response.render()
+        profile.stop()
+        report = {
+            'method': request.method,
+            'path': request.path,
+            'query': {
+                key: value for key, value in request.GET.items()
+                if key != PROFILE_PARAM and not SENSITIVE_PARAM_RE.search(key)
+            },
+            'status': response.status_code,
+            **profile.report(),
+        }
+
+        if self._profile_mode == 'store':
+            profile_id = uuid.uuid4().hex
+            profile_cache().set(
+                f'profile_report:{profile_id}', report, getattr(settings, 'PROFILE_STORE_SECONDS', 3600)
+            )
+            response['X-Profile-Id'] = profile_id
+            return response
+        return super().finalize_response(request, Response(report), *args, **kwargs)
@@ -0,0 +1,70 @@
+from django.db import connection
+import json
+import re
+
+
+# Databases whose EXPLAIN output sequential_scans() can read
+SUPPORTED_VENDORS = ('postgresql', 'sqlite')
+
+# FROM/JOIN "table" [AS] alias, as written by Django and the raw analytics SQL
+TABLE_ALIAS_RE = re.compile(r'\b(?:FROM|JOIN)\s+"?(\w+)"?(?:\s+(?:AS\s+)?"?(\w+)"?)?', re.IGNORECASE)
+SQL_KEYWORDS = {
+    'on', 'where', 'inner', 'left', 'right', 'outer', 'full', 'cross', 'join', 'group', 'order',
+    'limit', 'offset', 'union', 'having', 'using', 'lateral', 'natural', 'as'
+}
+
+
+def table_aliases(sql):
+    """Map each alias (and table name) in ``sql`` to its table"""
+    aliases = {}
+    for table, alias in TABLE_ALIAS_RE.findall(sql):
+        aliases[table] = table
+        if alias and alias.lower() not in SQL_KEYWORDS:
+            aliases[alias] = table
+    return aliases
+
+
+def _postgres_seq_scans(plan):
+    if plan.get('Node Type') == 'Seq Scan' and plan.get('Relation Name'):
+        yield plan['Relation Name']
+    for child in plan.get('Plans', []):
+        yield from _postgres_seq_scans(child)
+
+
+def sequential_scans(sql, params=None):
+    """
+    Tables that ``sql`` reads with a full table scan, according to the
+    database's own EXPLAIN. SQLite reports plain "SCAN <table>" for these;
+    "SCAN <table> USING INDEX" walks an index in order and is not counted.
+    """
+    with connection.cursor() as cursor:
+        if connection.vendor == 'postgresql':
+            cursor.execute(f'EXPLAIN (FORMAT JSON) {sql}', params)
+            plan = cursor.fetchone()[0]
+            if isinstance(plan, str):
+                plan = json.loads(plan)
+            return sorted(set(_postgres_seq_scans(plan[0]['Plan'])))
+
+        if connection.vendor == 'sqlite':
+            cursor.execute(f'EXPLAIN QUERY PLAN {sql}', params)
+            aliases = table_aliases(sql)
+            tables = set()
+            for row in cursor.fetchall():
+                match = re.match(r'SCAN (\w+)$', row[-1])
+                if match and match.group(1) in aliases:
+                    tables.add(aliases[match.group(1)])
+            return sorted(tables)
+
+    raise NotImplementedError(f'No query plan support for {connection.vendor}')
+
+
+def table_row_count(table):
+    with connection.cursor() as cursor:
+        cursor.execute(f'SELECT COUNT(*) FROM {connection.ops.quote_name(table)}')
+        return cursor.fetchone()[0]
+
+
+def analyze_tables():
+    """Refresh planner statistics, e.g. after generating a dataset"""
+    with connection.cursor() as cursor:
+        cursor.execute('ANALYZE')
@@ -0,0 +1,52 @@
+from contextlib import contextmanager
+from django.db import connections
+from django.db.backends.signals import connection_created
+import time
+
+
+# Called as observer(sql, params, many, context, elapsed) after every statement:
+# request timing, Prometheus metrics and the slow query log
+_observers = []
+
+
+def add_query_observer(observer):
+    if observer not in _observers:
+        _observers.append(observer)
+
+
+def remove_query_observer(observer):
+    if observer in _observers:
+        _observers.remove(observer)
+
+
+@contextmanager
+def query_observer(observer):
+    """Observe statements for the duration of the block"""
+    add_query_observer(observer)
+    try:
+        yield
+    finally:
+        remove_query_observer(observer)
+
+
+def time_query(execute, sql, params, many, context):
+    """The one execute wrapper: times each statement once and passes the duration on"""
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        elapsed = time.perf_counter() - started
+        for observer in _observers:
+            observer(sql, params, many, context, elapsed)
+
+
+def install_query_timer(connection, **kwargs):
+    if time_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(time_query)
+
+
+connection_created.connect(install_query_timer, dispatch_uid='query_timer')
+
+# Connections opened before this module was imported
+for _connection in connections.all(initialized_only=True):
+    install_query_timer(_connection)
@@ -1,11 +1,15 @@
 from .location_serializer import LocationSerializer
 from .machine_serializer import MachineSerializer
-from .product_serializer import ProductSerializer
-from .machine_item_price_serializer import MachineItemPriceSerializer
+from .location_restock_sheet_serializer import RestockSheetMachineSerializer
+from .product_serializer import ProductSerializer, ProductValuesSerializer
+from .machine_item_price_serializer import MachineItemPriceSerializer, MachineItemPriceValuesSerializer
+from .machine_item_price_bulk_serializer import MachineItemPriceBulkUpdateSerializer
 from .supplier_serializer import SupplierSerializer, SupplierListSerializer
 from .wholesale_purchase_serializer import WholesalePurchaseSerializer
+from .purchase_import_serializer import WholesalePurchaseImportSerializer
 from .visit_serializer import VisitSerializer
+from .visit_full_serializer import VisitFullSerializer
 from .visit_machine_restock_serializer import VisitMachineRestockSerializer
-from .restock_entry_serializer import RestockEntrySerializer
+from .restock_entry_serializer import RestockEntrySerializer, RestockEntryValuesSerializer
 from .user_serializer import UserSerializer, RegisterSerializer
 from .product_cost_serializer import ProductCostSerializer 
\ No newline at end of file
@@ -0,0 +1,26 @@
+from rest_framework import serializers
+from core.models import MachineItemPrice
+from .machine_serializer import MachineSerializer
+
+
+class RestockSheetItemSerializer(serializers.ModelSerializer):
+    """One slot of a machine on the restock sheet"""
+    item = serializers.IntegerField(source='id', read_only=True)
+    id = serializers.IntegerField(source='product_id', read_only=True)
+    name = serializers.CharField(source='product.name', read_only=True)
+
+    class Meta:
+        model = MachineItemPrice
+        fields = ['id', 'item', 'name', 'slot', 'price', 'current_stock']
+
+
+class RestockSheetMachineSerializer(MachineSerializer):
+    """A machine with its slots, for locations/{id}/restock-sheet/"""
+    products = RestockSheetItemSerializer(source='item_prices', many=True, read_only=True)
+
+    class Meta(MachineSerializer.Meta):
+        fields = MachineSerializer.Meta.fields + ['products']
+
+    def get_product_count(self, obj):
+        # item_prices is prefetched for the sheet
+        return len(obj.item_prices.all())
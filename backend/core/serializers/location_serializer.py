@@ -1,8 +1,10 @@
 from rest_framework import serializers
 from core.models import Location
 
+from core.sparse_fields import SparseFieldsetSerializerMixin
 
-class LocationSerializer(serializers.ModelSerializer):
+
+class LocationSerializer(SparseFieldsetSerializerMixin, serializers.ModelSerializer):
     class Meta:
         model = Location
         fields = ['id', 'name', 'address', 'route', 'created_at', 'updated_at']
@@ -0,0 +1,209 @@
+from rest_framework import serializers
+from core.models import MachineItemPrice, Machine, Product
+from core.models.machine import touch_machines
+from django.utils import timezone
+from django.db import transaction
+from django.db.models import Q
+
+
+class PriceChangeSerializer(serializers.Serializer):
+    """A single planogram change for one product in one machine"""
+    machine = serializers.IntegerField()
+    product = serializers.IntegerField()
+    price = serializers.DecimalField(max_digits=10, decimal_places=2, min_value=0)
+    slot = serializers.IntegerField(min_value=0, required=False, allow_null=True)
+
+
+class PriceRuleSerializer(serializers.Serializer):
+    """Set the price of one product on every matching machine, e.g. all Combo machines on a route"""
+    product = serializers.IntegerField()
+    price = serializers.DecimalField(max_digits=10, decimal_places=2, min_value=0)
+    route = serializers.CharField(required=False)
+    location = serializers.IntegerField(required=False)
+    machine_type = serializers.ChoiceField(choices=Machine.MACHINE_TYPE_CHOICES, required=False)
+
+    def get_queryset(self, rule):
+        """Return the MachineItemPrice rows the rule applies to"""
+        queryset = MachineItemPrice.objects.filter(product_id=rule['product'])
+
+        route = rule.get('route')
+        if route is not None:
+            if route == 'unassigned':
+                queryset = queryset.filter(Q(machine__location__route__isnull=True) | Q(machine__location__route=''))
+            else:
+                queryset = queryset.filter(machine__location__route=route)
+        if rule.get('location'):
+            queryset = queryset.filter(machine__location_id=rule['location'])
+        if rule.get('machine_type'):
+            queryset = queryset.filter(machine__machine_type=rule['machine_type'])
+
+        return queryset
+
+
+class MachineItemPriceBulkUpdateSerializer(serializers.Serializer):
+    """
+    Applies many price/slot changes in one transaction.
+
+    Explicit ``changes`` are validated with one machine, one product and one
+    existing-row lookup, then written with a single bulk_update plus a bulk_create
+    for products new to a machine. Each rule in ``rules`` becomes one UPDATE.
+    """
+    changes = PriceChangeSerializer(many=True, required=False, default=list)
+    rules = PriceRuleSerializer(many=True, required=False, default=list)
+
+    def validate_changes(self, changes):
+        machine_ids = {change['machine'] for change in changes}
+        product_ids = {change['product'] for change in changes}
+
+        machines = Machine.objects.in_bulk(machine_ids)
+        products = Product.objects.in_bulk(product_ids)
+
+        row_errors = []
+        seen = set()
+        for change in changes:
+            errors = {}
+            if change['machine'] not in machines:
+                errors['machine'] = [f"Invalid machine id {change['machine']}."]
+            if change['product'] not in products:
+                errors['product'] = [f"Invalid product id {change['product']}."]
+            key = (change['machine'], change['product'])
+            if key in seen:
+                errors['non_field_errors'] = ["Duplicate change for this machine and product."]
+            seen.add(key)
+            row_errors.append(errors)
+
+        if any(row_errors):
+            raise serializers.ValidationError(row_errors)
+
+        return changes
+
+    def validate_rules(self, rules):
+        product_ids = {rule['product'] for rule in rules}
+        existing = set(Product.objects.filter(id__in=product_ids).values_list('id', flat=True))
+
+        row_errors = [
+            {} if rule['product'] in existing else {'product': [f"Invalid product id {rule['product']}."]}
+            for rule in rules
+        ]
+        if any(row_errors):
+            raise serializers.ValidationError(row_errors)
+
+        return rules
+
+    def validate(self, attrs):
+        if not attrs.get('changes') and not attrs.get('rules'):
+            raise serializers.ValidationError("Provide at least one change or rule.")
+        return attrs
+
+    @property
+    def row_errors(self):
+        """Return validation errors as a list of {'field', 'row', 'errors'} (1-based rows)"""
+        result = []
+        for field in ['changes', 'rules']:
+            errors = self.errors.get(field)
+            if isinstance(errors, list) and all(isinstance(row, dict) for row in errors):
+                result.extend(
+                    {'field': field, 'row': index + 1, 'errors': row}
+                    for index, row in enumerate(errors) if row
+                )
+            elif errors:
+                result.append({'field': field, 'row': None, 'errors': errors})
+        if 'non_field_errors' in self.errors:
+            result.append({'field': None, 'row': None, 'errors': self.errors['non_field_errors']})
+        return result
+
+    def build_plan(self):
+        """Work out which rows will be updated or created, without writing anything"""
+        changes = self.validated_data['changes']
+        now = timezone.now()
+
+        existing = {}
+        if changes:
+            # One OR per pair overflows the database's expression depth on fleet-wide changes;
+            # fetch the machines x products rows instead and match the pairs below
+            wanted = {(change['machine'], change['product']) for change in changes}
+            items = MachineItemPrice.objects.filter(
+                machine_id__in={machine for machine, product in wanted},
+                product_id__in={product for machine, product in wanted},
+            )
+            existing = {
+                (item.machine_id, item.product_id): item
+                for item in items if (item.machine_id, item.product_id) in wanted
+            }
+
+        to_update = []
+        to_create = []
+        unchanged = 0
+        for change in changes:
+            item = existing.get((change['machine'], change['product']))
+            slot = change.get('slot')
+
+            if item is None:
+                to_create.append(MachineItemPrice(
+                    machine_id=change['machine'],
+                    product_id=change['product'],
+                    price=change['price'],
+                    slot=slot if slot is not None else 1
+                ))
+                continue
+
+            if item.price == change['price'] and (slot is None or item.slot == slot):
+                unchanged += 1
+                continue
+
+            item.price = change['price']
+            if slot is not None:
+                item.slot = slot
+            item.updated_at = now
+            to_update.append(item)
+
+        rule_field = PriceRuleSerializer()
+        rule_querysets = [
+            (rule, rule_field.get_queryset(rule).exclude(price=rule['price']))
+            for rule in self.validated_data['rules']
+        ]
+
+        return {
+            'to_update': to_update,
+            'to_create': to_create,
+            'unchanged': unchanged,
+            'rules': rule_querysets,
+        }
+
+    def preview(self):
+        """Summary of what save() would do"""
+        plan = self.build_plan()
+        return {
+            'updated': len(plan['to_update']),
+            'created': len(plan['to_create']),
+            'unchanged': plan['unchanged'],
+            'rule_updated': sum(queryset.count() for rule, queryset in plan['rules']),
+        }
+
+    @transaction.atomic
+    def create(self, validated_data):
+        plan = self.build_plan()
+        now = timezone.now()
+
+        if plan['to_update']:
+            MachineItemPrice.objects.bulk_update(plan['to_update'], ['price', 'slot', 'updated_at'])
+        if plan['to_create']:
+            MachineItemPrice.objects.bulk_create(plan['to_create'])
+            # bulk_create skips post_save, so the machines' product_count is refreshed here
+            touch_machines(item.machine_id for item in plan['to_create'])
+
+        rule_updated = 0
+        for rule, queryset in plan['rules']:
+            # Filters across joins compile to UPDATE ... WHERE id IN (subquery): one statement per rule
+            rule_updated += queryset.update(price=rule['price'], updated_at=now)
+
+        self.summary = {
+            'updated': len(plan['to_update']),
+            'created': len(plan['to_create']),
+            'unchanged': plan['unchanged'],
+            'rule_updated': rule_updated,
+        }
+        return self.summary
+
+    def to_representation(self, instance):
+        return getattr(self, 'summary', {})
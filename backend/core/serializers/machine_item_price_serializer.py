@@ -1,8 +1,10 @@
 from rest_framework import serializers
 from core.models import MachineItemPrice, Product, Machine
+from core.sparse_fields import SparseFieldsetSerializerMixin
+from core.values_serializers import ValuesSerializer
 
 
-class MachineItemPriceSerializer(serializers.ModelSerializer):
+class MachineItemPriceSerializer(SparseFieldsetSerializerMixin, serializers.ModelSerializer):
     product_name = serializers.SerializerMethodField()
     machine_info = serializers.SerializerMethodField()
     profit_margin = serializers.SerializerMethodField()
@@ -20,4 +22,23 @@ class MachineItemPriceSerializer(serializers.ModelSerializer):
         return f"{obj.machine.machine_type} {obj.machine.model} at {obj.machine.location.name}"
     
     def get_profit_margin(self, obj):
-        return obj.profit_margin 
\ No newline at end of file
+        return obj.profit_margin
+
+
+def _profit_margin(row):
+    cost = Product.calculate_average_cost(row['purchase_total_cost'], row['purchase_total_quantity'])
+    return MachineItemPrice.calculate_profit_margin(row['price'], cost)
+
+
+class MachineItemPriceValuesSerializer(ValuesSerializer):
+    """MachineItemPriceSerializer output from values(); needs the viewset's purchase total annotations"""
+    serializer_class = MachineItemPriceSerializer
+    computed_fields = {
+        'product_name': (['product__name'], lambda row: row['product__name']),
+        'machine_info': (
+            ['machine__machine_type', 'machine__model', 'machine__location__name'],
+            lambda row: f"{row['machine__machine_type']} {row['machine__model']} at {row['machine__location__name']}"
+        ),
+        'profit_margin': (['price', 'purchase_total_cost', 'purchase_total_quantity'], _profit_margin),
+    }
+
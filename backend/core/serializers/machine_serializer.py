@@ -1,8 +1,9 @@
 from rest_framework import serializers
 from core.models import Machine, Location
+from core.sparse_fields import SparseFieldsetSerializerMixin
 
 
-class MachineSerializer(serializers.ModelSerializer):
+class MachineSerializer(SparseFieldsetSerializerMixin, serializers.ModelSerializer):
     location_name = serializers.SerializerMethodField()
     route = serializers.SerializerMethodField()
     route_name = serializers.SerializerMethodField()
@@ -23,4 +24,7 @@ class MachineSerializer(serializers.ModelSerializer):
         return obj.location.route or 'No Route Assigned'
         
     def get_product_count(self, obj):
+        # MachineViewSet annotates item_count; fall back to a COUNT query otherwise
+        if hasattr(obj, 'item_count'):
+            return obj.item_count
         return obj.item_prices.count() 
\ No newline at end of file
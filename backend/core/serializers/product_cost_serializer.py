@@ -1,8 +1,10 @@
 from rest_framework import serializers
 from core.models import ProductCost
 
+from core.sparse_fields import SparseFieldsetSerializerMixin
 
-class ProductCostSerializer(serializers.ModelSerializer):
+
+class ProductCostSerializer(SparseFieldsetSerializerMixin, serializers.ModelSerializer):
     product_name = serializers.CharField(source='product.name', read_only=True)
     unit_type = serializers.CharField(source='product.unit_type', read_only=True)
     supplier = serializers.CharField(source='purchase.supplier', read_only=True, default='N/A')
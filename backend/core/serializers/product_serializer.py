@@ -2,9 +2,11 @@ from rest_framework import serializers
 from core.models import Product, WholesalePurchase, ProductCost
 from decimal import Decimal
 from django.utils import timezone
+from core.sparse_fields import SparseFieldsetSerializerMixin
+from core.values_serializers import ValuesSerializer
 
 
-class ProductSerializer(serializers.ModelSerializer):
+class ProductSerializer(SparseFieldsetSerializerMixin, serializers.ModelSerializer):
     average_cost = serializers.SerializerMethodField()
     latest_cost = serializers.SerializerMethodField()
     cost_price = serializers.DecimalField(write_only=True, required=False, default=0, max_digits=10, decimal_places=2)
@@ -32,7 +34,8 @@ class ProductSerializer(serializers.ModelSerializer):
     def to_representation(self, instance):
         representation = super().to_representation(instance)
         # Add cost_price to representation using latest cost if available, otherwise use average cost
-        representation['cost_price'] = instance.latest_unit_cost or instance.average_cost
+        if 'cost_price' in self.fields:
+            representation['cost_price'] = instance.latest_unit_cost or instance.average_cost
         return representation
         
     def create(self, validated_data):
@@ -108,4 +111,27 @@ class ProductSerializer(serializers.ModelSerializer):
                     total_cost=Decimal(str(cost_price)) * abs(inventory_change)
                 )
                 
-        return instance 
\ No newline at end of file
+        return instance
+
+
+def _average_cost(row):
+    return Product.calculate_average_cost(row['purchase_total_cost'], row['purchase_total_quantity'])
+
+
+def _latest_cost(row):
+    return row['annotated_latest_unit_cost'] or Decimal('0.00')
+
+
+class ProductValuesSerializer(ValuesSerializer):
+    """ProductSerializer output from values(); needs ProductViewSet's cost annotations"""
+    serializer_class = ProductSerializer
+    computed_fields = {
+        'average_cost': (['purchase_total_cost', 'purchase_total_quantity'], _average_cost),
+        'latest_cost': (['annotated_latest_unit_cost'], _latest_cost),
+        'cost_price': (
+            ['purchase_total_cost', 'purchase_total_quantity', 'annotated_latest_unit_cost'],
+            lambda row: _latest_cost(row) or _average_cost(row)
+        ),
+    }
+    appended_fields = ('cost_price',)
+
@@ -0,0 +1,152 @@
+from rest_framework import serializers
+from core.models import WholesalePurchase, Product, ProductCost, Supplier
+from decimal import Decimal
+from django.utils import timezone
+from django.db import transaction
+from django.db.models import F, Case, When, Value, IntegerField
+import csv
+import io
+
+
+class PurchaseImportRowSerializer(serializers.Serializer):
+    """A single purchase line from a receipt or back-fill file"""
+    product = serializers.IntegerField()
+    supplier = serializers.IntegerField(required=False, allow_null=True, default=None)
+    quantity = serializers.IntegerField(min_value=1)
+    total_cost = serializers.DecimalField(max_digits=10, decimal_places=2, required=False, allow_null=True)
+    cost_per_unit = serializers.DecimalField(max_digits=10, decimal_places=2, required=False, allow_null=True)
+    purchased_at = serializers.DateTimeField(required=False, default=timezone.now)
+    notes = serializers.CharField(required=False, allow_blank=True, default='')
+
+    def to_internal_value(self, data):
+        # CSV cells arrive as empty strings; treat them as missing values
+        if isinstance(data, dict):
+            data = {key: value for key, value in data.items() if value not in ('', None) or key == 'notes'}
+        return super().to_internal_value(data)
+
+    def validate(self, attrs):
+        total_cost = attrs.get('total_cost')
+        cost_per_unit = attrs.pop('cost_per_unit', None)
+
+        if total_cost is None:
+            if cost_per_unit is None:
+                raise serializers.ValidationError("Either total_cost or cost_per_unit is required.")
+            attrs['total_cost'] = Decimal(str(cost_per_unit)) * Decimal(attrs['quantity'])
+
+        return attrs
+
+
+class WholesalePurchaseImportSerializer(serializers.Serializer):
+    """
+    Validates and imports many wholesale purchases at once.
+
+    Unlike WholesalePurchaseSerializer this does not go through the model's
+    post_save signal. Products and suppliers are validated with one lookup each,
+    purchases and cost records are bulk created, and inventory is incremented
+    with a single UPDATE per table, all inside one transaction.
+    """
+    purchases = PurchaseImportRowSerializer(many=True, allow_empty=False)
+
+    CSV_FIELDS = ['product', 'supplier', 'quantity', 'total_cost', 'cost_per_unit', 'purchased_at', 'notes']
+
+    @classmethod
+    def rows_from_csv(cls, text):
+        """Parse CSV text (with a header row) into a list of row dicts"""
+        if isinstance(text, bytes):
+            text = text.decode('utf-8-sig')
+        reader = csv.DictReader(io.StringIO(text))
+        return [
+            {key.strip(): (value or '').strip() for key, value in row.items() if key and key.strip() in cls.CSV_FIELDS}
+            for row in reader
+        ]
+
+    def validate_purchases(self, rows):
+        product_ids = {row['product'] for row in rows}
+        supplier_ids = {row['supplier'] for row in rows if row.get('supplier') is not None}
+
+        products = Product.objects.in_bulk(product_ids)
+        suppliers = Supplier.objects.filter(id__in=supplier_ids, is_active=True).in_bulk()
+
+        row_errors = []
+        for row in rows:
+            errors = {}
+            if row['product'] not in products:
+                errors['product'] = [f"Invalid product id {row['product']}."]
+            supplier_id = row.get('supplier')
+            if supplier_id is not None and supplier_id not in suppliers:
+                errors['supplier'] = ["Invalid supplier or supplier is not active."]
+            row_errors.append(errors)
+
+        if any(row_errors):
+            raise serializers.ValidationError(row_errors)
+
+        return rows
+
+    @property
+    def row_errors(self):
+        """Return validation errors as a list of {'row': n, 'errors': {...}} (1-based rows)"""
+        errors = self.errors.get('purchases', self.errors)
+        if not isinstance(errors, list) or not all(isinstance(row, dict) for row in errors):
+            # Errors about the payload as a whole rather than individual rows
+            return [{'row': None, 'errors': errors}]
+        return [
+            {'row': index + 1, 'errors': row}
+            for index, row in enumerate(errors) if row
+        ]
+
+    @transaction.atomic
+    def create(self, validated_data):
+        rows = validated_data['purchases']
+
+        # Purchases are created with inventory_updated=True: bulk_create skips the
+        # post_save signal and inventory is applied below in aggregate instead.
+        purchases = WholesalePurchase.objects.bulk_create([
+            WholesalePurchase(
+                product_id=row['product'],
+                supplier_id=row.get('supplier'),
+                quantity=row['quantity'],
+                total_cost=row['total_cost'],
+                purchased_at=row['purchased_at'],
+                notes=row.get('notes', ''),
+                inventory_updated=True
+            )
+            for row in rows
+        ])
+
+        ProductCost.objects.bulk_create([
+            ProductCost(
+                product_id=purchase.product_id,
+                purchase=purchase,
+                date=purchase.purchased_at,
+                quantity=purchase.quantity,
+                unit_cost=purchase.unit_cost,
+                total_cost=purchase.total_cost
+            )
+            for purchase in purchases
+        ])
+
+        # Aggregate inventory increments per product and apply them in one UPDATE
+        inventory_updates = {}
+        for purchase in purchases:
+            inventory_updates[purchase.product_id] = inventory_updates.get(purchase.product_id, 0) + purchase.quantity
+
+        Product.objects.filter(id__in=inventory_updates.keys()).update(
+            inventory_quantity=F('inventory_quantity') + Case(
+                *[When(id=product_id, then=Value(quantity)) for product_id, quantity in inventory_updates.items()],
+                default=Value(0),
+                output_field=IntegerField()
+            ),
+            updated_at=timezone.now()
+        )
+
+        self.summary = {
+            'created': len(purchases),
+            'products_updated': len(inventory_updates),
+            'total_quantity': sum(inventory_updates.values()),
+            'total_cost': sum((purchase.total_cost for purchase in purchases), Decimal('0.00')),
+            'purchase_ids': [purchase.id for purchase in purchases],
+        }
+        return purchases
+
+    def to_representation(self, instance):
+        return getattr(self, 'summary', {})
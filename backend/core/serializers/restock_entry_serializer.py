@@ -1,8 +1,12 @@
 from rest_framework import serializers
 from core.models import RestockEntry, MachineItemPrice
+from django.db.models import OuterRef, Subquery
 
+from core.sparse_fields import SparseFieldsetSerializerMixin
+from core.values_serializers import ValuesSerializer
 
-class RestockEntrySerializer(serializers.ModelSerializer):
+
+class RestockEntrySerializer(SparseFieldsetSerializerMixin, serializers.ModelSerializer):
     product_name = serializers.SerializerMethodField()
     machine_name = serializers.SerializerMethodField()
     machine_type = serializers.SerializerMethodField()
@@ -22,22 +26,23 @@ class RestockEntrySerializer(serializers.ModelSerializer):
         return obj.product.name
     
     def get_machine_name(self, obj):
-        return obj.visit_machine_restock.machine.name
+        return obj.machine.name
     
     def get_machine_type(self, obj):
-        return obj.visit_machine_restock.machine.machine_type
+        return obj.machine.machine_type
     
     def get_machine_model(self, obj):
-        return obj.visit_machine_restock.machine.model or ''
+        return obj.machine.model or ''
     
     def get_visit_date(self, obj):
-        return obj.visit_machine_restock.visit.visit_date
+        # Copied from the visit when the entry is saved
+        return obj.visit_date
         
     def get_slot(self, obj):
         """Get the slot number for this product in the machine"""
         try:
             # Try to get from prefetched data first to avoid additional query
-            machine = obj.visit_machine_restock.machine
+            machine = obj.machine
             if hasattr(machine, '_prefetched_objects_cache') and 'item_prices' in machine._prefetched_objects_cache:
                 # Use prefetched data if available
                 for item in machine.item_prices.all():
@@ -49,4 +54,34 @@ class RestockEntrySerializer(serializers.ModelSerializer):
                 machine_item = MachineItemPrice.objects.get(machine=machine, product=obj.product)
                 return machine_item.slot
         except MachineItemPrice.DoesNotExist:
-            return None 
\ No newline at end of file
+            return None
+
+
+class RestockEntryValuesSerializer(ValuesSerializer):
+    """RestockEntrySerializer output from values()"""
+    serializer_class = RestockEntrySerializer
+    computed_fields = {
+        'product_name': (['product__name'], lambda row: row['product__name']),
+        'machine_name': (['machine__name'], lambda row: row['machine__name']),
+        'machine_type': (
+            ['machine__machine_type'],
+            lambda row: row['machine__machine_type']
+        ),
+        'machine_model': (
+            ['machine__model'],
+            lambda row: row['machine__model'] or ''
+        ),
+        # get_visit_date returns the datetime itself, which the JSON encoder renders
+        'visit_date': (['visit_date'], lambda row: row['visit_date']),
+        'slot': ([], lambda row: row['machine_slot']),
+    }
+
+    def get_expressions(self):
+        if not any(name == 'slot' for name, mapper in self.mappers):
+            return {}
+        slots = MachineItemPrice.objects.filter(
+            machine=OuterRef('machine'),
+            product=OuterRef('product')
+        ).values('slot')[:1]
+        return {'machine_slot': Subquery(slots)}
+
@@ -1,8 +1,21 @@
 from rest_framework import serializers
 from core.models import Supplier
+from decimal import Decimal
+from core.sparse_fields import SparseFieldsetSerializerMixin
 
 
-class SupplierSerializer(serializers.ModelSerializer):
+class SupplierPeriodStatsMixin:
+    """Add spend for the ?since= window when SupplierViewSet annotated it"""
+    
+    def to_representation(self, instance):
+        representation = super().to_representation(instance)
+        if hasattr(instance, 'period_purchase_count'):
+            representation['period_purchase_count'] = instance.period_purchase_count
+            representation['period_total_spent'] = instance.period_total_spent or Decimal('0.00')
+        return representation
+
+
+class SupplierSerializer(SupplierPeriodStatsMixin, SparseFieldsetSerializerMixin, serializers.ModelSerializer):
     purchase_count = serializers.SerializerMethodField()
     total_spent = serializers.SerializerMethodField()
     
@@ -45,7 +58,7 @@ class SupplierSerializer(serializers.ModelSerializer):
         return value.strip()
 
 
-class SupplierListSerializer(serializers.ModelSerializer):
+class SupplierListSerializer(SupplierPeriodStatsMixin, SparseFieldsetSerializerMixin, serializers.ModelSerializer):
     """Lightweight serializer for listing suppliers"""
     purchase_count = serializers.SerializerMethodField()
     
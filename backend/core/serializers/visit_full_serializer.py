@@ -0,0 +1,59 @@
+from rest_framework import serializers
+from core.models import Visit, VisitMachineRestock, RestockEntry
+from .visit_serializer import VisitSerializer
+
+
+class VisitFullEntrySerializer(serializers.ModelSerializer):
+    """A restock entry with the slot, price and stock of its product in the machine"""
+    product_name = serializers.CharField(source='product.name', read_only=True)
+    slot = serializers.SerializerMethodField()
+    price = serializers.SerializerMethodField()
+    current_stock = serializers.SerializerMethodField()
+
+    class Meta:
+        model = RestockEntry
+        fields = ['id', 'product', 'product_name', 'slot', 'price', 'current_stock',
+                  'stock_before', 'discarded', 'restocked']
+
+    def get_machine_item(self, obj):
+        # Built once per machine from the prefetched item_prices (see VisitViewSet.full)
+        machine = obj.visit_machine_restock.machine
+        if not hasattr(machine, '_items_by_product'):
+            machine._items_by_product = {item.product_id: item for item in machine.item_prices.all()}
+        return machine._items_by_product.get(obj.product_id)
+
+    def get_slot(self, obj):
+        item = self.get_machine_item(obj)
+        return item.slot if item else None
+
+    def get_price(self, obj):
+        item = self.get_machine_item(obj)
+        # Strings, like the price field of machine-items/
+        return str(item.price) if item else None
+
+    def get_current_stock(self, obj):
+        item = self.get_machine_item(obj)
+        return item.current_stock if item else None
+
+
+class VisitFullMachineRestockSerializer(serializers.ModelSerializer):
+    machine_name = serializers.CharField(source='machine.name', read_only=True)
+    machine_type = serializers.CharField(source='machine.machine_type', read_only=True)
+    machine_model = serializers.SerializerMethodField()
+    entries = VisitFullEntrySerializer(source='restock_entries', many=True, read_only=True)
+
+    class Meta:
+        model = VisitMachineRestock
+        fields = ['id', 'machine', 'machine_name', 'machine_type', 'machine_model', 'notes', 'entries']
+
+    def get_machine_model(self, obj):
+        return obj.machine.model or ''
+
+
+class VisitFullSerializer(VisitSerializer):
+    """A visit with its machine restocks, entries and slot data, for visits/{id}/full/"""
+    machine_restocks = VisitFullMachineRestockSerializer(many=True, read_only=True)
+
+    class Meta(VisitSerializer.Meta):
+        model = Visit
+        fields = VisitSerializer.Meta.fields + ['machine_restocks']
@@ -1,8 +1,10 @@
 from rest_framework import serializers
 from core.models import VisitMachineRestock
 
+from core.sparse_fields import SparseFieldsetSerializerMixin
 
-class VisitMachineRestockSerializer(serializers.ModelSerializer):
+
+class VisitMachineRestockSerializer(SparseFieldsetSerializerMixin, serializers.ModelSerializer):
     machine_info = serializers.SerializerMethodField()
     visit_info = serializers.SerializerMethodField()
     
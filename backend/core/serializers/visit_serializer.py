@@ -2,8 +2,10 @@ from rest_framework import serializers
 from core.models import Visit
 from django.contrib.auth.models import User
 
+from core.sparse_fields import SparseFieldsetSerializerMixin
 
-class VisitSerializer(serializers.ModelSerializer):
+
+class VisitSerializer(SparseFieldsetSerializerMixin, serializers.ModelSerializer):
     location_name = serializers.SerializerMethodField()
     user_name = serializers.SerializerMethodField()
     
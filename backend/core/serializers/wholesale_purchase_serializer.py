@@ -3,9 +3,10 @@ from core.models import WholesalePurchase, Product, ProductCost, Supplier
 from decimal import Decimal
 from django.utils import timezone
 from django.db import transaction
+from core.sparse_fields import SparseFieldsetSerializerMixin
 
 
-class WholesalePurchaseSerializer(serializers.ModelSerializer):
+class WholesalePurchaseSerializer(SparseFieldsetSerializerMixin, serializers.ModelSerializer):
     product_name = serializers.SerializerMethodField()
     supplier_name = serializers.SerializerMethodField()
     unit_cost = serializers.SerializerMethodField()
@@ -40,13 +41,11 @@ class WholesalePurchaseSerializer(serializers.ModelSerializer):
     def to_representation(self, instance):
         representation = super().to_representation(instance)
         # Map backend field names to frontend expectations
-        representation['cost_per_unit'] = representation['unit_cost']
-        representation['purchase_date'] = representation['purchased_at']
+        if 'cost_per_unit' in self.fields:
+            representation['cost_per_unit'] = instance.unit_cost
         # Ensure supplier field shows the ID for frontend compatibility
-        if instance.supplier:
-            representation['supplier'] = instance.supplier.id
-        else:
-            representation['supplier'] = None
+        if 'supplier' in representation:
+            representation['supplier'] = instance.supplier_id
         return representation
         
     def validate_supplier(self, value):
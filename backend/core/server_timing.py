@@ -0,0 +1,200 @@
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from contextlib import contextmanager
+from contextvars import ContextVar
+from django.conf import settings
+from django.utils.functional import SimpleLazyObject, empty
+from core.query_timing import add_query_observer
+from urllib.parse import parse_qsl, urlencode
+import json
+import logging
+import random
+import re
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+
+# Timing of the request being served. Worker threads that serve part of a
+# request (batch sub-requests, async views) run in a copy of its context.
+_current = ContextVar('request_timing', default=None)
+
+# Query parameters left out of the log: credentials must not end up in log files
+SENSITIVE_PARAM_RE = re.compile(r'token|auth|key|secret|pass|signature|session|jwt', re.IGNORECASE)
+
+
+class RequestTiming:
+    """Where one request's time went: SQL, analytics cache, compute and rendering"""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.db_queries = 0
+        self.db_time = 0.0
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self.durations = {}
+        self._lock = threading.Lock()
+
+    def add_query(self, elapsed):
+        with self._lock:
+            self.db_queries += 1
+            self.db_time += elapsed
+
+    def add_cache(self, hit):
+        with self._lock:
+            if hit:
+                self.cache_hits += 1
+            else:
+                self.cache_misses += 1
+
+    def add_duration(self, name, elapsed):
+        with self._lock:
+            self.durations[name] = self.durations.get(name, 0.0) + elapsed
+
+    def total(self):
+        return time.perf_counter() - self.started
+
+    def header_value(self, total):
+        metrics = [f'db;dur={self.db_time * 1000:.1f};desc="{self.db_queries} queries"']
+        if self.cache_hits or self.cache_misses:
+            metrics.append(f'cache;desc="hit={self.cache_hits} miss={self.cache_misses}"')
+        for name, elapsed in self.durations.items():
+            metrics.append(f'{name};dur={elapsed * 1000:.1f}')
+        metrics.append(f'total;dur={total * 1000:.1f}')
+        return ', '.join(metrics)
+
+    def as_dict(self, total):
+        return {
+            'total_ms': round(total * 1000, 1),
+            'db_queries': self.db_queries,
+            'db_ms': round(self.db_time * 1000, 1),
+            'cache_hits': self.cache_hits,
+            'cache_misses': self.cache_misses,
+            **{f'{name}_ms': round(elapsed * 1000, 1) for name, elapsed in self.durations.items()},
+        }
+
+
+def current_timing():
+    return _current.get()
+
+
+def record_cache(hit):
+    timing = _current.get()
+    if timing is not None:
+        timing.add_cache(hit)
+
+
+@contextmanager
+def timed(name):
+    """Add the time spent in the block to the current request's ``name`` metric"""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        timing = _current.get()
+        if timing is not None:
+            timing.add_duration(name, time.perf_counter() - started)
+
+
+def loggable_query(query_string):
+    """``query_string`` without the parameters whose names look like credentials"""
+    params = parse_qsl(query_string, keep_blank_values=True)
+    return urlencode([(name, value) for name, value in params if not SENSITIVE_PARAM_RE.search(name)])
+
+
+def record_query(sql, params, many, context, elapsed):
+    timing = _current.get()
+    if timing is not None:
+        timing.add_query(elapsed)
+
+
+add_query_observer(record_query)
+
+
+class ServerTimingMiddleware:
+    """
+    Measure every request and report it in a Server-Timing header (to staff
+    users, or to everyone with SERVER_TIMING_HEADER) and as a JSON log line on
+    core.server_timing.
+    A SERVER_TIMING_LOG_SAMPLE_RATE share of requests is logged, plus every
+    request slower than SERVER_TIMING_SLOW_MS.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+            # Django would run the sync hook in a thread on every request
+            self.process_template_response = self.aprocess_template_response
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        timing = RequestTiming()
+        token = _current.set(timing)
+        try:
+            response = self.get_response(request)
+        finally:
+            _current.reset(token)
+        return self.finish(request, response, timing, self.show_header(request))
+
+    async def __acall__(self, request):
+        timing = RequestTiming()
+        token = _current.set(timing)
+        try:
+            response = await self.get_response(request)
+        finally:
+            _current.reset(token)
+        return self.finish(request, response, timing, await self.ashow_header(request))
+
+    def finish(self, request, response, timing, show_header):
+        if hasattr(request, '_server_timing_render_started'):
+            timing.add_duration('render', time.perf_counter() - request._server_timing_render_started)
+        total = timing.total()
+
+        if show_header:
+            response['Server-Timing'] = timing.header_value(total)
+        if self.should_log(total):
+            logger.info(json.dumps({
+                'event': 'request_timing',
+                'method': request.method,
+                'path': request.path,
+                'query': loggable_query(request.META.get('QUERY_STRING', '')),
+                'status': response.status_code,
+                **timing.as_dict(total),
+            }))
+        return response
+
+    def process_template_response(self, request, response):
+        # Called right before DRF renders the response
+        request._server_timing_render_started = time.perf_counter()
+        return response
+
+    async def aprocess_template_response(self, request, response):
+        request._server_timing_render_started = time.perf_counter()
+        return response
+
+    def show_header(self, request):
+        # Query counts and timings are for staff eyes unless SERVER_TIMING_HEADER opens them to all
+        if getattr(settings, 'SERVER_TIMING_HEADER', False):
+            return True
+        # DRF sets the token-authenticated user on the underlying request too
+        user = getattr(request, 'user', None)
+        return bool(user is not None and user.is_staff)
+
+    async def ashow_header(self, request):
+        if getattr(settings, 'SERVER_TIMING_HEADER', False):
+            return True
+        user = getattr(request, 'user', None)
+        if isinstance(user, SimpleLazyObject) and user._wrapped is empty:
+            # Not authenticated by a DRF view; the session lookup must not block the event loop
+            return await sync_to_async(self.show_header)(request)
+        return bool(user is not None and user.is_staff)
+
+    def should_log(self, total):
+        if total * 1000 >= getattr(settings, 'SERVER_TIMING_SLOW_MS', 1000):
+            return True
+        return random.random() < getattr(settings, 'SERVER_TIMING_LOG_SAMPLE_RATE', 0.1)
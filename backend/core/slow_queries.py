@@ -0,0 +1,156 @@
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from contextvars import ContextVar
+from django.conf import settings
+from django.db import DatabaseError, transaction
+from core.query_timing import add_query_observer
+import hashlib
+import json
+import logging
+import random
+import re
+import time
+
+logger = logging.getLogger(__name__)
+
+
+# View serving the current request, for attributing slow statements
+_view_name = ContextVar('slow_query_view', default=None)
+# Set while running EXPLAIN, so the EXPLAIN itself is never logged
+_explaining = ContextVar('slow_query_explaining', default=False)
+# fingerprint id -> time its plan was last captured in this process
+_explained_at = {}
+
+STRING_LITERAL_RE = re.compile(r"'(?:[^']|'')*'")
+NUMBER_RE = re.compile(r'\b\d+(?:\.\d+)?\b')
+PLACEHOLDER_RE = re.compile(r'%s|\?')
+IN_LIST_RE = re.compile(r'\bIN\s*\(\s*\?(?:\s*,\s*\?)*\s*\)', re.IGNORECASE)
+VALUES_LIST_RE = re.compile(r'\bVALUES\s*\(.*\)', re.IGNORECASE | re.DOTALL)
+WHITESPACE_RE = re.compile(r'\s+')
+
+
+def fingerprint(sql):
+    """``sql`` with literals and parameters replaced, so repeats of one statement group together"""
+    sql = STRING_LITERAL_RE.sub('?', sql)
+    sql = NUMBER_RE.sub('?', sql)
+    sql = PLACEHOLDER_RE.sub('?', sql)
+    sql = IN_LIST_RE.sub('IN (...)', sql)
+    sql = VALUES_LIST_RE.sub('VALUES (...)', sql)
+    return WHITESPACE_RE.sub(' ', sql).strip()
+
+
+def fingerprint_id(normalized):
+    return hashlib.md5(normalized.encode()).hexdigest()[:12]
+
+
+def explain(connection, sql, params):
+    """Query plan of ``sql`` as text, or None where there is no EXPLAIN support"""
+    if connection.vendor == 'postgresql':
+        statement = f'EXPLAIN (ANALYZE, BUFFERS) {sql}'
+    elif connection.vendor == 'sqlite':
+        statement = f'EXPLAIN QUERY PLAN {sql}'
+    else:
+        return None
+
+    token = _explaining.set(True)
+    try:
+        # A savepoint, so a failed EXPLAIN does not break the caller's transaction
+        with transaction.atomic(using=connection.alias), connection.cursor() as cursor:
+            cursor.execute(statement, params)
+            rows = cursor.fetchall()
+    except DatabaseError:
+        return None
+    finally:
+        _explaining.reset(token)
+
+    # Postgres returns one line per row, SQLite (id, parent, notused, detail)
+    return '\n'.join(str(row[-1]) for row in rows)
+
+
+def should_explain(sql, many, fingerprint_key):
+    # EXPLAIN ANALYZE runs the statement again, so only ever for reads
+    if many or not sql.lstrip().upper().startswith('SELECT'):
+        return False
+    if random.random() >= getattr(settings, 'SLOW_QUERY_EXPLAIN_SAMPLE_RATE', 0.1):
+        return False
+    interval = getattr(settings, 'SLOW_QUERY_EXPLAIN_INTERVAL', 300)
+    now = time.monotonic()
+    if now - _explained_at.get(fingerprint_key, -interval) < interval:
+        return False
+    _explained_at[fingerprint_key] = now
+    return True
+
+
+def log_slow_query(sql, params, many, context, elapsed):
+    """Query observer that logs statements slower than SLOW_QUERY_THRESHOLD_MS"""
+    if _explaining.get():
+        return
+
+    duration_ms = elapsed * 1000
+    if duration_ms < getattr(settings, 'SLOW_QUERY_THRESHOLD_MS', 200):
+        return
+
+    connection = context['connection']
+    normalized = fingerprint(sql)
+    key = fingerprint_id(normalized)
+    rowcount = getattr(context['cursor'], 'rowcount', -1)
+    line = {
+        'event': 'slow_query',
+        'fingerprint_id': key,
+        'fingerprint': normalized,
+        'sql': sql[:2000],
+        'duration_ms': round(duration_ms, 1),
+        'rows': rowcount if rowcount is not None and rowcount >= 0 else None,
+        'view': _view_name.get(),
+        'database': connection.alias,
+    }
+    if should_explain(sql, many, key):
+        line['plan'] = explain(connection, sql, params)
+    logger.warning(json.dumps(line, default=str))
+
+
+def view_label(request, view_func):
+    match = request.resolver_match
+    return match.view_name if match and match.view_name else view_func.__name__
+
+
+class SlowQueryMiddleware:
+    """
+    Register the slow query logger when SLOW_QUERY_LOG is on, and note which
+    view each request is served by so slow statements can name it.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+            # Django would run the sync hook in a thread on every request
+            self.process_view = self.aprocess_view
+        if getattr(settings, 'SLOW_QUERY_LOG', False):
+            add_query_observer(log_slow_query)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        token = _view_name.set(None)
+        try:
+            return self.get_response(request)
+        finally:
+            _view_name.reset(token)
+
+    async def __acall__(self, request):
+        token = _view_name.set(None)
+        try:
+            return await self.get_response(request)
+        finally:
+            _view_name.reset(token)
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        _view_name.set(view_label(request, view_func))
+        return None
+
+    async def aprocess_view(self, request, view_func, view_args, view_kwargs):
+        _view_name.set(view_label(request, view_func))
+        return None
@@ -0,0 +1,81 @@
+from rest_framework.permissions import SAFE_METHODS
+
+
+FIELDS_PARAM = 'fields'
+OMIT_PARAM = 'omit'
+
+
+def _split_names(value):
+    return {name.strip() for name in value.split(',') if name.strip()}
+
+
+def get_sparse_fieldset(request):
+    """
+    Return ``(fields, omit)`` from ?fields=a,b and ?omit=c on a read request.
+
+    ``fields`` is None when every field is wanted. Writes always get the full
+    representation back.
+    """
+    if request is None or request.method not in SAFE_METHODS:
+        return None, set()
+
+    params = getattr(request, 'query_params', request.GET)
+    fields = params.get(FIELDS_PARAM)
+    return (_split_names(fields) if fields else None), _split_names(params.get(OMIT_PARAM, ''))
+
+
+def is_field_requested(request, name):
+    fields, omit = get_sparse_fieldset(request)
+    return name not in omit and (fields is None or name in fields)
+
+
+class SparseFieldsetSerializerMixin:
+    """Drops the fields not selected by ?fields= / ?omit= from the serializer"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        fields, omit = get_sparse_fieldset(self.context.get('request'))
+        if fields is None and not omit:
+            return
+
+        for name in list(self.fields):
+            if name in omit or (fields is not None and name not in fields):
+                self.fields.pop(name)
+
+
+class SparseFieldsetViewMixin:
+    """
+    Lets get_queryset skip joins and annotations for fields that are not requested,
+    via ``field_requested()``. When ?fields= only names plain model columns, the
+    other columns are deferred as well.
+    """
+
+    def field_requested(self, *names):
+        """True if any of ``names`` will be serialized for this request"""
+        return any(is_field_requested(self.request, name) for name in names)
+
+    def filter_queryset(self, queryset):
+        return self.only_requested_columns(super().filter_queryset(queryset))
+
+    def only_requested_columns(self, queryset):
+        fields, omit = get_sparse_fieldset(self.request)
+        # Deferring columns of a select_related join is an error, and computed
+        # fields may read any column, so only plain column lists are trimmed
+        if fields is None or queryset.query.select_related:
+            return queryset
+
+        model_fields = {field.name for field in queryset.model._meta.concrete_fields}
+        serializer_fields = self.get_serializer_class()().fields
+        columns = [queryset.model._meta.pk.name]
+        for name in fields & set(serializer_fields):
+            source = serializer_fields[name].source
+            if source not in model_fields:
+                return queryset
+            columns.append(source)
+
+        # Cursor pagination reads the ordering fields of the page's last row
+        for name in getattr(self, 'ordering', None) or ():
+            if name.lstrip('-') in model_fields:
+                columns.append(name.lstrip('-'))
+
+        return queryset.only(*columns)
@@ -1,5 +1,6 @@
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
+from core.async_views import serving_view
 from core.views import (
     LocationViewSet, MachineViewSet, ProductViewSet, 
     MachineItemPriceViewSet, SupplierViewSet, WholesalePurchaseViewSet,
@@ -7,7 +8,8 @@ from core.views import (
     RegisterView, UserProfileView, ProductCostViewSet,
     StockLevelView, DemandAnalysisView, RevenueProfitView, DashboardView,
     CurrentStockReportView, RestockSummaryView, StockCoverageEstimateView,
-    AdvancedDemandAnalyticsView, AdvancedDemandAnalyticsCSVView, BulkVisitSaveView
+    AdvancedDemandAnalyticsView, AdvancedDemandAnalyticsCSVView, BulkVisitSaveView,
+    BulkPurchaseImportView, BatchView, ChangeStreamView, ProfileReportView
 )
 
 # Set up the router for ViewSets
@@ -31,23 +33,27 @@ urlpatterns = [
     # Bulk operations for performance optimization (MUST be before router URLs)
     path('visits/bulk-save/', BulkVisitSaveView.as_view(), name='bulk-visit-save'),
     path('visits/<int:visit_id>/bulk-update/', BulkVisitSaveView.as_view(), name='bulk-visit-update'),
+    path('purchases/bulk-import/', BulkPurchaseImportView.as_view(), name='bulk-purchase-import'),
+    path('batch/', serving_view(BatchView, pool='batch'), name='batch'),
+    path('changes/stream/', ChangeStreamView.as_view(), name='change-stream'),
+    path('profiles/<str:profile_id>/', ProfileReportView.as_view(), name='profile-report'),
     
     # Analytics endpoints
-    path('analytics/stock-levels/', StockLevelView.as_view(), name='stock-levels'),
-    path('analytics/demand/', DemandAnalysisView.as_view(), name='demand-analysis'),
+    path('analytics/stock-levels/', serving_view(StockLevelView), name='stock-levels'),
+    path('analytics/demand/', serving_view(DemandAnalysisView), name='demand-analysis'),
     # Support both trailing and non-trailing slash to avoid redirect issues (XHR)
-    path('analytics/advanced-demand/', AdvancedDemandAnalyticsView.as_view(), name='advanced-demand-analytics'),
-    path('analytics/advanced-demand', AdvancedDemandAnalyticsView.as_view(), name='advanced-demand-analytics-noslash'),
+    path('analytics/advanced-demand/', serving_view(AdvancedDemandAnalyticsView), name='advanced-demand-analytics'),
+    path('analytics/advanced-demand', serving_view(AdvancedDemandAnalyticsView), name='advanced-demand-analytics-noslash'),
     # Dedicated CSV export endpoints to avoid ?format=csv negotiation quirks
-    path('analytics/advanced-demand/export/', AdvancedDemandAnalyticsCSVView.as_view(), name='advanced-demand-analytics-export'),
-    path('analytics/advanced-demand/export', AdvancedDemandAnalyticsCSVView.as_view(), name='advanced-demand-analytics-export-noslash'),
-    path('analytics/revenue-profit/', RevenueProfitView.as_view(), name='revenue-profit'),
-    path('dashboard/', DashboardView.as_view(), name='dashboard'),
+    path('analytics/advanced-demand/export/', serving_view(AdvancedDemandAnalyticsCSVView), name='advanced-demand-analytics-export'),
+    path('analytics/advanced-demand/export', serving_view(AdvancedDemandAnalyticsCSVView), name='advanced-demand-analytics-export-noslash'),
+    path('analytics/revenue-profit/', serving_view(RevenueProfitView), name='revenue-profit'),
+    path('dashboard/', serving_view(DashboardView), name='dashboard'),
     
     # Inventory reporting endpoints
-    path('inventory/current-stock/', CurrentStockReportView.as_view(), name='current-stock-report'),
-    path('inventory/restock-summary/', RestockSummaryView.as_view(), name='restock-summary'),
-    path('inventory/stock-coverage/', StockCoverageEstimateView.as_view(), name='stock-coverage-estimate'),
+    path('inventory/current-stock/', serving_view(CurrentStockReportView), name='current-stock-report'),
+    path('inventory/restock-summary/', serving_view(RestockSummaryView), name='restock-summary'),
+    path('inventory/stock-coverage/', serving_view(StockCoverageEstimateView), name='stock-coverage-estimate'),
     
     # Include router URLs (MUST be last to avoid conflicts)
     path('', include(router.urls)),
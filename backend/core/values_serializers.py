@@ -0,0 +1,139 @@
+from django.core.exceptions import ImproperlyConfigured
+from django.utils import timezone
+from rest_framework import serializers
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+
+
+# Fields whose DRF representation of a values() cell is the cell itself
+IDENTITY_FIELDS = (
+    serializers.IntegerField,
+    serializers.CharField,
+    serializers.ChoiceField,
+    serializers.BooleanField,
+    serializers.PrimaryKeyRelatedField,
+)
+
+
+def _datetime_mapper(field):
+    """DateTimeField.to_representation for the default ISO 8601 format, without the per-call lookups"""
+    output_format = getattr(field, 'format', api_settings.DATETIME_FORMAT)
+    if output_format is None or output_format.lower() != 'iso-8601' or hasattr(field, 'timezone'):
+        return field.to_representation
+
+    field_timezone = field.default_timezone()
+
+    def to_representation(value):
+        if field_timezone is not None and timezone.is_aware(value):
+            value = value.astimezone(field_timezone)
+        value = value.isoformat()
+        if value.endswith('+00:00'):
+            value = value[:-6] + 'Z'
+        return value
+
+    return to_representation
+
+
+class ValuesSerializer:
+    """
+    Read-only rendering of a ModelSerializer's output straight from QuerySet.values().
+
+    ``serializer_class`` is the ModelSerializer whose JSON is reproduced. Plain model
+    fields are mapped automatically; SerializerMethodFields, dotted sources and
+    anything added in to_representation are described in ``computed_fields`` as
+    ``{name: (lookups, function(row))}``. ``appended_fields`` lists computed fields
+    the serializer adds after its declared ones. Subclasses may add values()
+    expressions in ``get_expressions()``.
+
+    The mappers are built once per request, so rendering a row is one dict
+    comprehension instead of DRF's per-field attribute lookups.
+    """
+    serializer_class = None
+    computed_fields = {}
+    appended_fields = ()
+
+    def __init__(self, context=None):
+        self.context = context or {}
+        # The serializer's field set already honours ?fields= / ?omit=
+        serializer = self.serializer_class(context=self.context)
+        self.lookups, self.mappers = self.build_mappers(serializer.fields)
+
+    def build_mappers(self, fields):
+        lookups = []
+        mappers = []
+
+        names = [name for name, field in fields.items() if not field.write_only]
+        names += [name for name in self.appended_fields if name in fields]
+
+        for name in names:
+            if name in self.computed_fields:
+                field_lookups, function = self.computed_fields[name]
+                lookups.extend(field_lookups)
+                mappers.append((name, function))
+                continue
+
+            field = fields[name]
+            if isinstance(field, serializers.SerializerMethodField) or '.' in field.source or field.source == '*':
+                raise ImproperlyConfigured(
+                    f"{self.__class__.__name__} must describe the computed field '{name}' in computed_fields."
+                )
+
+            lookups.append(field.source)
+            mappers.append((name, self.plain_mapper(field.source, field)))
+
+        return list(dict.fromkeys(lookups)), mappers
+
+    def plain_mapper(self, lookup, field):
+        if isinstance(field, IDENTITY_FIELDS):
+            return lambda row: row[lookup]
+
+        if isinstance(field, serializers.DateTimeField):
+            convert = _datetime_mapper(field)
+        else:
+            convert = field.to_representation
+
+        def mapper(row):
+            value = row[lookup]
+            return None if value is None else convert(value)
+
+        return mapper
+
+    def get_expressions(self):
+        """Extra values() expressions, e.g. subqueries for computed fields"""
+        return {}
+
+    def values(self, queryset, extra_lookups=()):
+        lookups = list(dict.fromkeys([*self.lookups, *extra_lookups]))
+        # values() returns dicts, so prefetches have nothing to attach to
+        return queryset.prefetch_related(None).values(*lookups, **self.get_expressions())
+
+    def render(self, rows):
+        mappers = self.mappers
+        return [{name: mapper(row) for name, mapper in mappers} for row in rows]
+
+
+class ValuesListViewMixin:
+    """
+    Serve list() through ``values_serializer_class`` when one is set on the viewset.
+    Set it to None to fall back to the regular ModelSerializer path.
+    """
+    values_serializer_class = None
+
+    def get_values_serializer(self):
+        return self.values_serializer_class(context=self.get_serializer_context())
+
+    def render_values(self, queryset, paginate=True):
+        values_serializer = self.get_values_serializer()
+        # Cursor pagination reads the ordering fields from each row
+        ordering = [name.lstrip('-') for name in getattr(self, 'ordering', None) or ()]
+        rows = values_serializer.values(queryset, extra_lookups=ordering)
+
+        page = self.paginate_queryset(rows) if paginate else None
+        if page is not None:
+            return self.get_paginated_response(values_serializer.render(page))
+        return Response(values_serializer.render(rows))
+
+    def list(self, request, *args, **kwargs):
+        if self.values_serializer_class is None:
+            return super().list(request, *args, **kwargs)
+        return self.render_values(self.filter_queryset(self.get_queryset()))
@@ -8,6 +8,10 @@ from .visit_views import VisitViewSet
 from .visit_machine_restock_views import VisitMachineRestockViewSet
 from .restock_entry_views import RestockEntryViewSet
 from .bulk_visit_views import BulkVisitSaveView
+from .bulk_purchase_views import BulkPurchaseImportView
+from .batch_views import BatchView
+from .change_stream_views import ChangeStreamView
+from .profile_views import ProfileReportView
 from .user_views import RegisterView, UserProfileView
 from .product_cost_views import ProductCostViewSet
 from .analytics_views import (
@@ -9,13 +9,16 @@ from django.db.models.functions import Coalesce
 from datetime import datetime, timedelta
 from django.utils import timezone
 from django.core.cache import cache
-from django.db import connection
+from core.db_routing import ReplicaReadViewMixin, read_connection
+from core.metrics import record_analytics_cache
+from core.profiling import ProfilingViewMixin
+from core.server_timing import record_cache, timed
 import hashlib
 import json
 
 
-class OptimizedAnalyticsViewMixin:
-    """Mixin class providing common optimization utilities for analytics views"""
+class OptimizedAnalyticsViewMixin(ProfilingViewMixin, ReplicaReadViewMixin):
+    """Mixin class providing common optimization utilities for analytics views; reads use the replica; staff can profile them"""
     
     def get_cache_key(self, prefix, params):
         """Generate a cache key based on view prefix and parameters"""
@@ -23,15 +26,58 @@ class OptimizedAnalyticsViewMixin:
         hash_str = hashlib.md5(param_str.encode()).hexdigest()
         return f"analytics_{prefix}_{hash_str}"
     
+    def get_shared(self, key, compute_func):
+        """
+        Compute a value once per batch/ call. Sub-requests of the same batch share
+        request.batch_shared; outside a batch this just calls compute_func.
+        """
+        shared = getattr(getattr(self, 'request', None), 'batch_shared', None)
+        if shared is None:
+            return compute_func()
+        return shared.get_or_compute(key, compute_func)
+    
     def get_cached_or_compute(self, cache_key, compute_func, timeout=7200):  # 2 hours
         """Get data from cache or compute and cache it"""
-        cached_data = cache.get(cache_key)
-        if cached_data is not None:
-            return cached_data
+        def compute_and_cache():
+            # A profiled request measures the computation, not a cache hit; it still refreshes the cache
+            if self._request_profile is None:
+                cached_data = cache.get(cache_key)
+                record_cache(hit=cached_data is not None)
+                record_analytics_cache(cache_key, hit=cached_data is not None)
+                if cached_data is not None:
+                    return cached_data
+            
+            with timed('compute'):
+                data = compute_func()
+            cache.set(cache_key, data, timeout)
+            return data
+        
+        return self.get_shared(cache_key, compute_and_cache)
+    
+    def get_cost_history(self, product_ids, max_date):
+        """
+        ProductCost rows of ``product_ids`` up to ``max_date`` as
+        {product_id: [(date, unit_cost), ...]} in date order
+        """
+        def load():
+            history = {}
+            for product_id, date, unit_cost in ProductCost.objects.filter(
+                product_id__in=product_ids, date__lte=max_date
+            ).order_by('product_id', 'date').values_list('product_id', 'date', 'unit_cost'):
+                history.setdefault(product_id, []).append((date, float(unit_cost)))
+            return history
+        
+        return self.get_shared(('cost_history', frozenset(product_ids), max_date), load)
+    
+    def get_average_costs(self, product_ids):
+        """Product.average_cost for ``product_ids``, used when a product has no cost history"""
+        def load():
+            return {
+                product.id: float(product.average_cost) if product.average_cost else 0
+                for product in Product.objects.filter(id__in=product_ids)
+            }
         
-        data = compute_func()
-        cache.set(cache_key, data, timeout)
-        return data
+        return self.get_shared(('average_costs', frozenset(product_ids)), load)
     
     def get_historical_costs_bulk(self, product_dates):
         """
@@ -48,19 +94,15 @@ class OptimizedAnalyticsViewMixin:
                 product_date_map[product_id] = []
             product_date_map[product_id].append(date)
         
+        # One history load for all products; views of a batch/ call asking for the same scope share it
+        cost_history = self.get_cost_history(
+            set(product_date_map), max(date for dates in product_date_map.values() for date in dates)
+        )
         cost_map = {}
+        missing = set()
         
-        # Fetch costs for each product
         for product_id, dates in product_date_map.items():
-            # Get all cost records for this product up to the latest date
-            max_date = max(dates)
-            cost_records = ProductCost.objects.filter(
-                product_id=product_id,
-                date__lte=max_date
-            ).order_by('product_id', 'date')
-            
-            # Create a sorted list of costs for this product
-            product_costs = [(record.date, float(record.unit_cost)) for record in cost_records]
+            product_costs = cost_history.get(product_id, [])
             
             # For each date, find the most recent cost
             for date in dates:
@@ -70,16 +112,17 @@ class OptimizedAnalyticsViewMixin:
                         cost = unit_cost
                         break
                 
-                # Fallback to product average cost if no historical cost found
                 if cost == 0:
-                    try:
-                        product = Product.objects.get(id=product_id)
-                        cost = float(product.average_cost) if product.average_cost else 0
-                    except Product.DoesNotExist:
-                        cost = 0
-                
+                    missing.add(product_id)
                 cost_map[(product_id, date)] = cost
         
+        # Fallback to product average cost if no historical cost found
+        if missing:
+            average_costs = self.get_average_costs(missing)
+            for (product_id, date), cost in cost_map.items():
+                if cost == 0:
+                    cost_map[(product_id, date)] = average_costs.get(product_id, 0)
+        
         return cost_map
 
 
@@ -107,13 +150,13 @@ class StockLevelView(OptimizedAnalyticsViewMixin, APIView):
                 'product', 
                 'visit_machine_restock__machine__location',
                 'visit_machine_restock__visit'
-            ).order_by('visit_machine_restock__visit__visit_date')
+            ).order_by('visit_date')
             
             # Filter by product or machine if provided
             if product_id:
                 restocks = restocks.filter(product_id=product_id)
             if machine_id:
-                restocks = restocks.filter(visit_machine_restock__machine_id=machine_id)
+                restocks = restocks.filter(machine_id=machine_id)
                 
             # Prepare time series data
             stock_data = []
@@ -177,18 +220,13 @@ class DemandAnalysisView(OptimizedAnalyticsViewMixin, APIView):
                 'visit_machine_restock__machine__location',
                 'visit_machine_restock__visit'
             ).filter(
-                visit_machine_restock__visit__visit_date__gte=start_date,
-                visit_machine_restock__visit__visit_date__lte=end_date
-            ).order_by(
-                'visit_machine_restock__machine__location',
-                'visit_machine_restock__machine',
-                'product',
-                'visit_machine_restock__visit__visit_date'
-            )
+                visit_date__gte=start_date,
+                visit_date__lte=end_date
+            ).order_by('location', 'machine', 'product', 'visit_date')
             
             # Filter by location if provided
             if location_id:
-                restocks = restocks.filter(visit_machine_restock__machine__location_id=location_id)
+                restocks = restocks.filter(location_id=location_id)
             
             # Prefetch machine item prices to avoid N+1 queries
             machine_product_combinations = set()
@@ -384,12 +422,12 @@ class RevenueProfitView(OptimizedAnalyticsViewMixin, APIView):
                 'visit_machine_restock__machine',
                 'visit_machine_restock__visit'
             ).filter(
-                visit_machine_restock__visit__visit_date__gte=start_date,
-                visit_machine_restock__visit__visit_date__lte=end_date
+                visit_date__gte=start_date,
+                visit_date__lte=end_date
             )
             
             if location_id:
-                restocks = restocks.filter(visit_machine_restock__machine__location_id=location_id)
+                restocks = restocks.filter(location_id=location_id)
             
             # Bulk fetch machine item prices
             machine_product_combinations = set()
@@ -484,12 +522,12 @@ class RevenueProfitView(OptimizedAnalyticsViewMixin, APIView):
                 'visit_machine_restock__machine',
                 'visit_machine_restock__visit'
             ).filter(
-                visit_machine_restock__visit__visit_date__gte=previous_start_date,
-                visit_machine_restock__visit__visit_date__lte=previous_end_date
+                visit_date__gte=previous_start_date,
+                visit_date__lte=previous_end_date
             )
             
             if location_id:
-                previous_restocks = previous_restocks.filter(visit_machine_restock__machine__location_id=location_id)
+                previous_restocks = previous_restocks.filter(location_id=location_id)
             
             # Calculate previous period totals (simplified for performance)
             previous_revenue = 0
@@ -621,18 +659,18 @@ class DashboardView(OptimizedAnalyticsViewMixin, APIView):
                 'visit_machine_restock__machine',
                 'visit_machine_restock__visit'
             ).filter(
-                visit_machine_restock__visit__visit_date__gte=start_date,
-                visit_machine_restock__visit__visit_date__lte=end_date
+                visit_date__gte=start_date,
+                visit_date__lte=end_date
             )
             
             if location_id:
                 restocks_query = restocks_query.filter(
-                    visit_machine_restock__machine__location_id=location_id
+                    location_id=location_id
                 )
                 
             if machine_type:
                 restocks_query = restocks_query.filter(
-                    visit_machine_restock__machine__machine_type=machine_type
+                    machine__machine_type=machine_type
                 )
             
             recent_restocks = restocks_query.count()
@@ -835,15 +873,15 @@ class RestockSummaryView(OptimizedAnalyticsViewMixin, APIView):
                 'visit_machine_restock__machine__location',
                 'visit_machine_restock__visit__user'
             ).filter(
-                visit_machine_restock__visit__visit_date__gte=start_date,
-                visit_machine_restock__visit__visit_date__lte=end_date
+                visit_date__gte=start_date,
+                visit_date__lte=end_date
             )
             
             # Apply filters
             if product_id:
                 restocks = restocks.filter(product_id=product_id)
             if location_id:
-                restocks = restocks.filter(visit_machine_restock__machine__location_id=location_id)
+                restocks = restocks.filter(location_id=location_id)
             
             # Process data
             product_restocks = {}
@@ -958,18 +996,14 @@ class StockCoverageEstimateView(OptimizedAnalyticsViewMixin, APIView):
                 'visit_machine_restock__machine',
                 'visit_machine_restock__visit'
             ).filter(
-                visit_machine_restock__visit__visit_date__gte=start_date,
-                visit_machine_restock__visit__visit_date__lte=end_date
-            ).order_by(
-                'visit_machine_restock__machine',
-                'product',
-                'visit_machine_restock__visit__visit_date'
-            )
+                visit_date__gte=start_date,
+                visit_date__lte=end_date
+            ).order_by('machine', 'product', 'visit_date')
             
             if product_id:
                 restocks = restocks.filter(product_id=product_id)
             if location_id:
-                restocks = restocks.filter(visit_machine_restock__machine__location_id=location_id)
+                restocks = restocks.filter(location_id=location_id)
             
             # Calculate consumption rates
             machine_product_consumption = {}
@@ -1246,24 +1280,25 @@ class AdvancedDemandAnalyticsView(OptimizedAnalyticsViewMixin, APIView):
                 LIMIT 1
             ) h ON TRUE
             
-            -- Previous visit subquery
+            -- Previous visit subquery: a backward scan of restock_machine_prod_date_idx
             LEFT JOIN LATERAL (
                 SELECT
-                    c2.visit_date AS c_prev_visit_date,
+                    a2.visit_date AS c_prev_visit_date,
                     a2.stock_before AS prev_stock_before,
                     a2.restocked AS prev_restocked,
                     a2.discarded AS prev_discarded
-                FROM core_visitmachinerestock b2
+                FROM core_restockentry a2
+                JOIN core_visitmachinerestock b2 ON a2.visit_machine_restock_id = b2.id
                 JOIN core_visit c2 ON b2.visit_id = c2.id
-                JOIN core_restockentry a2 ON (a2.visit_machine_restock_id = b2.id AND a2.product_id = a.product_id)
-                WHERE b2.machine_id = b.machine_id
+                WHERE a2.machine_id = a.machine_id
+                AND a2.product_id = a.product_id
                 AND c2.location_id = c.location_id
-                AND c2.visit_date < c.visit_date
-                ORDER BY c2.visit_date DESC
+                AND a2.visit_date < a.visit_date
+                ORDER BY a2.visit_date DESC
                 LIMIT 1
             ) prev ON TRUE
             
-            WHERE c.visit_date >= %s AND c.visit_date <= %s
+            WHERE a.visit_date >= %s AND a.visit_date <= %s
             """
             
             # Add filters
@@ -1274,17 +1309,17 @@ class AdvancedDemandAnalyticsView(OptimizedAnalyticsViewMixin, APIView):
                 params.append(location_id)
                 
             if machine_id:
-                base_query += " AND b.machine_id = %s"
+                base_query += " AND a.machine_id = %s"
                 params.append(machine_id)
                 
             if product_id:
                 base_query += " AND a.product_id = %s"
                 params.append(product_id)
                 
-            base_query += " ORDER BY c.visit_date DESC"
+            base_query += " ORDER BY a.visit_date DESC"
             
             # Execute the query
-            with connection.cursor() as cursor:
+            with read_connection().cursor() as cursor:
                 cursor.execute(base_query, params)
                 columns = [col[0] for col in cursor.description]
                 raw_results = [dict(zip(columns, row)) for row in cursor.fetchall()]
@@ -1866,24 +1901,25 @@ class AdvancedDemandAnalyticsCSVView(AdvancedDemandAnalyticsView):
                 LIMIT 1
             ) h ON TRUE
             
-            -- Previous visit subquery
+            -- Previous visit subquery: a backward scan of restock_machine_prod_date_idx
             LEFT JOIN LATERAL (
                 SELECT
-                    c2.visit_date AS c_prev_visit_date,
+                    a2.visit_date AS c_prev_visit_date,
                     a2.stock_before AS prev_stock_before,
                     a2.restocked AS prev_restocked,
                     a2.discarded AS prev_discarded
-                FROM core_visitmachinerestock b2
+                FROM core_restockentry a2
+                JOIN core_visitmachinerestock b2 ON a2.visit_machine_restock_id = b2.id
                 JOIN core_visit c2 ON b2.visit_id = c2.id
-                JOIN core_restockentry a2 ON (a2.visit_machine_restock_id = b2.id AND a2.product_id = a.product_id)
-                WHERE b2.machine_id = b.machine_id
+                WHERE a2.machine_id = a.machine_id
+                AND a2.product_id = a.product_id
                 AND c2.location_id = c.location_id
-                AND c2.visit_date < c.visit_date
-                ORDER BY c2.visit_date DESC
+                AND a2.visit_date < a.visit_date
+                ORDER BY a2.visit_date DESC
                 LIMIT 1
             ) prev ON TRUE
             
-            WHERE c.visit_date >= %s AND c.visit_date <= %s
+            WHERE a.visit_date >= %s AND a.visit_date <= %s
             """
             
             # Add filters
@@ -1894,17 +1930,17 @@ class AdvancedDemandAnalyticsCSVView(AdvancedDemandAnalyticsView):
                 params.append(location_id)
                 
             if machine_id:
-                base_query += " AND b.machine_id = %s"
+                base_query += " AND a.machine_id = %s"
                 params.append(machine_id)
                 
             if product_id:
                 base_query += " AND a.product_id = %s"
                 params.append(product_id)
                 
-            base_query += " ORDER BY c.visit_date DESC"
+            base_query += " ORDER BY a.visit_date DESC"
             
             # Execute the query
-            with connection.cursor() as cursor:
+            with read_connection().cursor() as cursor:
                 cursor.execute(base_query, params)
                 columns = [col[0] for col in cursor.description]
                 raw_results = [dict(zip(columns, row)) for row in cursor.fetchall()]
@@ -0,0 +1,163 @@
+from rest_framework.views import APIView
+from rest_framework.response import Response
+from rest_framework import permissions, status
+from django.conf import settings
+from django.db import connection, connections
+from django.http import QueryDict
+from django.urls import resolve, Resolver404
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit
+import contextvars
+import copy
+import threading
+
+
+class BatchSharedState:
+    """
+    Values computed once per batch/ call and shared by its sub-requests.
+
+    Analytics views reach it through request.batch_shared (see
+    OptimizedAnalyticsViewMixin.get_shared). A per-key lock makes concurrent
+    sub-requests that need the same value wait for the first one to load it.
+    """
+
+    def __init__(self):
+        self._values = {}
+        self._locks = {}
+        self._lock = threading.Lock()
+
+    def get_or_compute(self, key, compute):
+        with self._lock:
+            if key in self._values:
+                return self._values[key]
+            key_lock = self._locks.setdefault(key, threading.Lock())
+
+        with key_lock:
+            if key not in self._values:
+                self._values[key] = compute()
+            return self._values[key]
+
+
+class BatchView(APIView):
+    """
+    Run several GET requests against this API in one round trip.
+
+    Payload: {"requests": [{"id": "stock", "url": "/inventory/current-stock/?location=1"}, ...]}
+    URLs are relative to the API root. The sub-requests reuse this request's
+    authenticated user and share one BatchSharedState. They run concurrently
+    on a small thread pool unless the database connection is inside a
+    transaction, because other threads could not see uncommitted rows.
+
+    Returns {"responses": {"stock": {"status": 200, "body": {...}}, ...}}.
+    """
+    permission_classes = [permissions.IsAuthenticated]
+    urlconf = 'core.urls'
+
+    def post(self, request):
+        sub_requests = request.data.get('requests') if isinstance(request.data, dict) else None
+        if not isinstance(sub_requests, list) or not sub_requests:
+            return Response({'error': 'Provide a non-empty "requests" list.'}, status=status.HTTP_400_BAD_REQUEST)
+
+        max_requests = getattr(settings, 'BATCH_MAX_REQUESTS', 20)
+        if len(sub_requests) > max_requests:
+            return Response(
+                {'error': f'A batch may contain at most {max_requests} requests.'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        errors = {}
+        ids = set()
+        for index, sub_request in enumerate(sub_requests):
+            if not isinstance(sub_request, dict) or not isinstance(sub_request.get('url'), str):
+                errors[index] = 'Each request needs a "url".'
+                continue
+            if sub_request.get('method', 'GET').upper() != 'GET':
+                errors[index] = 'Only GET requests can be batched.'
+            request_id = str(sub_request.get('id', index))
+            if request_id in ids:
+                errors[index] = f'Duplicate id "{request_id}".'
+            ids.add(request_id)
+        if errors:
+            return Response({'errors': errors}, status=status.HTTP_400_BAD_REQUEST)
+
+        shared = BatchSharedState()
+        jobs = [
+            (str(sub_request.get('id', index)), sub_request['url'])
+            for index, sub_request in enumerate(sub_requests)
+        ]
+
+        max_workers = min(getattr(settings, 'BATCH_MAX_WORKERS', 4), len(jobs))
+        if max_workers > 1 and not connection.in_atomic_block:
+            with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='batch') as executor:
+                # Each sub-request runs in a copy of this context, so its queries count
+                # towards this request's Server-Timing
+                futures = {
+                    request_id: executor.submit(contextvars.copy_context().run, self.run_in_thread, request, url, shared)
+                    for request_id, url in jobs
+                }
+                responses = {request_id: future.result() for request_id, future in futures.items()}
+        else:
+            responses = {request_id: self.run_sub_request(request, url, shared) for request_id, url in jobs}
+
+        return Response({'responses': responses})
+
+    def run_in_thread(self, request, url, shared):
+        try:
+            return self.run_sub_request(request, url, shared)
+        finally:
+            # Worker threads open their own connections; don't leave them behind
+            connections.close_all()
+
+    def get_api_root(self, request):
+        """The URL prefix this view is mounted under, e.g. /api/"""
+        return request.path[:request.path.rstrip('/').rfind('/') + 1]
+
+    def run_sub_request(self, request, url, shared):
+        split = urlsplit(url)
+        relative_path = '/' + split.path.lstrip('/')
+        path = self.get_api_root(request) + relative_path.lstrip('/')
+
+        # Only this app's API views can be batched, not the debug or SPA routes
+        try:
+            match = resolve(relative_path, urlconf=self.urlconf)
+        except Resolver404:
+            match = None
+        view_class = getattr(match.func, 'cls', None) if match else None
+        if view_class is None or not issubclass(view_class, APIView):
+            return {'status': status.HTTP_404_NOT_FOUND, 'body': {'detail': 'Not found.'}}
+        if issubclass(view_class, BatchView):
+            return {'status': status.HTTP_400_BAD_REQUEST, 'body': {'detail': 'Batches cannot be nested.'}}
+
+        sub_request = copy.copy(request._request)
+        sub_request.method = 'GET'
+        sub_request.path = sub_request.path_info = path
+        sub_request.META = {
+            key: value for key, value in request._request.META.items()
+            # The batch's own body and validators don't apply to its sub-requests
+            if key not in ('CONTENT_TYPE', 'CONTENT_LENGTH', 'HTTP_IF_NONE_MATCH', 'HTTP_IF_MODIFIED_SINCE')
+        }
+        sub_request.META.update({
+            'REQUEST_METHOD': 'GET',
+            'PATH_INFO': path,
+            'QUERY_STRING': split.query,
+        })
+        sub_request.GET = QueryDict(split.query)
+        sub_request.resolver_match = match
+        # DRF skips authentication for requests carrying a forced user
+        sub_request._force_auth_user = request.user
+        sub_request._force_auth_token = request.auth
+        sub_request.batch_shared = shared
+
+        # Under ASGI the analytics routes are async wrappers; this already runs
+        # on a worker thread, so call the plain view underneath
+        view = getattr(match.func, 'sync_view', match.func)
+        response = view(sub_request, *match.args, **match.kwargs)
+        if response.streaming:
+            return {'status': status.HTTP_400_BAD_REQUEST, 'body': {'detail': 'Streaming endpoints cannot be batched.'}}
+
+        if hasattr(response, 'data'):
+            body = response.data
+        else:
+            # e.g. the CSV exports, which build their HttpResponse directly
+            body = response.content.decode(response.charset or 'utf-8')
+        return {'status': response.status_code, 'body': body}
@@ -0,0 +1,72 @@
+from rest_framework.views import APIView
+from rest_framework.response import Response
+from rest_framework import status
+from rest_framework.parsers import JSONParser, MultiPartParser, FormParser
+from django.db import transaction
+from core.serializers import WholesalePurchaseImportSerializer
+from core.change_events import publish_change
+from core.metrics import record_bulk_rows
+import json
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class BulkPurchaseImportView(APIView):
+    """
+    Import many wholesale purchases (e.g. a full Sam's Club receipt) in one
+    atomic request without the per-row post_save inventory signal.
+
+    Accepts either a JSON payload:
+    {
+        "purchases": [
+            {
+                "product": 1,
+                "supplier": 2,
+                "quantity": 24,
+                "total_cost": "12.00",      # or "cost_per_unit": "0.50"
+                "purchased_at": "2025-01-15T10:30:00Z",
+                "notes": ""
+            }
+        ]
+    }
+    or a multipart upload with a CSV/JSON ``file`` using the same column names.
+
+    Pass ``?dry_run=true`` to validate without saving.
+    """
+    parser_classes = [JSONParser, MultiPartParser, FormParser]
+
+    def post(self, request):
+        try:
+            rows = self._extract_rows(request)
+        except (ValueError, UnicodeDecodeError) as e:
+            return Response({'error': f'Could not parse upload: {e}'}, status=status.HTTP_400_BAD_REQUEST)
+
+        serializer = WholesalePurchaseImportSerializer(data={'purchases': rows})
+        if not serializer.is_valid():
+            return Response({'errors': serializer.row_errors}, status=status.HTTP_400_BAD_REQUEST)
+
+        dry_run = request.query_params.get('dry_run', '').lower() in ['true', '1']
+        if dry_run:
+            return Response({'valid': True, 'rows': len(rows)}, status=status.HTTP_200_OK)
+
+        serializer.save()
+        created = serializer.data['created']
+        transaction.on_commit(lambda: record_bulk_rows('purchases', created))
+        publish_change('purchase', products=[row['product'] for row in serializer.validated_data['purchases']])
+        logger.info(f"Bulk purchase import created {serializer.data['created']} purchases")
+        return Response(serializer.data, status=status.HTTP_201_CREATED)
+
+    def _extract_rows(self, request):
+        """Return the list of row dicts from a JSON body or an uploaded file"""
+        upload = request.FILES.get('file')
+        if upload is not None:
+            content = upload.read()
+            if upload.name.lower().endswith('.json'):
+                data = json.loads(content)
+                return data.get('purchases', []) if isinstance(data, dict) else data
+            return WholesalePurchaseImportSerializer.rows_from_csv(content)
+
+        if isinstance(request.data, list):
+            return request.data
+        return request.data.get('purchases', [])
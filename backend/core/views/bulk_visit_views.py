@@ -3,14 +3,18 @@ from rest_framework.response import Response
 from rest_framework import status
 from django.db import transaction, models
 from django.core.exceptions import ValidationError
+from django.utils import timezone
 from core.models import Visit, VisitMachineRestock, RestockEntry, MachineItemPrice, Product
 from core.serializers import VisitSerializer
+from core.change_events import publish_change
+from core.metrics import record_bulk_rows
+from core.profiling import ProfilingViewMixin
 import logging
 
 logger = logging.getLogger(__name__)
 
 
-class BulkVisitSaveView(APIView):
+class BulkVisitSaveView(ProfilingViewMixin, APIView):
     """
     Optimized bulk endpoint for saving complete visit data including all machine restocks
     and restock entries in a single atomic transaction.
@@ -71,6 +75,7 @@ class BulkVisitSaveView(APIView):
                 
                 # Process machine restocks in bulk
                 self._process_machine_restocks_bulk(visit, machine_restocks_data)
+                self._publish_visit_change(visit, machine_restocks_data)
                 
                 # Return the created visit
                 response_serializer = VisitSerializer(visit)
@@ -119,10 +124,11 @@ class BulkVisitSaveView(APIView):
                 visit = visit_serializer.save()
                 
                 # Clear existing machine restocks and entries to avoid conflicts
-                self._clear_existing_restocks(visit)
+                previous_scope = self._clear_existing_restocks(visit)
                 
                 # Process new machine restocks in bulk
                 self._process_machine_restocks_bulk(visit, machine_restocks_data)
+                self._publish_visit_change(visit, machine_restocks_data, *previous_scope)
                 
                 # Return the updated visit
                 response_serializer = VisitSerializer(visit)
@@ -170,17 +176,34 @@ class BulkVisitSaveView(APIView):
         for product_id, change in inventory_updates.items():
             if change != 0:
                 Product.objects.filter(id=product_id).update(
-                    inventory_quantity=models.F('inventory_quantity') + change
+                    inventory_quantity=models.F('inventory_quantity') + change,
+                    updated_at=timezone.now()
                 )
         
         # Apply machine stock updates in bulk
         for update in machine_stock_updates:
             MachineItemPrice.objects.filter(id=update['machine_item'].id).update(
-                current_stock=models.F('current_stock') + update['change']
+                current_stock=models.F('current_stock') + update['change'],
+                updated_at=timezone.now()
             )
         
+        # The machines and products the old entries touched also changed
+        previous_scope = ({restock.machine_id for restock in machine_restocks}, set(inventory_updates))
+        
         # Delete all machine restocks (will cascade to entries)
         machine_restocks.delete()
+        return previous_scope
+    
+    def _publish_visit_change(self, visit, machine_restocks_data, machines=(), products=()):
+        """Tell dashboards which location, machines and products this visit touched"""
+        machines = set(machines)
+        products = set(products)
+        for restock_data in machine_restocks_data:
+            if restock_data.get('restock_entries'):
+                machines.add(restock_data['machine'])
+                products.update(entry['product'] for entry in restock_data['restock_entries'])
+        
+        publish_change('visit', locations=[visit.location_id], machines=machines, products=products)
     
     def _process_machine_restocks_bulk(self, visit, machine_restocks_data):
         """Process all machine restocks and entries in optimized bulk operations"""
@@ -253,12 +276,14 @@ class BulkVisitSaveView(APIView):
         # Bulk create restock entries
         if restock_entries_to_create:
             RestockEntry.objects.bulk_create(restock_entries_to_create)
+            transaction.on_commit(lambda: record_bulk_rows('restock_entries', len(restock_entries_to_create)))
         
         # Apply inventory updates in bulk using F expressions for atomic updates
         for product_id, change in inventory_updates.items():
             if change != 0:
                 Product.objects.filter(id=product_id).update(
-                    inventory_quantity=models.F('inventory_quantity') + change
+                    inventory_quantity=models.F('inventory_quantity') + change,
+                    updated_at=timezone.now()
                 )
         
         # Apply machine stock updates in bulk
@@ -277,6 +302,9 @@ class BulkVisitSaveView(APIView):
                 machine_updates[machine_id] = []
             machine_updates[machine_id].append(update)
         
+        # bulk_update() skips auto_now, so stamp updated_at for delta syncs here
+        now = timezone.now()
+        
         # Process each machine's updates
         for machine_id, updates in machine_updates.items():
             # Get all relevant machine items in one query
@@ -299,6 +327,7 @@ class BulkVisitSaveView(APIView):
                     # Calculate new stock: stock_before - discarded + restocked
                     new_stock = update['stock_before'] - update['discarded'] + update['restocked']
                     machine_item.current_stock = new_stock
+                    machine_item.updated_at = now
                     items_to_update.append(machine_item)
             
             # Bulk update machine items
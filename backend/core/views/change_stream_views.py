@@ -0,0 +1,138 @@
+from rest_framework.views import APIView
+from rest_framework.response import Response
+from rest_framework import permissions, status
+from django.conf import settings
+from django.http import StreamingHttpResponse
+from core.change_events import await_events, latest_version, wait_for_events
+import json
+import threading
+import time
+
+
+# Under WSGI every open stream holds a worker thread for SSE_STREAM_SECONDS; at most
+# SSE_WSGI_MAX_STREAMS per process may do so, the other threads stay free for the API
+_stream_slots = None
+_stream_slots_lock = threading.Lock()
+
+
+def get_stream_slots():
+    global _stream_slots
+    with _stream_slots_lock:
+        if _stream_slots is None:
+            _stream_slots = threading.BoundedSemaphore(getattr(settings, 'SSE_WSGI_MAX_STREAMS', 1))
+        return _stream_slots
+
+
+class SlotReleasingStream:
+    """Iterates a stream and frees its WSGI slot when the server closes the response"""
+
+    def __init__(self, stream, slots):
+        self.stream = stream
+        self.slots = slots
+        self.released = False
+
+    def __iter__(self):
+        return self.stream
+
+    def close(self):
+        self.stream.close()
+        if not self.released:
+            self.released = True
+            self.slots.release()
+
+
+def format_event(event):
+    return f'id: {event.id}\nevent: change\ndata: {json.dumps(event.as_message())}\n\n'
+
+
+class ChangeStreamView(APIView):
+    """
+    Server-sent events stream of change notifications.
+
+    Each message is {"version", "kind", "locations", "machines", "products"}
+    and is sent as a "change" event whose id is the version. Clients read it
+    with fetch() so the access token goes in the Authorization header, not the
+    URL. The stream ends after SSE_STREAM_SECONDS so workers are recycled;
+    clients reconnect with Last-Event-ID (or ?version=) and miss nothing.
+    When all of a WSGI process's stream slots are taken, the answer is 503
+    with Retry-After. Under ASGI (settings.ASYNC_VIEWS) the stream is an async
+    generator: Django sends each message as it is produced and no thread waits.
+    """
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get(self, request):
+        version = self.get_start_version(request)
+        if getattr(settings, 'ASYNC_VIEWS', False):
+            # Django's ASGI handler buffers a sync iterator to the end; an async one streams
+            return self.stream_response(self.astream(version))
+
+        slots = get_stream_slots()
+        if not slots.acquire(blocking=False):
+            response = Response({'error': 'Too many open change streams'}, status=status.HTTP_503_SERVICE_UNAVAILABLE)
+            response['Retry-After'] = str(getattr(settings, 'SSE_STREAM_SECONDS', 55))
+            return response
+
+        return self.stream_response(SlotReleasingStream(self.stream(version), slots))
+
+    def stream_response(self, stream):
+        response = StreamingHttpResponse(stream, content_type='text/event-stream')
+        response['Cache-Control'] = 'no-cache'
+        # Stop nginx-style proxies from buffering the stream
+        response['X-Accel-Buffering'] = 'no'
+        return response
+
+    def get_start_version(self, request):
+        last_event_id = request.META.get('HTTP_LAST_EVENT_ID') or request.query_params.get('version')
+        try:
+            return int(last_event_id)
+        except (TypeError, ValueError):
+            # A new client only needs what happens from now on
+            return latest_version()
+
+    def stream(self, version):
+        duration = getattr(settings, 'SSE_STREAM_SECONDS', 55)
+        poll_interval = getattr(settings, 'SSE_POLL_SECONDS', 5)
+        heartbeat_interval = getattr(settings, 'SSE_HEARTBEAT_SECONDS', 15)
+
+        deadline = time.monotonic() + duration
+        last_sent = time.monotonic()
+        yield f'retry: 3000\nevent: version\ndata: {json.dumps({"version": version})}\n\n'
+
+        while True:
+            remaining = deadline - time.monotonic()
+            events = wait_for_events(version, timeout=min(poll_interval, max(remaining, 0)))
+            for event in events:
+                version = event.id
+                yield format_event(event)
+                last_sent = time.monotonic()
+
+            if time.monotonic() >= deadline:
+                break
+            if time.monotonic() - last_sent >= heartbeat_interval:
+                # Comment line keeps idle connections open through proxies
+                yield ': keepalive\n\n'
+                last_sent = time.monotonic()
+
+    async def astream(self, version):
+        """stream() for ASGI"""
+        duration = getattr(settings, 'SSE_STREAM_SECONDS', 55)
+        poll_interval = getattr(settings, 'SSE_POLL_SECONDS', 5)
+        heartbeat_interval = getattr(settings, 'SSE_HEARTBEAT_SECONDS', 15)
+
+        deadline = time.monotonic() + duration
+        last_sent = time.monotonic()
+        yield f'retry: 3000\nevent: version\ndata: {json.dumps({"version": version})}\n\n'
+
+        while True:
+            remaining = deadline - time.monotonic()
+            events = await await_events(version, timeout=min(poll_interval, max(remaining, 0)))
+            for event in events:
+                version = event.id
+                yield format_event(event)
+                last_sent = time.monotonic()
+
+            if time.monotonic() >= deadline:
+                break
+            if time.monotonic() - last_sent >= heartbeat_interval:
+                yield ': keepalive\n\n'
+                last_sent = time.monotonic()
@@ -1,12 +1,17 @@
-from rest_framework import viewsets
+from rest_framework import viewsets, status
 from rest_framework.decorators import action
+from rest_framework.renderers import JSONRenderer
 from rest_framework.response import Response
-from django.db.models import Q
-from core.models import Location
-from core.serializers import LocationSerializer
+from django.db.models import Q, Prefetch
+from django.utils.http import parse_etags, quote_etag
+from core.models import Location, MachineItemPrice
+from core.serializers import LocationSerializer, RestockSheetMachineSerializer
+from core.sparse_fields import SparseFieldsetViewMixin
+from core.delta_sync import UpdatedSinceViewMixin
+import hashlib
 
 
-class LocationViewSet(viewsets.ModelViewSet):
+class LocationViewSet(UpdatedSinceViewMixin, SparseFieldsetViewMixin, viewsets.ModelViewSet):
     queryset = Location.objects.all().order_by('name')
     serializer_class = LocationSerializer
     
@@ -31,4 +36,34 @@ class LocationViewSet(viewsets.ModelViewSet):
         
         return Response({
             'routes': list(routes)
-        }) 
\ No newline at end of file
+        })
+
+    @action(detail=True, methods=['get'], url_path='restock-sheet')
+    def restock_sheet(self, request, pk=None):
+        """
+        Every machine at the location with its slots, products, prices and current stock.
+
+        Replaces one machine-items/?machine= request per machine when opening the
+        restock form. Responses carry an ETag so an unchanged sheet is a 304.
+        """
+        location = self.get_object()
+        machines = location.machines.select_related('location').prefetch_related(
+            Prefetch(
+                'item_prices',
+                queryset=MachineItemPrice.objects.select_related('product').order_by('slot', 'product__name')
+            )
+        ).order_by('name')
+
+        data = {
+            'location': LocationSerializer(location).data,
+            'machines': RestockSheetMachineSerializer(machines, many=True).data,
+        }
+
+        etag = quote_etag(hashlib.md5(JSONRenderer().render(data)).hexdigest())
+        headers = {'ETag': etag, 'Cache-Control': 'private, no-cache'}
+
+        client_etags = parse_etags(request.META.get('HTTP_IF_NONE_MATCH', ''))
+        if etag in client_etags or '*' in client_etags:
+            return Response(status=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+        return Response(data, headers=headers)
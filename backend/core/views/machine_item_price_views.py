@@ -1,9 +1,78 @@
-from rest_framework import viewsets, filters
-from core.models import MachineItemPrice
-from core.serializers import MachineItemPriceSerializer
+from rest_framework import viewsets, filters, status
+from rest_framework.decorators import action
+from rest_framework.response import Response
+from django.db import transaction
+from core.models import MachineItemPrice, Product
+from core.serializers import (
+    MachineItemPriceSerializer, MachineItemPriceValuesSerializer, MachineItemPriceBulkUpdateSerializer
+)
+from core.sparse_fields import SparseFieldsetViewMixin
+from core.delta_sync import UpdatedSinceViewMixin
+from core.change_events import publish_change
+from core.metrics import record_bulk_rows
+from core.values_serializers import ValuesListViewMixin
 
 
-class MachineItemPriceViewSet(viewsets.ModelViewSet):
+class MachineItemPriceViewSet(UpdatedSinceViewMixin, ValuesListViewMixin, SparseFieldsetViewMixin, viewsets.ModelViewSet):
     queryset = MachineItemPrice.objects.all().order_by('machine__location__name', 'machine__machine_type', 'slot')
     serializer_class = MachineItemPriceSerializer
-    filterset_fields = ['machine', 'product', 'slot'] 
\ No newline at end of file
+    values_serializer_class = MachineItemPriceValuesSerializer
+    filterset_fields = ['machine', 'product', 'slot']
+    
+    def get_queryset(self):
+        # Load product, machine/location and the purchase totals behind profit_margin
+        # up front, but only for the fields being serialized
+        queryset = MachineItemPrice.objects.order_by('machine__location__name', 'machine__machine_type', 'slot')
+        related = []
+        if self.field_requested('product_name'):
+            related.append('product')
+        if self.field_requested('machine_info'):
+            related.append('machine__location')
+        if related:
+            queryset = queryset.select_related(*related)
+        if self.field_requested('profit_margin'):
+            queryset = queryset.annotate(**Product.purchase_total_annotations('product'))
+        return queryset
+    
+    def perform_create(self, serializer):
+        super().perform_create(serializer)
+        self.publish_price_change(serializer.instance)
+    
+    def perform_update(self, serializer):
+        super().perform_update(serializer)
+        self.publish_price_change(serializer.instance)
+    
+    def perform_destroy(self, instance):
+        super().perform_destroy(instance)
+        self.publish_price_change(instance)
+    
+    def publish_price_change(self, item):
+        publish_change('price', machines=[item.machine_id], products=[item.product_id])
+    
+    @action(detail=False, methods=['post'], url_path='bulk-update')
+    def bulk_update(self, request):
+        """
+        Apply many price/slot changes in one transaction.
+        
+        Payload: {"changes": [{"machine": 1, "product": 2, "price": "1.75", "slot": 3}],
+                  "rules": [{"product": 2, "price": "1.75", "route": "R1", "machine_type": "Combo"}]}
+        Pass ?dry_run=true to get the summary without saving.
+        """
+        serializer = MachineItemPriceBulkUpdateSerializer(data=request.data)
+        if not serializer.is_valid():
+            return Response({'errors': serializer.row_errors}, status=status.HTTP_400_BAD_REQUEST)
+        
+        if request.query_params.get('dry_run', '').lower() in ['true', '1']:
+            return Response({'dry_run': True, **serializer.preview()})
+        
+        summary = serializer.save()
+        rows = summary['updated'] + summary['created'] + summary['rule_updated']
+        transaction.on_commit(lambda: record_bulk_rows('machine_item_prices', rows))
+        changes, rules = serializer.validated_data['changes'], serializer.validated_data['rules']
+        publish_change(
+            'price',
+            # Rules can match any machine, so they leave the machine scope open
+            machines=[] if rules else [change['machine'] for change in changes],
+            products=[row['product'] for row in changes + rules]
+        )
+        return Response(serializer.data)
@@ -1,17 +1,24 @@
 from rest_framework import viewsets, filters
-from django.db.models import Q
+from django.db.models import Q, Count
 from core.models import Machine
 from core.serializers import MachineSerializer
+from core.sparse_fields import SparseFieldsetViewMixin
+from core.delta_sync import UpdatedSinceViewMixin
 
 
-class MachineViewSet(viewsets.ModelViewSet):
+class MachineViewSet(UpdatedSinceViewMixin, SparseFieldsetViewMixin, viewsets.ModelViewSet):
     queryset = Machine.objects.all().order_by('location__name', 'machine_type', 'model')
     serializer_class = MachineSerializer
     filterset_fields = ['location', 'machine_type']
     search_fields = ['machine_type', 'model', 'location__name', 'location__route']
     
     def get_queryset(self):
-        queryset = Machine.objects.all().order_by('location__name', 'machine_type', 'model')
+        # Join location and annotate product counts once, when those fields are serialized
+        queryset = Machine.objects.order_by('location__name', 'machine_type', 'model')
+        if self.field_requested('location_name', 'route', 'route_name'):
+            queryset = queryset.select_related('location')
+        if self.field_requested('product_count'):
+            queryset = queryset.annotate(item_count=Count('item_prices'))
         route = self.request.query_params.get('route', None)
         
         if route is not None:
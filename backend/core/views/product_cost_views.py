@@ -1,28 +1,43 @@
 from rest_framework import viewsets, permissions
 from core.models import ProductCost, Product
 from core.serializers import ProductCostSerializer
+from core.pagination import HistoryCursorPagination
+from core.sparse_fields import SparseFieldsetViewMixin
+from core.delta_sync import UpdatedSinceViewMixin
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from django.db.models import Q
 
 
-class ProductCostViewSet(viewsets.ModelViewSet):
+class ProductCostViewSet(UpdatedSinceViewMixin, SparseFieldsetViewMixin, viewsets.ModelViewSet):
     """
     API endpoint for managing product costs.
     """
-    queryset = ProductCost.objects.all().order_by('-date')
+    queryset = ProductCost.objects.all().order_by('-date', '-id')
     serializer_class = ProductCostSerializer
     permission_classes = [permissions.IsAuthenticated]
+    pagination_class = HistoryCursorPagination
+    ordering = ('-date', '-id')
+    # Cost records are never edited, so new ones are the only changes
+    updated_since_field = 'created_at'
     
     def get_queryset(self):
         """
         Filter costs based on query parameters.
         """
-        queryset = ProductCost.objects.all().order_by('-date')
+        queryset = ProductCost.objects.order_by('-date', '-id')
         product_id = self.request.query_params.get('product')
         
         if product_id:
             queryset = queryset.filter(product_id=product_id)
+        
+        related = []
+        if self.field_requested('product_name', 'unit_type'):
+            related.append('product')
+        if self.field_requested('supplier', 'purchase_notes'):
+            related.append('purchase__supplier')
+        if related:
+            queryset = queryset.select_related(*related)
             
         return queryset
     
@@ -2,14 +2,18 @@ from rest_framework import viewsets, filters
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from core.models import Product, MachineItemPrice
-from core.serializers import ProductSerializer
+from core.serializers import ProductSerializer, ProductValuesSerializer
 from django.shortcuts import get_object_or_404
 from django_filters.rest_framework import DjangoFilterBackend
+from core.sparse_fields import SparseFieldsetViewMixin
+from core.delta_sync import UpdatedSinceViewMixin
+from core.values_serializers import ValuesListViewMixin
 
 
-class ProductViewSet(viewsets.ModelViewSet):
+class ProductViewSet(UpdatedSinceViewMixin, ValuesListViewMixin, SparseFieldsetViewMixin, viewsets.ModelViewSet):
     queryset = Product.objects.all().order_by('name')
     serializer_class = ProductSerializer
+    values_serializer_class = ProductValuesSerializer
     search_fields = ['name', 'unit_type']
     filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
     filterset_fields = ['product_type']
@@ -30,6 +34,12 @@ class ProductViewSet(viewsets.ModelViewSet):
         if product_type:
             queryset = queryset.filter(product_type=product_type)
         
+        # Cost fields are computed in subqueries, and only when they will be serialized
+        if self.field_requested('average_cost', 'cost_price'):
+            queryset = queryset.annotate(**Product.purchase_total_annotations())
+        if self.field_requested('latest_cost', 'cost_price'):
+            queryset = queryset.annotate(**Product.latest_cost_annotations())
+        
         return queryset
     
     def get_serializer_context(self):
@@ -60,6 +70,9 @@ class ProductViewSet(viewsets.ModelViewSet):
         # Override pagination for this specific endpoint
         self.pagination_class = None
         
-        queryset = self.get_queryset()
+        if self.values_serializer_class is not None:
+            return self.render_values(self.get_queryset(), paginate=False)
+        
+        queryset = self.only_requested_columns(self.get_queryset())
         serializer = self.get_serializer(queryset, many=True)
         return Response(serializer.data) 
\ No newline at end of file
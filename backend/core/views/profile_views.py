@@ -0,0 +1,15 @@
+from rest_framework.views import APIView
+from rest_framework.response import Response
+from rest_framework import permissions, status
+from core.profiling import profile_cache
+
+
+class ProfileReportView(APIView):
+    """Staff only: a report stored by a ?_profile=store request (see core.profiling)"""
+    permission_classes = [permissions.IsAdminUser]
+
+    def get(self, request, profile_id):
+        report = profile_cache().get(f'profile_report:{profile_id}')
+        if report is None:
+            return Response({'error': 'Profile not found or expired'}, status=status.HTTP_404_NOT_FOUND)
+        return Response(report)
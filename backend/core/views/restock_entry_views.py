@@ -1,17 +1,38 @@
 from rest_framework import viewsets, filters
 from django.db import models
+from django.utils import timezone
 from core.models import RestockEntry
-from core.serializers import RestockEntrySerializer
+from core.serializers import RestockEntrySerializer, RestockEntryValuesSerializer
+from core.pagination import HistoryCursorPagination
+from core.sparse_fields import SparseFieldsetViewMixin
+from core.delta_sync import UpdatedSinceViewMixin
+from core.values_serializers import ValuesListViewMixin
 
 
-class RestockEntryViewSet(viewsets.ModelViewSet):
-    queryset = RestockEntry.objects.select_related(
-        'visit_machine_restock__visit__location',
-        'visit_machine_restock__machine',
-        'product'
-    ).order_by('-visit_machine_restock__visit__visit_date')
+class RestockEntryViewSet(UpdatedSinceViewMixin, ValuesListViewMixin, SparseFieldsetViewMixin, viewsets.ModelViewSet):
+    queryset = RestockEntry.objects.all()
     serializer_class = RestockEntrySerializer
+    values_serializer_class = RestockEntryValuesSerializer
     filterset_fields = ['visit_machine_restock', 'product']
+    pagination_class = HistoryCursorPagination
+    ordering = ('-visit_date', '-id')
+    
+    def get_queryset(self):
+        # visit_date is copied onto each entry, so cursor pagination walks
+        # restock_entry_date_id_idx without joining Visit
+        queryset = RestockEntry.objects.order_by('-visit_date', '-id')
+        related = []
+        if self.field_requested('product_name'):
+            related.append('product')
+        if self.field_requested('machine_name', 'machine_type', 'machine_model', 'slot'):
+            related.append('machine')
+        if related:
+            queryset = queryset.select_related(*related)
+        if self.field_requested('slot'):
+            # item_prices are prefetched so RestockEntrySerializer.get_slot finds the slot
+            # without a MachineItemPrice query per entry
+            queryset = queryset.prefetch_related('machine__item_prices')
+        return queryset
     
     def perform_update(self, serializer):
         # Get the old instance to calculate inventory changes
@@ -29,7 +50,8 @@ class RestockEntryViewSet(viewsets.ModelViewSet):
         if inventory_change != 0:
             # Update product inventory using F expression for atomic update
             models.Product.objects.filter(id=new_instance.product.id).update(
-                inventory_quantity=models.F('inventory_quantity') + inventory_change
+                inventory_quantity=models.F('inventory_quantity') + inventory_change,
+                updated_at=timezone.now()
             )
             
         # Update the machine item stock using bulk operations
@@ -46,7 +68,8 @@ class RestockEntryViewSet(viewsets.ModelViewSet):
                     machine=machine,
                     product=new_instance.product
                 ).update(
-                    current_stock=models.F('current_stock') + stock_change
+                    current_stock=models.F('current_stock') + stock_change,
+                    updated_at=timezone.now()
                 )
         except Exception:
             pass  # If machine item doesn't exist, skip update 
\ No newline at end of file
@@ -1,12 +1,18 @@
 from rest_framework import viewsets, filters, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
-from django.db.models import Q
+from rest_framework.exceptions import ValidationError
+from django.db.models import Q, Count, Sum
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+from datetime import datetime
 from core.models import Supplier
 from core.serializers import SupplierSerializer, SupplierListSerializer
+from core.sparse_fields import SparseFieldsetViewMixin
+from core.delta_sync import UpdatedSinceViewMixin
 
 
-class SupplierViewSet(viewsets.ModelViewSet):
+class SupplierViewSet(UpdatedSinceViewMixin, SparseFieldsetViewMixin, viewsets.ModelViewSet):
     queryset = Supplier.objects.all().order_by('name')
     serializer_class = SupplierSerializer
     search_fields = ['name', 'contact_person', 'email']
@@ -20,7 +26,7 @@ class SupplierViewSet(viewsets.ModelViewSet):
     
     def get_queryset(self):
         """Filter queryset based on query parameters"""
-        queryset = Supplier.objects.all()
+        queryset = Supplier.objects.annotate(**self.get_purchase_annotations())
         
         # Filter by active status
         is_active = self.request.query_params.get('is_active', None)
@@ -41,6 +47,43 @@ class SupplierViewSet(viewsets.ModelViewSet):
         
         return queryset.order_by('name')
     
+    def get_purchase_annotations(self):
+        """
+        Purchase statistics computed in the same grouped query as the supplier rows.
+        Supplier.purchase_count/total_spent read these instead of querying per supplier.
+        With ?since=YYYY-MM-DD (or an ISO datetime) the spend in that window is added too.
+        """
+        annotations = {}
+        if self.field_requested('purchase_count'):
+            annotations['annotated_purchase_count'] = Count('wholesale_purchases')
+        if self.field_requested('total_spent'):
+            annotations['annotated_total_spent'] = Sum('wholesale_purchases__total_cost')
+        
+        since = self.get_since()
+        if since is not None and self.field_requested('period_purchase_count', 'period_total_spent'):
+            window = Q(wholesale_purchases__purchased_at__gte=since)
+            annotations['period_purchase_count'] = Count('wholesale_purchases', filter=window)
+            annotations['period_total_spent'] = Sum('wholesale_purchases__total_cost', filter=window)
+        
+        return annotations
+    
+    def get_since(self):
+        """Parse the optional ?since= parameter into an aware datetime"""
+        since = self.request.query_params.get('since')
+        if not since:
+            return None
+        
+        parsed = parse_datetime(since)
+        if parsed is None:
+            parsed_date = parse_date(since)
+            if parsed_date is None:
+                raise ValidationError({'since': 'Invalid date format. Use YYYY-MM-DD or an ISO datetime.'})
+            parsed = datetime.combine(parsed_date, datetime.min.time())
+        
+        if timezone.is_naive(parsed):
+            parsed = timezone.make_aware(parsed, timezone.get_current_timezone())
+        return parsed
+    
     def destroy(self, request, *args, **kwargs):
         """Override destroy to handle suppliers with purchases"""
         supplier = self.get_object()
@@ -1,18 +1,35 @@
 from rest_framework import viewsets, filters
 from django.db import models
+from django.utils import timezone
 from core.models import VisitMachineRestock, RestockEntry
 from core.serializers import VisitMachineRestockSerializer
+from core.pagination import HistoryCursorPagination
+from core.sparse_fields import SparseFieldsetViewMixin
+from core.delta_sync import UpdatedSinceViewMixin
 
 
-class VisitMachineRestockViewSet(viewsets.ModelViewSet):
-    queryset = VisitMachineRestock.objects.select_related(
-        'visit__location',
-        'machine__location'
-    ).prefetch_related(
-        'restock_entries__product'
-    ).order_by('-visit__visit_date')
+class VisitMachineRestockViewSet(UpdatedSinceViewMixin, SparseFieldsetViewMixin, viewsets.ModelViewSet):
+    queryset = VisitMachineRestock.objects.all()
     serializer_class = VisitMachineRestockSerializer
     filterset_fields = ['visit', 'machine']
+    pagination_class = HistoryCursorPagination
+    ordering = ('-visit_date', '-id')
+    
+    def get_queryset(self):
+        # The serializer only reads visit/machine and their locations; restock entries
+        # are served by restock-entries/, so they are not prefetched here. Cursor
+        # pagination needs the ordering value on the row itself.
+        queryset = VisitMachineRestock.objects.annotate(
+            visit_date=models.F('visit__visit_date')
+        ).order_by('-visit_date', '-id')
+        related = []
+        if self.field_requested('visit_info'):
+            related.append('visit__location')
+        if self.field_requested('machine_info'):
+            related.append('machine__location')
+        if related:
+            queryset = queryset.select_related(*related)
+        return queryset
     
     def perform_destroy(self, instance):
         # Before deleting, retrieve all restock entries with optimized queries
@@ -47,7 +64,8 @@ class VisitMachineRestockViewSet(viewsets.ModelViewSet):
         for product_id, change in inventory_updates.items():
             if change != 0:
                 models.Product.objects.filter(id=product_id).update(
-                    inventory_quantity=models.F('inventory_quantity') + change
+                    inventory_quantity=models.F('inventory_quantity') + change,
+                    updated_at=timezone.now()
                 )
         
         # Apply machine stock updates in bulk
@@ -56,7 +74,8 @@ class VisitMachineRestockViewSet(viewsets.ModelViewSet):
                 machine_id=update['machine_id'],
                 product_id=update['product_id']
             ).update(
-                current_stock=models.F('current_stock') + update['change']
+                current_stock=models.F('current_stock') + update['change'],
+                updated_at=timezone.now()
             )
         
         # Now delete the instance which will cascade to delete related entries
@@ -1,13 +1,33 @@
 from rest_framework import viewsets, filters
+from rest_framework.decorators import action
+from rest_framework.response import Response
 from django.db import models
+from django.db.models import Prefetch
+from django.utils import timezone
 from core.models import Visit, VisitMachineRestock, RestockEntry
-from core.serializers import VisitSerializer
+from core.serializers import VisitSerializer, VisitFullSerializer
+from core.pagination import HistoryCursorPagination
+from core.sparse_fields import SparseFieldsetViewMixin
+from core.delta_sync import UpdatedSinceViewMixin
 
 
-class VisitViewSet(viewsets.ModelViewSet):
-    queryset = Visit.objects.select_related('location', 'user').order_by('-visit_date')
+class VisitViewSet(UpdatedSinceViewMixin, SparseFieldsetViewMixin, viewsets.ModelViewSet):
+    queryset = Visit.objects.all()
     serializer_class = VisitSerializer
     filterset_fields = ['location', 'user']
+    pagination_class = HistoryCursorPagination
+    ordering = ('-visit_date', '-id')
+    
+    def get_queryset(self):
+        queryset = Visit.objects.order_by('-visit_date', '-id')
+        related = []
+        if self.field_requested('location_name'):
+            related.append('location')
+        if self.field_requested('user_name'):
+            related.append('user')
+        if related:
+            queryset = queryset.select_related(*related)
+        return queryset
     
     def perform_create(self, serializer):
         # If user is not provided, use the current authenticated user
@@ -17,6 +37,23 @@ class VisitViewSet(viewsets.ModelViewSet):
         else:
             serializer.save()
             
+    @action(detail=True, methods=['get'])
+    def full(self, request, pk=None):
+        """
+        The visit with its machine restocks, entries and matching slot/price data.
+
+        Built from four queries: the visit, its machine restocks with machines,
+        their entries with products, and the machines' item prices.
+        """
+        visit = self.get_object()
+        restocks = VisitMachineRestock.objects.select_related('machine').prefetch_related(
+            Prefetch('restock_entries', queryset=RestockEntry.objects.select_related('product').order_by('id')),
+            'machine__item_prices'
+        ).order_by('machine__name')
+        models.prefetch_related_objects([visit], Prefetch('machine_restocks', queryset=restocks))
+
+        return Response(VisitFullSerializer(visit, context={'request': request}).data)
+
     def perform_destroy(self, instance):
         # Find all machine restocks for this visit with optimized queries
         machine_restocks = VisitMachineRestock.objects.filter(visit=instance).prefetch_related(
@@ -52,13 +89,15 @@ class VisitViewSet(viewsets.ModelViewSet):
         for product_id, change in inventory_updates.items():
             if change != 0:
                 models.Product.objects.filter(id=product_id).update(
-                    inventory_quantity=models.F('inventory_quantity') + change
+                    inventory_quantity=models.F('inventory_quantity') + change,
+                    updated_at=timezone.now()
                 )
         
         # Apply machine stock updates in bulk
         for update in machine_stock_updates:
             models.MachineItemPrice.objects.filter(id=update['machine_item_id']).update(
-                current_stock=models.F('current_stock') + update['change']
+                current_stock=models.F('current_stock') + update['change'],
+                updated_at=timezone.now()
             )
         
         # Delete the visit (will cascade to delete machine restocks and entries)
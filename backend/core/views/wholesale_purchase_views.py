@@ -1,9 +1,41 @@
 from rest_framework import viewsets, filters
 from core.models import WholesalePurchase
 from core.serializers import WholesalePurchaseSerializer
+from core.pagination import HistoryCursorPagination
+from core.sparse_fields import SparseFieldsetViewMixin
+from core.delta_sync import UpdatedSinceViewMixin
+from core.change_events import publish_change
 
 
-class WholesalePurchaseViewSet(viewsets.ModelViewSet):
-    queryset = WholesalePurchase.objects.all().order_by('-purchased_at')
+class WholesalePurchaseViewSet(UpdatedSinceViewMixin, SparseFieldsetViewMixin, viewsets.ModelViewSet):
+    queryset = WholesalePurchase.objects.all()
     serializer_class = WholesalePurchaseSerializer
-    filterset_fields = ['product'] 
\ No newline at end of file
+    filterset_fields = ['product']
+    pagination_class = HistoryCursorPagination
+    ordering = ('-purchased_at', '-id')
+
+    def get_queryset(self):
+        # Join product and supplier for the serializer fields that read them
+        queryset = WholesalePurchase.objects.order_by('-purchased_at', '-id')
+        related = []
+        if self.field_requested('product_name', 'current_inventory'):
+            related.append('product')
+        if self.field_requested('supplier_name'):
+            related.append('supplier')
+        if related:
+            queryset = queryset.select_related(*related)
+        return queryset
+    
+    def perform_create(self, serializer):
+        super().perform_create(serializer)
+        publish_change('purchase', products=[serializer.instance.product_id])
+    
+    def perform_update(self, serializer):
+        previous_product = serializer.instance.product_id
+        super().perform_update(serializer)
+        publish_change('purchase', products=[previous_product, serializer.instance.product_id])
+    
+    def perform_destroy(self, instance):
+        product_id = instance.product_id
+        super().perform_destroy(instance)
+        publish_change('purchase', products=[product_id])
@@ -0,0 +1,20 @@
+# Loaded automatically by gunicorn when started from backend/ (railway-start.sh)
+import os
+import shutil
+import tempfile
+
+# Workers write their Prometheus samples here and /metrics adds them up.
+# Set before any worker imports prometheus_client.
+os.environ.setdefault('PROMETHEUS_MULTIPROC_DIR', os.path.join(tempfile.gettempdir(), 'vendingapp-metrics'))
+
+
+def on_starting(server):
+    # Samples left over from a previous run would be added to this one's
+    path = os.environ['PROMETHEUS_MULTIPROC_DIR']
+    shutil.rmtree(path, ignore_errors=True)
+    os.makedirs(path, exist_ok=True)
+
+
+def child_exit(server, worker):
+    from prometheus_client import multiprocess
+    multiprocess.mark_process_dead(worker.pid)
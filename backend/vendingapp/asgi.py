@@ -2,6 +2,9 @@ import os
 
 from django.core.asgi import get_asgi_application
 
-os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'backend.vendingapp.settings')
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'vendingapp.settings')
+# Route analytics and batch requests through the async views and their bounded
+# thread pools (see core.async_views)
+os.environ.setdefault('ASYNC_VIEWS', 'true')
 
-application = get_asgi_application() 
\ No newline at end of file
+application = get_asgi_application()
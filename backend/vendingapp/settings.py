@@ -1,5 +1,6 @@
 import os
 import environ
+import tempfile
 from pathlib import Path
 from datetime import timedelta
 
@@ -48,13 +49,17 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'core.server_timing.ServerTimingMiddleware',  # Outermost, so its total covers everything
+    'core.metrics.PrometheusMetricsMiddleware',
     'django.middleware.security.SecurityMiddleware',
-    'whitenoise.middleware.WhiteNoiseMiddleware',  # Whitenoise for static files
+    'core.static_files.AsyncWhiteNoiseMiddleware',  # Whitenoise for static files, async-capable
     'django.contrib.sessions.middleware.SessionMiddleware',
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'core.db_routing.ReplicaStickinessMiddleware',
+    'core.slow_queries.SlowQueryMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
@@ -102,6 +107,23 @@ else:
         }
     }
 
+# Optional read replica for analytics and report views (see core.db_routing).
+# REPLICA_DATABASE_URL can be a second Postgres or, locally, a second SQLite
+# file; tests mirror it onto the default database.
+if env('REPLICA_DATABASE_URL', default=None):
+    DATABASES['replica'] = {
+        **env.db('REPLICA_DATABASE_URL'),
+        'CONN_MAX_AGE': env.int('DB_CONN_MAX_AGE', default=60),
+        'TEST': {'MIRROR': 'default'},
+    }
+
+DATABASE_ROUTERS = ['core.db_routing.ReplicaRouter']
+REPLICA_DATABASE_ALIAS = 'replica'
+# Seconds a client reads from the primary after its own write
+REPLICA_STICKY_SECONDS = env.int('REPLICA_STICKY_SECONDS', default=15)
+# Seconds to skip an unreachable replica before trying it again
+REPLICA_RETRY_SECONDS = env.int('REPLICA_RETRY_SECONDS', default=30)
+
 # Password validation
 AUTH_PASSWORD_VALIDATORS = [
     {
@@ -148,7 +170,7 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 # REST Framework settings
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'core.authentication.CachedJWTAuthentication',
     ),
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.IsAuthenticated',
@@ -158,7 +180,7 @@ REST_FRAMEWORK = {
         'rest_framework.filters.SearchFilter',
         'rest_framework.filters.OrderingFilter',
     ],
-    'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
+    'DEFAULT_PAGINATION_CLASS': 'core.pagination.StandardResultsSetPagination',
     'PAGE_SIZE': 50,  # Limit default page size for better performance
     'DEFAULT_RENDERER_CLASSES': [
         'rest_framework.renderers.JSONRenderer',
@@ -168,13 +190,86 @@ REST_FRAMEWORK = {
     ],
 }
 
+# Set by vendingapp.asgi: analytics and batch views run as async views that hand
+# their blocking work to small bounded thread pools
+ASYNC_VIEWS = env.bool('ASYNC_VIEWS', default=False)
+ANALYTICS_EXECUTOR_WORKERS = env.int('ANALYTICS_EXECUTOR_WORKERS', default=2)
+BATCH_EXECUTOR_WORKERS = env.int('BATCH_EXECUTOR_WORKERS', default=2)
+
+# batch/ endpoint: sub-requests per call and worker threads that run them
+BATCH_MAX_REQUESTS = env.int('BATCH_MAX_REQUESTS', default=20)
+BATCH_MAX_WORKERS = env.int('BATCH_MAX_WORKERS', default=4)
+
+# ?updated_since= delta fetches: seconds the returned server_time is moved back so
+# rows from transactions that commit during a sync are listed again on the next one
+DELTA_SYNC_OVERLAP_SECONDS = env.int('DELTA_SYNC_OVERLAP_SECONDS', default=60)
+
+# changes/stream/ server-sent events: seconds per connection, between polls of
+# other processes' events and between keepalives; hours of events to keep
+SSE_STREAM_SECONDS = env.int('SSE_STREAM_SECONDS', default=55)
+SSE_POLL_SECONDS = env.int('SSE_POLL_SECONDS', default=5)
+SSE_HEARTBEAT_SECONDS = env.int('SSE_HEARTBEAT_SECONDS', default=15)
+# Streams per WSGI process; each holds a worker thread, so keep this below --threads
+SSE_WSGI_MAX_STREAMS = env.int('SSE_WSGI_MAX_STREAMS', default=1)
+CHANGE_EVENT_RETENTION_HOURS = env.int('CHANGE_EVENT_RETENTION_HOURS', default=24)
+
 # Simple JWT settings
 SIMPLE_JWT = {
     'ACCESS_TOKEN_LIFETIME': timedelta(days=1),
     'REFRESH_TOKEN_LIFETIME': timedelta(days=7),
     'ROTATE_REFRESH_TOKENS': False,
     'BLACKLIST_AFTER_ROTATION': True,
+    # Tokens carry a password-hash claim and stop working after a password change;
+    # it also versions the authenticated-user cache below
+    'CHECK_REVOKE_TOKEN': True,
+}
+
+# Seconds an authenticated user stays cached per process (0 disables the cache)
+AUTH_USER_CACHE_TTL = env.int('AUTH_USER_CACHE_TTL', default=30)
+AUTH_USER_CACHE_SIZE = env.int('AUTH_USER_CACHE_SIZE', default=1024)
+
+# Server-Timing header (for staff users, or on every response with SERVER_TIMING_HEADER),
+# and a JSON log line on core.server_timing for a sample of requests plus every
+# request slower than SERVER_TIMING_SLOW_MS
+SERVER_TIMING_HEADER = env.bool('SERVER_TIMING_HEADER', default=False)
+SERVER_TIMING_LOG_SAMPLE_RATE = env.float('SERVER_TIMING_LOG_SAMPLE_RATE', default=0.1)
+SERVER_TIMING_SLOW_MS = env.int('SERVER_TIMING_SLOW_MS', default=1000)
+
+# /metrics requires "Authorization: Bearer <METRICS_TOKEN>"; unset, it is only served with DEBUG on
+METRICS_TOKEN = env('METRICS_TOKEN', default='')
+
+# Opt-in: log SQL statements slower than SLOW_QUERY_THRESHOLD_MS as JSON lines on
+# core.slow_queries, with the query plan for a sample of them (each statement at most
+# once per SLOW_QUERY_EXPLAIN_INTERVAL seconds per process). slow_query_report
+# aggregates SLOW_QUERY_LOG_FILE.
+SLOW_QUERY_LOG = env.bool('SLOW_QUERY_LOG', default=False)
+SLOW_QUERY_THRESHOLD_MS = env.int('SLOW_QUERY_THRESHOLD_MS', default=200)
+SLOW_QUERY_EXPLAIN_SAMPLE_RATE = env.float('SLOW_QUERY_EXPLAIN_SAMPLE_RATE', default=0.1)
+SLOW_QUERY_EXPLAIN_INTERVAL = env.int('SLOW_QUERY_EXPLAIN_INTERVAL', default=300)
+SLOW_QUERY_LOG_FILE = env('SLOW_QUERY_LOG_FILE', default='')
+
+# Staff can profile the analytics and bulk-save views with ?_profile=1 (report instead of
+# the response) or ?_profile=store (report kept PROFILE_STORE_SECONDS, served at
+# /api/profiles/<id>/), at most PROFILE_RATE_LIMIT times per minute each
+CACHES = {
+    'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'},
+    # Rate limit counts and stored reports must be seen by every worker process
+    'profiles': env.cache(
+        'PROFILE_CACHE_URL', default=f"filecache://{os.path.join(tempfile.gettempdir(), 'vendingapp-profiles')}"
+    ),
+    # Read-your-writes pins must hold whichever worker serves the user's next request
+    'replica_pins': env.cache(
+        'REPLICA_PIN_CACHE_URL',
+        default=f"filecache://{os.path.join(tempfile.gettempdir(), 'vendingapp-replica-pins')}"
+    ),
 }
+PROFILE_REQUESTS = env.bool('PROFILE_REQUESTS', default=True)
+PROFILE_RATE_LIMIT = env.int('PROFILE_RATE_LIMIT', default=6)
+PROFILE_STORE_SECONDS = env.int('PROFILE_STORE_SECONDS', default=3600)
+PROFILE_TOP_FUNCTIONS = env.int('PROFILE_TOP_FUNCTIONS', default=40)
+
+# explain_queries fails when a query plan reads a table this large with a sequential scan
+EXPLAIN_MAX_SEQ_SCAN_ROWS = env.int('EXPLAIN_MAX_SEQ_SCAN_ROWS', default=10000)
 
 # CORS settings
 CORS_ALLOWED_ORIGINS = env.list("CORS_ALLOWED_ORIGINS", default=[
@@ -248,6 +343,10 @@ LOGGING = {
             'format': '{levelname} {message}',
             'style': '{',
         },
+        'message': {
+            'format': '{message}',
+            'style': '{',
+        },
     },
     'handlers': {
         'console': {
@@ -282,4 +381,17 @@ LOGGING = {
             'propagate': False,
         },
     },
-} 
\ No newline at end of file
+}
+
+if SLOW_QUERY_LOG_FILE:
+    LOGGING['handlers']['slow_query_file'] = {
+        'level': 'WARNING',
+        'class': 'logging.handlers.WatchedFileHandler',  # Safe to share between worker processes
+        'filename': SLOW_QUERY_LOG_FILE,
+        'formatter': 'message',
+    }
+    LOGGING['loggers']['core.slow_queries'] = {
+        'handlers': ['console', 'slow_query_file'],
+        'level': 'WARNING',
+        'propagate': False,
+    }
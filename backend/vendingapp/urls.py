@@ -17,6 +17,7 @@ import json
 from django.core.management import call_command
 from io import StringIO
 import os
+from core.metrics import metrics_view
 
 logger = logging.getLogger(__name__)
 User = get_user_model()
@@ -354,6 +355,7 @@ urlpatterns = [
     path('api/migrate/', migrate_view, name='migrate'),
     path('api/direct-debug/', direct_debug_view, name='direct_debug'),
     path('api/direct-migrate/', direct_migrate_view, name='direct_migrate'),
+    path('metrics', metrics_view, name='metrics'),
     
     # Serve static files in production
     re_path(r'^static/(?P<path>.*)$', serve, {
@@ -1,4 +1,4 @@
-import { ref, reactive, computed } from 'vue'
+import { ref, reactive, computed, onUnmounted } from 'vue'
 import { api } from '../services/api'
 
 export function useDashboard() {
@@ -107,7 +107,7 @@ export function useDashboard() {
     
     loadingStates.value.locations = true
     try {
-      const response = await api.getLocations()
+      const response = await api.syncReferenceData('/locations/')
       locations.value = response.data.results || response.data
     } catch (err) {
       console.error('Error fetching locations:', err)
@@ -123,7 +123,7 @@ export function useDashboard() {
     
     loadingStates.value.machines = true
     try {
-      const response = await api.getMachines()
+      const response = await api.syncReferenceData('/machines/')
       machines.value = response.data.results || response.data
     } catch (err) {
       console.error('Error fetching machines:', err)
@@ -138,7 +138,7 @@ export function useDashboard() {
     
     loadingStates.value.products = true
     try {
-      const response = await api.getProducts()
+      const response = await api.syncReferenceData('/products/')
       products.value = response.data.results || response.data
     } catch (err) {
       console.error('Error fetching products:', err)
@@ -210,6 +210,10 @@ export function useDashboard() {
     
     try {
       const params = buildRequestParams()
+      await api.prefetchBatch([
+        { url: '/analytics/advanced-demand', params },
+        { url: '/dashboard/', params }
+      ])
       await Promise.all([
         fetchAdvancedAnalyticsData(params),
         fetchLegacyDashboardData(params) // For low stock items
@@ -228,18 +232,27 @@ export function useDashboard() {
     error.value = null
     
     try {
-      // Use batch API calls for better performance
+      // One batch/ round trip fills the cache for the analytics calls below;
+      // reference data comes from the delta-synced replicas
+      const params = buildRequestParams()
+      await api.prefetchBatch([
+        { url: '/analytics/advanced-demand', params },
+        { url: '/dashboard/', params }
+      ])
+
       const apiCalls = [
         fetchLocations(),
         fetchMachines(),
         fetchProducts(),
-        fetchAdvancedAnalyticsData(buildRequestParams()),
-        fetchLegacyDashboardData(buildRequestParams())
+        fetchAdvancedAnalyticsData(params),
+        fetchLegacyDashboardData(params)
       ]
       
       // Execute API calls in parallel and handle individual errors
       const results = await Promise.allSettled(apiCalls)
       
+      watchForChanges()
+      
       // Check if critical API calls failed
       const failedCalls = results.filter(result => result.status === 'rejected')
       if (failedCalls.length > 0) {
@@ -259,6 +272,22 @@ export function useDashboard() {
     }
   }
 
+  // Refetch the analytics widgets when a saved visit, purchase or price touches
+  // the current filters; the change feed has already dropped their cache entries
+  let stopWatchingChanges = null
+  const watchForChanges = () => {
+    if (stopWatchingChanges) return
+    stopWatchingChanges = api.subscribeToChanges((change) => {
+      if (!api.changeAffects(change, filters)) return
+      const params = buildRequestParams()
+      fetchAdvancedAnalyticsData(params)
+      fetchLegacyDashboardData(params)
+    })
+  }
+  onUnmounted(() => {
+    if (stopWatchingChanges) stopWatchingChanges()
+  })
+
   // Refresh specific section
   const refreshSection = async (section) => {
     try {
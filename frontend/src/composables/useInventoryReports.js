@@ -1,4 +1,4 @@
-import { ref, reactive, computed } from 'vue'
+import { ref, reactive, computed, onUnmounted } from 'vue'
 import { api } from '../services/api'
 
 export function useInventoryReports() {
@@ -78,7 +78,7 @@ export function useInventoryReports() {
     
     loadingStates.value.locations = true
     try {
-      const response = await api.getLocations()
+      const response = await api.syncReferenceData('/locations/')
       locations.value = response.data.results || response.data || []
     } catch (err) {
       console.error('Error loading locations:', err)
@@ -94,7 +94,7 @@ export function useInventoryReports() {
     
     loadingStates.value.products = true
     try {
-      const response = await api.getProducts()
+      const response = await api.syncReferenceData('/products/')
       products.value = response.data.results || response.data || []
     } catch (err) {
       console.error('Error loading products:', err)
@@ -152,12 +152,33 @@ export function useInventoryReports() {
     }
   }
 
+  // Fetch the three report endpoints in one batch/ round trip
+  const prefetchReports = () => api.prefetchBatch([
+    { url: '/inventory/current-stock/', params: buildCurrentStockParams() },
+    { url: '/inventory/restock-summary/', params: buildRestockSummaryParams() },
+    { url: '/inventory/stock-coverage/', params: buildStockCoverageParams() }
+  ])
+
+  // Reload the reports when a saved visit, purchase or price touches the current filters
+  let stopWatchingChanges = null
+  const watchForChanges = () => {
+    if (stopWatchingChanges) return
+    stopWatchingChanges = api.subscribeToChanges((change) => {
+      if (api.changeAffects(change, filters)) applyFilters()
+    })
+  }
+  onUnmounted(() => {
+    if (stopWatchingChanges) stopWatchingChanges()
+  })
+
   // Initialize data with optimized loading
   const initialize = async () => {
     loading.value = true
     error.value = ''
     
     try {
+      await prefetchReports()
+
       // First load reference data (locations and products) in parallel
       const referenceDataCalls = [
         loadLocations(),
@@ -174,6 +195,7 @@ export function useInventoryReports() {
       ]
       
       const results = await Promise.allSettled(reportCalls)
+      watchForChanges()
       
       // Check if any critical reports failed
       const failedReports = results.filter(result => result.status === 'rejected')
@@ -197,6 +219,8 @@ export function useInventoryReports() {
     error.value = ''
     
     try {
+      await prefetchReports()
+
       // Load all reports with new filters in parallel
       const reportCalls = [
         loadCurrentStock(),
@@ -27,13 +27,13 @@ export function useMachineProducts() {
     try {
       // Use the dedicated endpoint to get all products without pagination
       // This ensures all products are available for machine configuration
-      const response = await api.getAllProducts()
+      const response = await api.getAllProducts(false, { fields: 'id,name' })
       allProducts.value = response.data
     } catch (err) {
       console.error('Error fetching products with getAllProducts, falling back to paginated method:', err)
       try {
         // Fallback: fetch all products by setting a very large page size
-        const response = await api.getProducts({ page_size: 1000 })
+        const response = await api.getProducts({ page_size: 1000, fields: 'id,name' })
         allProducts.value = response.data.results || response.data
       } catch (fallbackErr) {
         console.error('Fallback method also failed:', fallbackErr)
@@ -112,41 +112,20 @@ export function useMachines() {
     error.value = null
     
     try {
-      // Fetch machines for this location
-      const machinesResponse = await api.getMachines({ location: locationId })
-      // Handle paginated response - extract results array
-      const machines = machinesResponse.data.results || machinesResponse.data
-      
-      // For each machine, fetch its products
-      const machinesWithProducts = await Promise.all(
-        machines.map(async (machine) => {
-          try {
-            const productsResponse = await api.getMachineItems({ machine: machine.id })
-            // Handle paginated response - extract results array
-            const productsData = productsResponse.data.results || productsResponse.data
-            const products = productsData.map(item => ({
-              id: item.product,
-              name: item.product_name,
-              slot: item.slot,
-              current_stock: item.current_stock || 0,
-              stock_before: '',
-              discarded: '',
-              restocked: ''
-            }))
-            
-            return {
-              ...machine,
-              products
-            }
-          } catch (err) {
-            console.error(`Error fetching products for machine ${machine.id}:`, err)
-            return {
-              ...machine,
-              products: []
-            }
-          }
-        })
-      )
+      // One request returns every machine with its slots
+      const response = await api.getLocationRestockSheet(locationId)
+      const machinesWithProducts = response.data.machines.map(machine => ({
+        ...machine,
+        products: machine.products.map(item => ({
+          id: item.id,
+          name: item.name,
+          slot: item.slot,
+          current_stock: item.current_stock || 0,
+          stock_before: '',
+          discarded: '',
+          restocked: ''
+        }))
+      }))
       
       locationMachines.value = machinesWithProducts
     } catch (err) {
@@ -2,6 +2,9 @@ import { ref, computed } from 'vue'
 import { api } from '../services/api'
 import { getCurrentDateLocal } from '../utils/dateUtils'
 
+// Product fields the purchase form reads (dropdown label, stock and cost hints)
+const PRODUCT_FIELDS = 'id,name,unit_type,inventory_quantity,latest_cost'
+
 export function usePurchases() {
   // State
   const purchases = ref([])
@@ -79,13 +82,13 @@ export function usePurchases() {
     try {
       // Use the dedicated endpoint to get all products without pagination
       // This ensures the purchase form dropdown shows all available products
-      const response = await api.getAllProducts()
+      const response = await api.getAllProducts(false, { fields: PRODUCT_FIELDS })
       products.value = response.data
     } catch (err) {
       console.error('Error fetching products with getAllProducts, falling back to paginated method:', err)
       try {
         // Fallback: fetch all products by setting a very large page size
-        const response = await api.getProducts({ page_size: 1000 })
+        const response = await api.getProducts({ page_size: 1000, fields: PRODUCT_FIELDS })
         products.value = response.data.results || response.data
       } catch (fallbackErr) {
         console.error('Fallback method also failed:', fallbackErr)
@@ -61,34 +61,19 @@ export function useRestocks() {
 
   const getVisitDetails = async (visitId) => {
     try {
-      // Fetch the machine restocks for this visit
-      const machineRestocksResponse = await api.getRestocks({ visit: visitId })
-      // Handle paginated response - extract results array
-      const machineRestocks = machineRestocksResponse.data.results || machineRestocksResponse.data
+      // One request returns the machine restocks with their entries and slots
+      const response = await api.getVisitFull(visitId)
       
-      // Fetch entries for each machine restock
       let allEntries = []
       
-      for (const machineRestock of machineRestocks) {
-        const entriesResponse = await api.getRestockEntries({ visit_machine_restock: machineRestock.id })
-        // Handle paginated response - extract results array
-        const entriesData = entriesResponse.data.results || entriesResponse.data
-        
-        // Get machine item info to get the slot number for each product
-        const machineItemsResponse = await api.getMachineItems({ machine: machineRestock.machine })
-        // Handle paginated response - extract results array
-        const machineItems = machineItemsResponse.data.results || machineItemsResponse.data
-        
-        // Add slot info to each entry
-        const entriesWithSlot = entriesData.map(entry => {
-          const matchingItem = machineItems.find(item => item.product === entry.product)
-          return {
-            ...entry,
-            slot: matchingItem ? matchingItem.slot : null
-          }
-        })
-        
-        allEntries.push(...entriesWithSlot)
+      for (const machineRestock of response.data.machine_restocks) {
+        allEntries.push(...machineRestock.entries.map(entry => ({
+          ...entry,
+          visit_machine_restock: machineRestock.id,
+          machine_name: machineRestock.machine_name,
+          machine_type: machineRestock.machine_type,
+          machine_model: machineRestock.machine_model
+        })))
       }
       
       // Sort entries by slot within each machine
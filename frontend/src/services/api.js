@@ -155,15 +155,206 @@ const batchApiCalls = async (calls) => {
   }
 };
 
+// Load several GET endpoints in one round trip through the backend's batch/ endpoint.
+// Each request is { url, params }; successful bodies land in the same cache entries
+// cachedGet uses, so the regular getters that follow are served from the cache.
+const prefetchBatch = async (requests, skipCache = false) => {
+  const pending = requests
+    .map(({ url, params = {} }) => ({ url, params, cacheKey: getCacheKey(url, params) }))
+    .filter(({ cacheKey }) => skipCache || !getFromCache(cacheKey));
+  if (pending.length === 0) return;
+
+  try {
+    const response = await apiClient.post('/batch/', {
+      requests: pending.map(({ url, params }, index) => {
+        // axios drops empty params; do the same for the batched query string
+        const query = Object.fromEntries(
+          Object.entries(params).filter(([, value]) => value !== undefined && value !== null && value !== '')
+        );
+        return { id: String(index), url: getCacheKey(url, query) };
+      })
+    });
+    pending.forEach(({ cacheKey }, index) => {
+      const result = response.data.responses[String(index)];
+      if (result && result.status >= 200 && result.status < 300) {
+        setCache(cacheKey, result.body);
+      }
+    });
+  } catch (error) {
+    // Individual getters will fetch anything that was not prefetched
+    console.warn('Batch prefetch failed:', error?.response?.status, error.message);
+  }
+};
+
+// Local replicas of reference data, kept current with ?updated_since= delta fetches.
+// The first sync starts from the epoch and loads everything; later syncs only
+// transfer rows changed since the last server_time, plus deletion tombstones.
+const SYNC_EPOCH = '1970-01-01T00:00:00Z';
+const replicas = new Map();
+
+const fetchReplicaChanges = async (url, replica) => {
+  let nextUrl = url;
+  let params = { updated_since: replica.serverTime || SYNC_EPOCH, page_size: 1000 };
+  let serverTime = null;
+  const deleted = [];
+
+  while (nextUrl) {
+    const response = await apiClient.get(nextUrl, { params });
+    if (replica.serverTime && !('deleted' in response.data)) {
+      // The server does not track deletions for this endpoint: only a full reload is exact
+      replica.rows = new Map();
+      replica.serverTime = null;
+      return fetchReplicaChanges(url, replica);
+    }
+    const { results = [], next = null } = response.data;
+    results.forEach(row => replica.rows.set(row.id, row));
+    deleted.push(...(response.data.deleted || []));
+    // The first page's timestamp is the earliest, so nothing between pages is missed
+    serverTime = serverTime || response.data.server_time;
+    // next links already carry the query string
+    nextUrl = next;
+    params = undefined;
+  }
+
+  deleted.forEach(id => replica.rows.delete(id));
+  replica.serverTime = serverTime;
+};
+
+const syncReferenceData = async (url) => {
+  if (!replicas.has(url)) {
+    replicas.set(url, { rows: new Map(), serverTime: null, pending: null });
+  }
+  const replica = replicas.get(url);
+
+  if (!replica.pending) {
+    replica.pending = fetchReplicaChanges(url, replica).finally(() => {
+      replica.pending = null;
+    });
+  }
+  await replica.pending;
+  return { data: { results: Array.from(replica.rows.values()) } };
+};
+
+// Cached endpoints that each kind of change notification makes stale
+const CHANGE_INVALIDATIONS = {
+  visit: ['/dashboard', '/analytics', '/inventory', '/visits', '/restock', '/machine-items', '/products'],
+  purchase: ['/dashboard', '/analytics', '/inventory', '/purchases', '/products', '/product-costs'],
+  price: ['/dashboard', '/analytics', '/inventory', '/machine-items']
+};
+
+// True when a change could affect data filtered to these location/machine/product ids.
+// An empty scope list on the change means it was not narrowed down.
+const changeAffects = (change, { location, machine, product } = {}) => {
+  const inScope = (ids, id) => !id || !ids || ids.length === 0 || ids.includes(Number(id));
+  return inScope(change.locations, location) && inScope(change.machines, machine) && inScope(change.products, product);
+};
+
+// Minimal text/event-stream reader: calls onEvent(type, data) for each event in the body
+const readServerSentEvents = async (body, onEvent) => {
+  const reader = body.pipeThrough(new TextDecoderStream()).getReader();
+  let buffer = '';
+  for (;;) {
+    const { value, done } = await reader.read();
+    if (done) return;
+    buffer += value;
+    let end;
+    while ((end = buffer.indexOf('\n\n')) >= 0) {
+      const block = buffer.slice(0, end);
+      buffer = buffer.slice(end + 2);
+      let type = 'message';
+      const data = [];
+      block.split('\n').forEach(line => {
+        if (line.startsWith('event:')) type = line.slice(6).trim();
+        else if (line.startsWith('data:')) data.push(line.slice(5).trimStart());
+      });
+      if (data.length) onEvent(type, data.join('\n'));
+    }
+  }
+};
+
+// One change stream per tab, shared by every subscriber
+const changeListeners = new Set();
+let changeStream = null;
+
+const openChangeStream = () => {
+  const stream = { version: null, controller: null, retryTimer: null, closed: false };
+
+  const handleEvent = (type, data) => {
+    if (type === 'version') {
+      if (stream.version === null) stream.version = JSON.parse(data).version;
+    } else if (type === 'change') {
+      const change = JSON.parse(data);
+      stream.version = change.version;
+      (CHANGE_INVALIDATIONS[change.kind] || ['']).forEach(invalidateCachePattern);
+      changeListeners.forEach(listener => listener(change));
+    }
+  };
+
+  const connect = async () => {
+    const authStore = useAuthStore();
+    if (stream.closed || !authStore.token) return;
+
+    // fetch() rather than EventSource so the token goes in a header, not the URL (and access logs)
+    const query = stream.version !== null ? `?version=${stream.version}` : '';
+    let retryAfter = 3000;
+    stream.controller = new AbortController();
+    try {
+      const response = await fetch(`${API_URL}/changes/stream/${query}`, {
+        headers: { Accept: 'text/event-stream', Authorization: `Bearer ${authStore.token}` },
+        signal: stream.controller.signal
+      });
+      if (response.ok) {
+        await readServerSentEvents(response.body, handleEvent);
+      } else if (response.status === 503) {
+        // Every stream slot of that server process is taken
+        retryAfter = 1000 * Number(response.headers.get('Retry-After') || 30);
+      }
+    } catch (error) {
+      if (error.name === 'AbortError') return;
+    }
+    // The server ends each stream after a minute; reconnect with the current token and version
+    if (!stream.closed) stream.retryTimer = setTimeout(connect, retryAfter);
+  };
+
+  connect();
+  stream.close = () => {
+    stream.closed = true;
+    clearTimeout(stream.retryTimer);
+    if (stream.controller) stream.controller.abort();
+  };
+  return stream;
+};
+
+// Subscribe to the backend's server-sent change notifications. Stale cache entries
+// are dropped before onChange runs, so handlers can simply refetch what they show.
+// Returns a function that unsubscribes; the stream closes with its last subscriber.
+const subscribeToChanges = (onChange) => {
+  changeListeners.add(onChange);
+  if (!changeStream) changeStream = openChangeStream();
+
+  return () => {
+    changeListeners.delete(onChange);
+    if (changeListeners.size === 0 && changeStream) {
+      changeStream.close();
+      changeStream = null;
+    }
+  };
+};
+
 export const api = {
   // Expose the apiClient for direct access when needed
   apiClient,
   
   // Utility methods
   batchApiCalls,
+  prefetchBatch,
+  syncReferenceData,
+  subscribeToChanges,
+  changeAffects,
   invalidateCache: invalidateCachePattern,
   clearCache: () => {
     cache.clear();
+    replicas.clear();
     console.log('Cache cleared');
   },
 
@@ -174,6 +365,10 @@ export const api = {
   getLocation(id) {
     return cachedGet(`/locations/${id}/`)
   },
+  getLocationRestockSheet(id) {
+    // Not cached here: stock changes between visits, the browser revalidates with the ETag
+    return apiClient.get(`/locations/${id}/restock-sheet/`)
+  },
   createLocation(data) {
     invalidateCachePattern('/locations');
     return apiClient.post('/locations/', data)
@@ -214,10 +409,11 @@ export const api = {
   getProducts(params = {}, skipCache = false) {
     return cachedGet('/products/', params, skipCache)
   },
-  getAllProducts(skipCache = false) {
+  getAllProducts(skipCache = false, params = {}) {
     // Use the custom 'all' endpoint to get all products without pagination
     // This is more efficient than setting a large page_size
-    return cachedGet('/products/all/', {}, skipCache)
+    // Pass e.g. { fields: 'id,name' } so the backend skips the cost lookups
+    return cachedGet('/products/all/', params, skipCache)
   },
   getProduct(id) {
     return cachedGet(`/products/${id}/`)
@@ -254,6 +450,11 @@ export const api = {
     invalidateCachePattern('/machine-items');
     return apiClient.delete(`/machine-items/${id}/`)
   },
+  bulkUpdateMachineItems(data, dryRun = false) {
+    // data: { changes: [{ machine, product, price, slot }], rules: [{ product, price, route, machine_type }] }
+    if (!dryRun) invalidateCachePattern('/machine-items');
+    return apiClient.post('/machine-items/bulk-update/', data, { params: dryRun ? { dry_run: true } : {} })
+  },
   
   // Supplier endpoints
   getSuppliers(params = {}, skipCache = false) {
@@ -312,6 +513,9 @@ export const api = {
   getVisit(id) {
     return cachedGet(`/visits/${id}/`)
   },
+  getVisitFull(id) {
+    return apiClient.get(`/visits/${id}/full/`)
+  },
   createVisit(data) {
     invalidateCachePattern('/visits');
     invalidateCachePattern('/analytics');
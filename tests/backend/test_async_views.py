@@ -0,0 +1,115 @@
+import os
+import sys
+import django
+import asyncio
+
+# Add the backend directory to the Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'backend'))
+
+# Set up Django
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'vendingapp.settings')
+django.setup()
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.test import AsyncClient, TransactionTestCase, override_settings
+from django.urls import path
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+from asgiref.sync import async_to_sync, sync_to_async
+from asgiref.testing import ApplicationCommunicator
+from django.core.handlers.asgi import ASGIHandler
+
+from core.async_views import async_view, get_executor, serving_view
+from core.models import Location, Product
+from core.views.analytics_views import StockLevelView
+
+
+async def async_get(url, **kwargs):
+    return await AsyncClient().get(url, **kwargs)
+
+
+urlpatterns = [
+    path('api/analytics/stock-levels/', async_view(StockLevelView), name='stock-levels'),
+]
+
+
+# Pool threads use their own database connections, so the data has to be committed
+@override_settings(ROOT_URLCONF=__name__)
+class AsyncViewTest(TransactionTestCase):
+    """Test analytics views served as async views on the bounded executor"""
+
+    url = '/api/analytics/stock-levels/'
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='async', password='testpass123')
+        Location.objects.create(name='Office', address='1 Main St', route='A')
+        Product.objects.create(name='Coke', inventory_quantity=100)
+
+    def test_wrapper_is_a_coroutine_view(self):
+        view = async_view(StockLevelView)
+        self.assertTrue(asyncio.iscoroutinefunction(view))
+        self.assertIs(view.cls, StockLevelView)
+        self.assertTrue(callable(view.sync_view))
+
+    def test_serving_view_follows_setting(self):
+        with override_settings(ASYNC_VIEWS=False):
+            self.assertFalse(asyncio.iscoroutinefunction(serving_view(StockLevelView)))
+        with override_settings(ASYNC_VIEWS=True):
+            self.assertTrue(asyncio.iscoroutinefunction(serving_view(StockLevelView)))
+
+    def test_executor_is_bounded_by_setting(self):
+        self.assertEqual(get_executor('analytics')._max_workers, settings.ANALYTICS_EXECUTOR_WORKERS)
+        self.assertIs(get_executor('analytics'), get_executor('analytics'))
+
+    def test_async_response_matches_sync_view(self):
+        headers = {'Authorization': f'Bearer {AccessToken.for_user(self.user)}'}
+        response = async_to_sync(async_get)(self.url, headers=headers)
+        self.assertEqual(response.status_code, 200, response.content)
+
+        client = APIClient()
+        client.force_authenticate(user=self.user)
+        with override_settings(ROOT_URLCONF='vendingapp.urls'):
+            expected = client.get(self.url)
+        self.assertEqual(response.json(), expected.json())
+
+    def test_async_view_requires_authentication(self):
+        response = async_to_sync(async_get)(self.url)
+        self.assertEqual(response.status_code, 401)
+
+
+@override_settings(ROOT_URLCONF=__name__)
+class AsgiMiddlewareTest(TransactionTestCase):
+    """Test that requests go through the full middleware stack on the event loop"""
+
+    @override_settings(DEBUG=True)
+    def test_no_middleware_is_adapted(self):
+        # With DEBUG, Django logs each sync-only middleware it wraps for the async handler
+        with self.assertNoLogs('django.request', 'DEBUG'):
+            ASGIHandler()
+
+    async def get(self, path, headers=()):
+        communicator = ApplicationCommunicator(ASGIHandler(), {
+            'type': 'http', 'asgi': {'version': '3.0'}, 'http_version': '1.1', 'method': 'GET', 'scheme': 'http',
+            'path': path, 'query_string': b'', 'headers': [(b'host', b'testserver'), *headers],
+        })
+        await communicator.send_input({'type': 'http.request', 'body': b'', 'more_body': False})
+        start = await communicator.receive_output(timeout=5)
+        await communicator.wait(timeout=5)
+        return start['status'], dict(start['headers'])
+
+    async def test_request_through_asgi_handler(self):
+        user = await sync_to_async(User.objects.create_user)(username='staff', password='testpass123', is_staff=True)
+        await sync_to_async(Product.objects.create)(name='Coke', inventory_quantity=100)
+        status, headers = await self.get(
+            AsyncViewTest.url, [(b'authorization', f'Bearer {AccessToken.for_user(user)}'.encode())]
+        )
+        self.assertEqual(status, 200)
+        # Timed by the middleware although the view ran in the analytics pool
+        self.assertRegex(headers[b'Server-Timing'].decode(), r'db;dur=[\d.]+;desc="[1-9]\d* queries"')
+
+    async def test_anonymous_request_outside_drf(self):
+        # The session user is looked up without blocking the event loop
+        status, headers = await self.get('/no-such-page/')
+        self.assertEqual(status, 404)
+        self.assertNotIn(b'Server-Timing', headers)
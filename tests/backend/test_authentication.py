@@ -0,0 +1,70 @@
+import os
+import sys
+import django
+
+# Add the backend directory to the Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'backend'))
+
+# Set up Django
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'vendingapp.settings')
+django.setup()
+
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APITestCase
+from rest_framework import status
+from rest_framework_simplejwt.tokens import AccessToken
+
+from core.authentication import user_cache
+
+
+class CachedJWTAuthenticationTest(APITestCase):
+    """Test that JWT requests reuse a cached user without weakening revocation"""
+
+    def setUp(self):
+        user_cache.clear()
+        self.user = User.objects.create_user(username='driver', password='testpass123')
+        response = self.client.post('/api/token/', {'username': 'driver', 'password': 'testpass123'}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.access = response.data['access']
+
+    def get_profile(self, token=None):
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {token or self.access}')
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get('/api/profile/')
+        user_queries = [q for q in context.captured_queries if 'FROM "auth_user"' in q['sql']]
+        return response, len(user_queries)
+
+    def test_user_is_loaded_once(self):
+        response, first = self.get_profile()
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['username'], 'driver')
+        self.assertEqual(first, 1)
+
+        response, second = self.get_profile()
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(second, 0)
+
+    def test_password_change_revokes_cached_token(self):
+        self.get_profile()
+        self.user.set_password('newpass456')
+        self.user.save()
+
+        response, _ = self.get_profile()
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_deactivation_is_seen_immediately(self):
+        self.get_profile()
+        self.user.is_active = False
+        self.user.save()
+
+        response, _ = self.get_profile()
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_token_without_version_claim_is_rejected(self):
+        legacy = AccessToken()
+        legacy['user_id'] = self.user.id
+
+        response, _ = self.get_profile(str(legacy))
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
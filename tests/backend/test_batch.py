@@ -0,0 +1,142 @@
+import os
+import sys
+import django
+from decimal import Decimal
+from datetime import timedelta
+
+# Add the backend directory to the Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'backend'))
+
+# Set up Django
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'vendingapp.settings')
+django.setup()
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APITestCase
+from rest_framework import status
+
+from core.models import Location, Machine, Product, MachineItemPrice, ProductCost
+from core.views.analytics_views import OptimizedAnalyticsViewMixin
+from core.views.batch_views import BatchSharedState
+
+
+class BatchViewTest(APITestCase):
+    """Test the batch/ endpoint"""
+
+    url = '/api/batch/'
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='batcher', password='testpass123')
+        self.client.force_authenticate(user=self.user)
+        cache.clear()
+
+        self.location = Location.objects.create(name='Office', address='1 Main St', route='A')
+        self.machine = Machine.objects.create(name='Combo', location=self.location, machine_type='Combo')
+        self.product = Product.objects.create(name='Coke')
+        MachineItemPrice.objects.create(machine=self.machine, product=self.product, price=Decimal('1.50'), slot=1)
+        ProductCost.objects.create(
+            product=self.product, date=timezone.now() - timedelta(days=3),
+            quantity=10, unit_cost=Decimal('0.50'), total_cost=Decimal('5.00')
+        )
+
+    def test_results_are_keyed_by_id(self):
+        response = self.client.post(self.url, {'requests': [
+            {'id': 'locations', 'url': '/locations/'},
+            {'id': 'machines', 'url': f'/machines/?location={self.location.id}'},
+            {'id': 'dashboard', 'url': '/dashboard/?days=30'},
+        ]}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK, response.data)
+
+        responses = response.data['responses']
+        self.assertEqual(set(responses), {'locations', 'machines', 'dashboard'})
+        self.assertEqual(responses['locations']['status'], 200)
+        self.assertEqual(responses['locations']['body']['results'][0]['name'], 'Office')
+        self.assertEqual(responses['machines']['body']['results'][0]['id'], self.machine.id)
+        self.assertEqual(responses['dashboard']['status'], 200)
+
+    def test_sub_response_matches_direct_request(self):
+        direct = self.client.get(f'/api/locations/{self.location.id}/')
+        response = self.client.post(self.url, {'requests': [
+            {'id': 'location', 'url': f'/locations/{self.location.id}/'},
+        ]}, format='json')
+        self.assertEqual(response.data['responses']['location']['body'], direct.data)
+
+    def test_unknown_url_is_a_per_item_404(self):
+        response = self.client.post(self.url, {'requests': [
+            {'id': 'missing', 'url': '/no-such-endpoint/'},
+            {'id': 'gone', 'url': '/locations/99999/'},
+            {'id': 'ok', 'url': '/products/'},
+        ]}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['responses']['missing']['status'], 404)
+        self.assertEqual(response.data['responses']['gone']['status'], 404)
+        self.assertEqual(response.data['responses']['ok']['status'], 200)
+
+    def test_only_get_requests_are_batched(self):
+        response = self.client.post(self.url, {'requests': [
+            {'id': 'create', 'method': 'POST', 'url': '/locations/'},
+        ]}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_nested_batches_are_rejected(self):
+        response = self.client.post(self.url, {'requests': [
+            {'id': 'nested', 'url': '/batch/'},
+        ]}, format='json')
+        self.assertEqual(response.data['responses']['nested']['status'], 400)
+
+    def test_batch_size_is_limited(self):
+        requests = [{'id': str(i), 'url': '/locations/'} for i in range(21)]
+        response = self.client.post(self.url, {'requests': requests}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+        response = self.client.post(self.url, {'requests': []}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_requires_authentication(self):
+        self.client.force_authenticate(user=None)
+        response = self.client.post(self.url, {'requests': [{'id': 'a', 'url': '/locations/'}]}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_analytics_share_one_cost_history_load(self):
+        analytics = [
+            {'id': 'dashboard', 'url': '/dashboard/?days=30'},
+            {'id': 'revenue', 'url': '/analytics/revenue-profit/?days=30'},
+        ]
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.post(self.url, {'requests': analytics}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        cost_queries = [q for q in context.captured_queries if 'FROM "core_productcost"' in q['sql']]
+        self.assertLessEqual(len(cost_queries), 1)
+
+    def test_cost_history_is_limited_to_the_products_and_dates_in_scope(self):
+        other = Product.objects.create(name='Chips')
+        ProductCost.objects.create(
+            product=other, date=timezone.now() - timedelta(days=3),
+            quantity=10, unit_cost=Decimal('0.25'), total_cost=Decimal('2.50')
+        )
+        ProductCost.objects.create(
+            product=self.product, date=timezone.now() + timedelta(days=1),
+            quantity=10, unit_cost=Decimal('0.75'), total_cost=Decimal('7.50')
+        )
+        history = OptimizedAnalyticsViewMixin().get_cost_history({self.product.id}, timezone.now())
+        self.assertEqual(list(history), [self.product.id])
+        self.assertEqual([cost for date, cost in history[self.product.id]], [0.5])
+
+
+class BatchSharedStateTest(APITestCase):
+
+    def test_value_is_computed_once_per_key(self):
+        shared = BatchSharedState()
+        calls = []
+
+        def compute():
+            calls.append(1)
+            return len(calls)
+
+        self.assertEqual(shared.get_or_compute('a', compute), 1)
+        self.assertEqual(shared.get_or_compute('a', compute), 1)
+        self.assertEqual(shared.get_or_compute('b', compute), 2)
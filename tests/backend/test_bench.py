@@ -0,0 +1,95 @@
+import os
+import sys
+import django
+import json
+import tempfile
+from io import StringIO
+from unittest import mock
+
+# Add the backend directory to the Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'backend'))
+
+# Set up Django
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'vendingapp.settings')
+django.setup()
+
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import SimpleTestCase, TestCase
+
+from core.management.commands.bench import compare
+from core.models import Location, Visit
+
+
+TINY = {'locations': 1, 'machines_per_location': 1, 'products': 3, 'slots': 2, 'weeks': 3}
+
+
+def stats(p50=10.0, queries=3, peak=100.0):
+    return {'p50_ms': p50, 'p95_ms': p50, 'max_ms': p50, 'queries': queries, 'peak_kb': peak}
+
+
+class CompareTest(SimpleTestCase):
+    """Test regression detection against a baseline"""
+
+    def test_within_threshold(self):
+        baseline = {'small': {'dashboard': {'cold': stats()}}}
+        results = {'small': {'dashboard': {'cold': stats(p50=12.0, peak=120.0)}}}
+        self.assertEqual(compare(results, baseline, 0.25), [])
+
+    def test_slower_bigger_or_more_queries(self):
+        baseline = {'small': {'dashboard': {'cold': stats()}}}
+        results = {'small': {'dashboard': {'cold': stats(p50=20.0, queries=4, peak=200.0)}}}
+        regressions = compare(results, baseline, 0.25)
+        self.assertEqual(len(regressions), 3)
+        self.assertTrue(regressions[0].startswith('small/dashboard/cold: 4 queries'))
+
+    def test_cases_missing_from_baseline_are_skipped(self):
+        results = {'large': {'dashboard': {'cold': stats()}}}
+        self.assertEqual(compare(results, {}, 0.25), [])
+
+
+@mock.patch.dict('core.management.commands.bench.SIZES', {'tiny': TINY})
+class BenchCommandTest(TestCase):
+    """Test the bench command end to end on a tiny dataset"""
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.baseline = os.path.join(directory.name, 'baseline.json')
+
+    def bench(self, *args):
+        out = StringIO()
+        call_command(
+            'bench', '--sizes', 'tiny', '--repeat', '2', '--only', 'current-stock,products,bulk-save',
+            '--baseline', self.baseline, *args, stdout=out
+        )
+        return out.getvalue()
+
+    def test_baseline_round_trip(self):
+        self.assertIn('Baseline written', self.bench('--update-baseline'))
+        with open(self.baseline) as f:
+            results = json.load(f)['results']['tiny']
+        self.assertEqual(set(results), {'current-stock', 'products', 'bulk-save'})
+        self.assertEqual(set(results['current-stock']), {'cold', 'warm'})
+        self.assertEqual(results['current-stock']['warm']['queries'], 0)
+        # The generated fleet is rolled back
+        self.assertFalse(Location.objects.exists())
+        self.assertFalse(Visit.objects.exists())
+
+        # Latency on a tiny dataset is too noisy to compare here; query counts are not
+        self.assertIn('No regressions', self.bench('--threshold', '1000'))
+
+    def test_extra_queries_fail(self):
+        self.bench('--update-baseline')
+        with open(self.baseline) as f:
+            report = json.load(f)
+        report['results']['tiny']['products']['cold']['queries'] -= 1
+        with open(self.baseline, 'w') as f:
+            json.dump(report, f)
+        with self.assertRaisesMessage(CommandError, '1 regression(s)'):
+            self.bench('--threshold', '1000')
+
+    def test_refuses_a_database_with_data(self):
+        Location.objects.create(name='Office', address='1 Main St')
+        with self.assertRaises(CommandError):
+            self.bench()
@@ -0,0 +1,185 @@
+import os
+import sys
+import tempfile
+import django
+from decimal import Decimal
+from io import StringIO
+
+# Add the backend directory to the Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'backend'))
+
+# Set up Django
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'vendingapp.settings')
+django.setup()
+
+from django.contrib.auth.models import User
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import TestCase
+from rest_framework.test import APITestCase
+from rest_framework import status
+
+from core.models import Product, Supplier, WholesalePurchase, ProductCost
+from core.serializers import WholesalePurchaseImportSerializer
+
+
+class WholesalePurchaseImportSerializerTest(TestCase):
+    """Test the bulk purchase import serializer"""
+
+    def setUp(self):
+        self.coke = Product.objects.create(name="Coke", product_type="Soda", inventory_quantity=10)
+        self.chips = Product.objects.create(name="Chips", product_type="Snack", inventory_quantity=0)
+        self.supplier = Supplier.objects.create(name="Import Test Supplier")
+
+    def test_import_creates_purchases_costs_and_inventory(self):
+        """Rows are bulk created and inventory is incremented per product"""
+        serializer = WholesalePurchaseImportSerializer(data={'purchases': [
+            {'product': self.coke.id, 'supplier': self.supplier.id, 'quantity': 24, 'total_cost': '12.00'},
+            {'product': self.coke.id, 'quantity': 12, 'cost_per_unit': '0.75'},
+            {'product': self.chips.id, 'quantity': 30, 'total_cost': '15.00'},
+        ]})
+        self.assertTrue(serializer.is_valid(), serializer.errors)
+        serializer.save()
+
+        self.assertEqual(serializer.data['created'], 3)
+        self.assertEqual(serializer.data['products_updated'], 2)
+        self.assertEqual(serializer.data['total_cost'], Decimal('36.00'))
+
+        self.coke.refresh_from_db()
+        self.chips.refresh_from_db()
+        self.assertEqual(self.coke.inventory_quantity, 46)
+        self.assertEqual(self.chips.inventory_quantity, 30)
+
+        self.assertEqual(WholesalePurchase.objects.filter(inventory_updated=True).count(), 3)
+        self.assertEqual(ProductCost.objects.count(), 3)
+        cost = ProductCost.objects.get(purchase__quantity=12)
+        self.assertEqual(cost.unit_cost, Decimal('0.75'))
+        self.assertEqual(cost.total_cost, Decimal('9.00'))
+
+    def test_import_query_count_is_constant(self):
+        """Import cost does not grow with the number of rows"""
+        rows = [{'product': self.coke.id, 'quantity': 1, 'total_cost': '0.50'} for _ in range(50)]
+        serializer = WholesalePurchaseImportSerializer(data={'purchases': rows})
+
+        with self.assertNumQueries(1):  # one product lookup, no supplier ids to check
+            self.assertTrue(serializer.is_valid(), serializer.errors)
+
+        # savepoint/transaction, purchases insert, costs insert, inventory update
+        with self.assertNumQueries(5):
+            serializer.save()
+
+    def test_row_level_errors(self):
+        """Invalid rows are reported by row number and nothing is saved"""
+        self.supplier.is_active = False
+        self.supplier.save()
+
+        serializer = WholesalePurchaseImportSerializer(data={'purchases': [
+            {'product': self.coke.id, 'quantity': 5, 'total_cost': '2.50'},
+            {'product': 99999, 'quantity': 5, 'total_cost': '2.50'},
+            {'product': self.coke.id, 'supplier': self.supplier.id, 'quantity': 5, 'total_cost': '2.50'},
+        ]})
+        self.assertFalse(serializer.is_valid())
+
+        errors = {error['row']: error['errors'] for error in serializer.row_errors}
+        self.assertEqual(set(errors), {2, 3})
+        self.assertIn('product', errors[2])
+        self.assertIn('supplier', errors[3])
+        self.assertEqual(WholesalePurchase.objects.count(), 0)
+
+    def test_row_requires_a_cost(self):
+        """Each row needs total_cost or cost_per_unit"""
+        serializer = WholesalePurchaseImportSerializer(data={'purchases': [
+            {'product': self.coke.id, 'quantity': 5},
+        ]})
+        self.assertFalse(serializer.is_valid())
+        self.assertEqual(serializer.row_errors[0]['row'], 1)
+
+    def test_rows_from_csv(self):
+        """CSV rows with blank cells parse into valid rows"""
+        csv_text = (
+            "product,supplier,quantity,total_cost,cost_per_unit,purchased_at,notes\n"
+            f"{self.coke.id},{self.supplier.id},24,12.00,,2025-01-15T10:30:00Z,receipt 1\n"
+            f"{self.chips.id},,10,,1.25,,\n"
+        )
+        rows = WholesalePurchaseImportSerializer.rows_from_csv(csv_text)
+        serializer = WholesalePurchaseImportSerializer(data={'purchases': rows})
+        self.assertTrue(serializer.is_valid(), serializer.errors)
+        serializer.save()
+
+        self.chips.refresh_from_db()
+        self.assertEqual(self.chips.inventory_quantity, 10)
+        self.assertEqual(WholesalePurchase.objects.get(product=self.chips).total_cost, Decimal('12.50'))
+
+
+class BulkPurchaseImportAPITest(APITestCase):
+    """Test the bulk purchase import endpoint"""
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='importer', password='testpass123')
+        self.client.force_authenticate(user=self.user)
+        self.product = Product.objects.create(name="Sprite", product_type="Soda", inventory_quantity=0)
+
+    def test_json_import(self):
+        response = self.client.post('/api/purchases/bulk-import/', {'purchases': [
+            {'product': self.product.id, 'quantity': 24, 'total_cost': '12.00'},
+        ]}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data['created'], 1)
+
+        self.product.refresh_from_db()
+        self.assertEqual(self.product.inventory_quantity, 24)
+
+    def test_csv_upload(self):
+        upload = SimpleUploadedFile(
+            'receipt.csv',
+            f"product,quantity,total_cost\n{self.product.id},6,3.00\n".encode(),
+            content_type='text/csv'
+        )
+        response = self.client.post('/api/purchases/bulk-import/', {'file': upload}, format='multipart')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data['total_quantity'], 6)
+
+    def test_dry_run_saves_nothing(self):
+        response = self.client.post('/api/purchases/bulk-import/?dry_run=true', {'purchases': [
+            {'product': self.product.id, 'quantity': 24, 'total_cost': '12.00'},
+        ]}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(WholesalePurchase.objects.count(), 0)
+
+    def test_invalid_rows_return_400(self):
+        response = self.client.post('/api/purchases/bulk-import/', {'purchases': [
+            {'product': self.product.id, 'quantity': 0, 'total_cost': '1.00'},
+        ]}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data['errors'][0]['row'], 1)
+        self.assertIn('quantity', response.data['errors'][0]['errors'])
+
+
+class ImportPurchasesCommandTest(TestCase):
+    """Test the import_purchases management command"""
+
+    def setUp(self):
+        self.product = Product.objects.create(name="Doritos", product_type="Snack", inventory_quantity=0)
+
+    def _write_file(self, content, suffix):
+        handle = tempfile.NamedTemporaryFile('w', suffix=suffix, delete=False)
+        handle.write(content)
+        handle.close()
+        self.addCleanup(os.unlink, handle.name)
+        return handle.name
+
+    def test_csv_import(self):
+        path = self._write_file(f"product,quantity,total_cost\n{self.product.id},40,20.00\n", '.csv')
+        out = StringIO()
+        call_command('import_purchases', path, stdout=out)
+
+        self.product.refresh_from_db()
+        self.assertEqual(self.product.inventory_quantity, 40)
+        self.assertIn('Imported 1 purchases', out.getvalue())
+
+    def test_invalid_file_raises(self):
+        path = self._write_file('[{"product": 99999, "quantity": 1, "total_cost": "1.00"}]', '.json')
+        with self.assertRaises(CommandError):
+            call_command('import_purchases', path, stdout=StringIO())
+        self.assertEqual(WholesalePurchase.objects.count(), 0)
@@ -0,0 +1,156 @@
+import os
+import sys
+import django
+import json
+import threading
+import time
+from decimal import Decimal
+from unittest import mock
+
+# Add the backend directory to the Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'backend'))
+
+# Set up Django
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'vendingapp.settings')
+django.setup()
+
+from django.contrib.auth.models import User
+from django.db import transaction
+from asgiref.sync import sync_to_async
+from asgiref.testing import ApplicationCommunicator
+from django.core.handlers.asgi import ASGIHandler
+from django.test import TransactionTestCase, override_settings
+from rest_framework.test import APITestCase
+from rest_framework import status
+from rest_framework_simplejwt.tokens import AccessToken
+
+from core.models import Location, Machine, Product, MachineItemPrice, ChangeEvent
+from core.change_events import publish_change
+
+
+@override_settings(SSE_STREAM_SECONDS=0)
+class ChangeStreamTest(APITestCase):
+    """Test change notifications and the server-sent events stream"""
+
+    url = '/api/changes/stream/'
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='watcher', password='testpass123')
+        self.client.force_authenticate(user=self.user)
+
+        self.location = Location.objects.create(name='Office', address='1 Main St', route='A')
+        self.machine = Machine.objects.create(name='Combo', location=self.location, machine_type='Combo')
+        self.coke = Product.objects.create(name='Coke', inventory_quantity=100)
+        MachineItemPrice.objects.create(machine=self.machine, product=self.coke, price=Decimal('1.50'), slot=1)
+
+    def read_stream(self, response):
+        self.assertEqual(response['Content-Type'], 'text/event-stream')
+        messages = []
+        for block in b''.join(response.streaming_content).decode().split('\n\n'):
+            fields = dict(line.split(': ', 1) for line in block.splitlines() if ': ' in line and not line.startswith(':'))
+            if fields.get('event') == 'change':
+                messages.append(json.loads(fields['data']))
+        return messages
+
+    def test_bulk_visit_save_publishes_scope_on_commit(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post('/api/visits/bulk-save/', {
+                'visit': {'location': self.location.id, 'visit_date': '2026-01-15T10:30:00Z'},
+                'machine_restocks': [{
+                    'machine': self.machine.id,
+                    'restock_entries': [{'product': self.coke.id, 'stock_before': 2, 'discarded': 0, 'restocked': 6}],
+                }],
+            }, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED, response.data)
+
+        event = ChangeEvent.objects.get()
+        self.assertEqual(event.kind, 'visit')
+        self.assertEqual(event.locations, [self.location.id])
+        self.assertEqual(event.machines, [self.machine.id])
+        self.assertEqual(event.products, [self.coke.id])
+
+    def test_price_write_derives_location_from_machine(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post('/api/machine-items/bulk-update/', {'changes': [
+                {'machine': self.machine.id, 'product': self.coke.id, 'price': '1.75'},
+            ]}, format='json')
+        event = ChangeEvent.objects.get()
+        self.assertEqual(event.as_message()['locations'], [self.location.id])
+
+    def test_rolled_back_writes_publish_nothing(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            try:
+                with transaction.atomic():
+                    publish_change('purchase', products=[self.coke.id])
+                    raise RuntimeError
+            except RuntimeError:
+                pass
+        self.assertFalse(ChangeEvent.objects.exists())
+
+    def test_stream_resumes_after_last_event_id(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            publish_change('purchase', products=[self.coke.id])
+            publish_change('price', machines=[self.machine.id])
+        first, second = ChangeEvent.objects.order_by('id')
+
+        response = self.client.get(self.url, HTTP_LAST_EVENT_ID=str(first.id))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        messages = self.read_stream(response)
+        self.assertEqual([message['version'] for message in messages], [second.id])
+        self.assertEqual(messages[0]['kind'], 'price')
+
+    def test_new_clients_start_from_the_latest_version(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            publish_change('purchase', products=[self.coke.id])
+        self.assertEqual(self.read_stream(self.client.get(self.url)), [])
+
+    def test_token_goes_in_the_authorization_header(self):
+        self.client.force_authenticate(user=None)
+        token = AccessToken.for_user(self.user)
+        # Tokens in URLs end up in access logs
+        self.assertEqual(self.client.get(self.url, {'token': str(token)}).status_code, status.HTTP_401_UNAUTHORIZED)
+
+        response = self.client.get(self.url, HTTP_AUTHORIZATION=f'Bearer {token}')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.read_stream(response)
+
+    @mock.patch('core.views.change_stream_views._stream_slots', threading.BoundedSemaphore(1))
+    def test_wsgi_streams_per_process_are_capped(self):
+        first = self.client.get(self.url)
+        self.assertEqual(first.status_code, status.HTTP_200_OK)
+
+        second = self.client.get(self.url)
+        self.assertEqual(second.status_code, status.HTTP_503_SERVICE_UNAVAILABLE)
+        self.assertIn('Retry-After', second)
+
+        # Closing a stream frees its slot
+        first.close()
+        self.read_stream(self.client.get(self.url))
+
+
+@override_settings(ASYNC_VIEWS=True, SSE_STREAM_SECONDS=4, SSE_POLL_SECONDS=1)
+class AsgiChangeStreamTest(TransactionTestCase):
+    """Under ASGI the stream must reach the client while it is open, not when it ends"""
+
+    async def test_messages_arrive_before_the_stream_ends(self):
+        user = await sync_to_async(User.objects.create_user)(username='watcher', password='testpass123')
+        token = AccessToken.for_user(user)
+        communicator = ApplicationCommunicator(ASGIHandler(), {
+            'type': 'http', 'asgi': {'version': '3.0'}, 'http_version': '1.1', 'method': 'GET', 'scheme': 'http',
+            'path': '/api/changes/stream/', 'query_string': b'',
+            'headers': [(b'host', b'testserver'), (b'authorization', f'Bearer {token}'.encode())],
+        })
+        started = time.monotonic()
+        await communicator.send_input({'type': 'http.request', 'body': b'', 'more_body': False})
+
+        start = await communicator.receive_output(timeout=2)
+        self.assertEqual(start['status'], 200)
+        first = await communicator.receive_output(timeout=2)
+        self.assertIn(b'event: version', first['body'])
+        self.assertLess(time.monotonic() - started, 2)
+
+        await sync_to_async(publish_change)('purchase', products=[1])
+        change = await communicator.receive_output(timeout=2)
+        self.assertIn(b'event: change', change['body'])
+        self.assertLess(time.monotonic() - started, 3)
+        await communicator.wait(timeout=5)
@@ -0,0 +1,112 @@
+import os
+import sys
+import django
+from unittest import mock
+
+# Add the backend directory to the Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'backend'))
+
+# Set up Django
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'vendingapp.settings')
+django.setup()
+
+from django.contrib.auth.models import User
+from django.core.cache import caches
+from django.db import OperationalError, router
+from django.test import override_settings
+from django.urls import path
+from rest_framework.response import Response
+from rest_framework.test import APIClient, APITestCase
+from rest_framework.views import APIView
+
+from core import db_routing
+from core.db_routing import ReplicaReadViewMixin, replica_alias, replica_reads
+from core.models import Product
+
+
+class ReadAliasView(ReplicaReadViewMixin, APIView):
+    def get(self, request):
+        return Response({'alias': router.db_for_read(Product)})
+
+
+class WriteView(APIView):
+    def post(self, request):
+        return Response(status=201)
+
+
+urlpatterns = [
+    path('report/', ReadAliasView.as_view()),
+    path('write/', WriteView.as_view()),
+]
+
+
+# Pretend 'replica' is configured and reachable; the probe view never queries it
+@override_settings(ROOT_URLCONF=__name__)
+@mock.patch('core.db_routing.replica_configured', return_value=True)
+@mock.patch('core.db_routing.replica_alias', return_value='replica')
+class ReplicaRoutingTest(APITestCase):
+    """Test routing of analytics reads to the replica with read-your-writes stickiness"""
+
+    def setUp(self):
+        caches['replica_pins'].clear()
+        self.user = User.objects.create_user(username='driver', password='testpass123')
+        self.client.force_authenticate(user=self.user)
+
+    def read_alias(self, client=None):
+        return (client or self.client).get('/report/').data['alias']
+
+    def test_report_reads_use_replica(self, *mocks):
+        self.assertEqual(self.read_alias(), 'replica')
+        # Only inside the view
+        self.assertEqual(router.db_for_read(Product), 'default')
+        self.assertEqual(router.db_for_write(Product), 'default')
+
+    def test_writer_is_pinned_to_primary_by_cookie(self, *mocks):
+        response = self.client.post('/write/')
+        self.assertEqual(response.status_code, 201)
+        self.assertIn(db_routing.PIN_COOKIE, response.cookies)
+        self.assertEqual(self.read_alias(), 'default')
+
+    def test_writer_is_pinned_to_primary_on_other_clients(self, *mocks):
+        self.client.post('/write/')
+        other_client = APIClient()
+        other_client.force_authenticate(user=self.user)
+        self.assertEqual(self.read_alias(other_client), 'default')
+
+    def test_pin_is_shared_by_worker_processes(self, *mocks):
+        self.client.post('/write/')
+        # A new connection to the same cache, as another worker process would open
+        other_worker = caches.create_connection('replica_pins')
+        self.assertTrue(other_worker.get(db_routing._user_pin_key(self.user.pk)))
+
+    def test_other_users_still_read_from_replica(self, *mocks):
+        self.client.post('/write/')
+        other_client = APIClient()
+        other_client.force_authenticate(user=User.objects.create_user(username='analyst', password='testpass123'))
+        self.assertEqual(self.read_alias(other_client), 'replica')
+
+    def test_replica_reads_block(self, *mocks):
+        with replica_reads():
+            self.assertEqual(router.db_for_read(Product), 'replica')
+        self.assertEqual(router.db_for_read(Product), 'default')
+
+
+class ReplicaFallbackTest(APITestCase):
+    """Test falling back to the primary"""
+
+    def setUp(self):
+        db_routing._replica_down_until = 0.0
+
+    def test_no_replica_configured(self):
+        self.assertIsNone(replica_alias())
+
+    @override_settings(REPLICA_DATABASE_ALIAS='default')
+    def test_unreachable_replica_is_skipped(self):
+        with mock.patch('django.db.backends.base.base.BaseDatabaseWrapper.ensure_connection',
+                        side_effect=OperationalError) as ensure_connection:
+            self.assertIsNone(replica_alias())
+            self.assertIsNone(replica_alias())
+        # Not retried until REPLICA_RETRY_SECONDS have passed
+        self.assertEqual(ensure_connection.call_count, 1)
+        db_routing._replica_down_until = 0.0
+        self.assertEqual(replica_alias(), 'default')
@@ -0,0 +1,154 @@
+import os
+import sys
+import django
+from decimal import Decimal
+from datetime import timedelta
+
+# Add the backend directory to the Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'backend'))
+
+# Set up Django
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'vendingapp.settings')
+django.setup()
+
+from django.contrib.auth.models import User
+from django.test import override_settings
+from django.utils import timezone
+from rest_framework.test import APITestCase
+from rest_framework import status
+
+from core.models import (
+    Location, Machine, Product, MachineItemPrice, DeletionLog, Visit
+)
+
+
+class UpdatedSinceTest(APITestCase):
+    """Test ?updated_since= delta fetches and deletion tombstones"""
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='syncer', password='testpass123')
+        self.client.force_authenticate(user=self.user)
+
+        self.location = Location.objects.create(name='Office', address='1 Main St', route='A')
+        self.machine = Machine.objects.create(name='Combo', location=self.location, machine_type='Combo')
+        self.coke = Product.objects.create(name='Coke')
+        self.chips = Product.objects.create(name='Chips')
+        self.item = MachineItemPrice.objects.create(
+            machine=self.machine, product=self.coke, price=Decimal('1.50'), slot=1
+        )
+
+        # Age every row so the changes made by each test stand out
+        past = timezone.now() - timedelta(days=2)
+        for model in (Location, Machine, Product, MachineItemPrice):
+            model.objects.update(updated_at=past)
+        self.since = (timezone.now() - timedelta(days=1)).isoformat()
+
+    def sync(self, url, since=None):
+        response = self.client.get(url, {'updated_since': since or self.since})
+        self.assertEqual(response.status_code, status.HTTP_200_OK, response.data)
+        return response.data
+
+    def test_only_changed_rows_are_listed(self):
+        self.chips.name = 'Potato Chips'
+        self.chips.save()
+
+        data = self.sync('/api/products/')
+        self.assertEqual([row['id'] for row in data['results']], [self.chips.id])
+        self.assertEqual(data['deleted'], [])
+        self.assertIn('server_time', data)
+
+    def test_without_updated_since_everything_is_listed(self):
+        response = self.client.get('/api/products/')
+        self.assertEqual(len(response.data['results']), 2)
+        self.assertNotIn('deleted', response.data)
+
+    def test_deletions_are_reported_as_tombstones(self):
+        machine_id, item_id = self.machine.id, self.item.id
+        self.machine.delete()
+
+        self.assertEqual(self.sync('/api/machines/')['deleted'], [machine_id])
+        # Cascaded deletes are logged too
+        self.assertEqual(self.sync('/api/machine-items/')['deleted'], [item_id])
+        self.assertEqual(self.sync('/api/products/')['deleted'], [])
+
+    @override_settings(DELTA_SYNC_OVERLAP_SECONDS=0)
+    def test_old_tombstones_are_not_repeated(self):
+        chips_id = self.chips.id
+        self.chips.delete()
+        data = self.sync('/api/products/')
+        self.assertEqual(data['deleted'], [chips_id])
+
+        next_sync = self.sync('/api/products/', since=data['server_time'].isoformat())
+        self.assertEqual(next_sync['deleted'], [])
+        self.assertEqual(next_sync['results'], [])
+
+    def test_bulk_price_changes_are_picked_up(self):
+        response = self.client.post('/api/machine-items/bulk-update/', {'rules': [
+            {'product': self.coke.id, 'price': '1.75'},
+        ]}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK, response.data)
+        self.assertEqual([row['id'] for row in self.sync('/api/machine-items/')['results']], [self.item.id])
+
+    def test_bulk_visit_stock_changes_are_picked_up(self):
+        Product.objects.filter(id=self.coke.id).update(inventory_quantity=24)
+        response = self.client.post('/api/visits/bulk-save/', {
+            'visit': {'location': self.location.id, 'visit_date': '2026-01-15T10:30:00Z'},
+            'machine_restocks': [{
+                'machine': self.machine.id,
+                'restock_entries': [{'product': self.coke.id, 'stock_before': 2, 'discarded': 0, 'restocked': 6}],
+            }],
+        }, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED, response.data)
+
+        rows = self.sync('/api/machine-items/')['results']
+        self.assertEqual([row['id'] for row in rows], [self.item.id])
+        self.assertEqual(rows[0]['current_stock'], 8)
+
+    def test_machine_rows_follow_their_location_and_items(self):
+        self.location.name = 'Head Office'
+        self.location.save()
+        rows = self.sync('/api/machines/')['results']
+        self.assertEqual([(row['id'], row['location_name']) for row in rows], [(self.machine.id, 'Head Office')])
+
+        for change in (
+            lambda: MachineItemPrice.objects.create(machine=self.machine, product=self.chips, price=Decimal('1.00')),
+            lambda: self.item.delete(),
+        ):
+            Machine.objects.update(updated_at=timezone.now() - timedelta(days=2))
+            change()
+            self.assertEqual([row['id'] for row in self.sync('/api/machines/')['results']], [self.machine.id])
+
+    def test_bulk_created_items_bump_their_machine(self):
+        response = self.client.post('/api/machine-items/bulk-update/', {'changes': [
+            {'machine': self.machine.id, 'product': self.chips.id, 'price': '1.00'},
+        ]}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK, response.data)
+        rows = self.sync('/api/machines/')['results']
+        self.assertEqual([(row['id'], row['product_count']) for row in rows], [(self.machine.id, 2)])
+
+    def test_untracked_models_still_filter(self):
+        Visit.objects.create(location=self.location, user=self.user, visit_date=timezone.now())
+        data = self.sync('/api/visits/')
+        self.assertEqual(len(data['results']), 1)
+        # Deletions are not known, so the response does not claim there were none
+        self.assertNotIn('deleted', data)
+        self.assertFalse(DeletionLog.objects.exists())
+
+    def test_server_time_overlaps_writes_committing_during_the_read(self):
+        read_at = timezone.now()
+        data = self.sync('/api/products/')
+        self.assertLessEqual(data['server_time'], timezone.now() - timedelta(seconds=60))
+
+        # Saved (updated_at stamped) just before that read, but committed after it
+        Product.objects.filter(id=self.chips.id).update(updated_at=read_at - timedelta(seconds=1))
+        next_sync = self.sync('/api/products/', since=data['server_time'].isoformat())
+        self.assertEqual([row['id'] for row in next_sync['results']], [self.chips.id])
+
+    def test_accepts_dates_and_unencoded_offsets(self):
+        self.sync('/api/locations/', since=timezone.now().date().isoformat())
+        response = self.client.get('/api/locations/?updated_since=2026-01-01T00:00:00+00:00')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_invalid_timestamp(self):
+        response = self.client.get('/api/locations/', {'updated_since': 'yesterday'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
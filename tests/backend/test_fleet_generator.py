@@ -0,0 +1,80 @@
+import os
+import sys
+import django
+from datetime import datetime, timezone as dt_timezone
+from io import StringIO
+
+# Add the backend directory to the Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'backend'))
+
+# Set up Django
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'vendingapp.settings')
+django.setup()
+
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import TestCase
+
+from core.fleet_generator import generate_fleet
+from core.models import (
+    Location, MachineItemPrice, Product, ProductCost, RestockEntry, Visit, WholesalePurchase
+)
+
+
+END = datetime(2026, 1, 1, tzinfo=dt_timezone.utc)
+
+
+class FleetGeneratorTest(TestCase):
+    """Test the synthetic fleet generator and the generate_fleet command"""
+
+    def snapshot(self):
+        return {
+            'entries': list(RestockEntry.objects.order_by('id').values_list(
+                'stock_before', 'discarded', 'restocked', 'visit_date'
+            )),
+            'prices': list(MachineItemPrice.objects.order_by('id').values_list('slot', 'price', 'current_stock')),
+            'costs': list(ProductCost.objects.order_by('id').values_list('date', 'unit_cost', 'quantity')),
+        }
+
+    def clear(self):
+        for model in (WholesalePurchase, Visit, Location, Product):
+            model.objects.all().delete()
+
+    def test_same_seed_same_dataset(self):
+        generate_fleet(locations=2, machines_per_location=2, products=6, slots=4, weeks=6, seed=7, end=END)
+        first = self.snapshot()
+        self.clear()
+        generate_fleet(locations=2, machines_per_location=2, products=6, slots=4, weeks=6, seed=7, end=END)
+        self.assertEqual(self.snapshot(), first)
+
+        self.clear()
+        generate_fleet(locations=2, machines_per_location=2, products=6, slots=4, weeks=6, seed=8, end=END)
+        self.assertNotEqual(self.snapshot()['entries'], first['entries'])
+
+    def test_small_batches_write_every_row(self):
+        counts = generate_fleet(
+            locations=3, machines_per_location=2, products=5, slots=3, weeks=4, end=END, batch_size=7
+        )
+        self.assertEqual(counts['restock_entries'], RestockEntry.objects.count())
+        self.assertEqual(counts['restock_entries'], counts['machine_restocks'] * 3)
+        self.assertEqual(counts['machine_items'], 3 * 2 * 3)
+        self.assertFalse(RestockEntry.objects.filter(visit_date__isnull=True).exists())
+
+    def test_cost_history_comes_from_purchases(self):
+        generate_fleet(locations=1, machines_per_location=1, products=2, slots=2, weeks=8, end=END)
+        self.assertEqual(ProductCost.objects.count(), WholesalePurchase.objects.count())
+        self.assertFalse(ProductCost.objects.filter(purchase__isnull=True).exists())
+        self.assertFalse(Visit.objects.filter(visit_date__gt=END).exists())
+
+    def test_command(self):
+        out = StringIO()
+        call_command(
+            'generate_fleet', '--locations', '2', '--machines-per-location', '1', '--products', '3',
+            '--slots', '2', '--weeks', '3', '--end-date', '2026-01-01', stdout=out
+        )
+        self.assertIn(f'restock_entries: {RestockEntry.objects.count()}', out.getvalue())
+        self.assertEqual(Location.objects.count(), 2)
+
+    def test_command_rejects_bad_end_date(self):
+        with self.assertRaises(CommandError):
+            call_command('generate_fleet', '--end-date', 'soon', stdout=StringIO())
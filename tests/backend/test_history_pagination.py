@@ -0,0 +1,94 @@
+import os
+import sys
+import django
+from decimal import Decimal
+from datetime import timedelta
+
+# Add the backend directory to the Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'backend'))
+
+# Set up Django
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'vendingapp.settings')
+django.setup()
+
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APITestCase
+from rest_framework import status
+
+from core.models import Location, Machine, Product, WholesalePurchase, ProductCost, Visit, VisitMachineRestock
+
+
+class HistoryCursorPaginationTest(APITestCase):
+    """History endpoints page by cursor, without COUNT(*) or OFFSET"""
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='historian', password='testpass123')
+        self.client.force_authenticate(user=self.user)
+        self.location = Location.objects.create(name='Office', address='1 Main St', route='A')
+        self.machine = Machine.objects.create(name='M1', location=self.location, machine_type='Snack')
+        self.product = Product.objects.create(name='Coke')
+
+        now = timezone.now()
+        # Every third visit shares a timestamp to exercise the id tie-breaker
+        self.visits = Visit.objects.bulk_create(
+            Visit(location=self.location, user=self.user, visit_date=now - timedelta(hours=i // 3))
+            for i in range(25)
+        )
+        VisitMachineRestock.objects.bulk_create(
+            VisitMachineRestock(visit=visit, machine=self.machine) for visit in self.visits
+        )
+        purchases = WholesalePurchase.objects.bulk_create(
+            WholesalePurchase(product=self.product, quantity=1, total_cost=Decimal('1.00'),
+                              purchased_at=now - timedelta(days=i))
+            for i in range(25)
+        )
+        ProductCost.objects.bulk_create(
+            ProductCost(product=self.product, purchase=purchase, date=purchase.purchased_at,
+                        quantity=1, unit_cost=Decimal('1.00'), total_cost=Decimal('1.00'))
+            for purchase in purchases
+        )
+
+    def walk(self, url):
+        """Follow next links to the end, returning every id and the query count of each page"""
+        ids, page_queries = [], []
+        while url:
+            with CaptureQueriesContext(connection) as context:
+                response = self.client.get(url)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertNotIn('count', response.data)
+            ids.extend(row['id'] for row in response.data['results'])
+            page_queries.append(len(context.captured_queries))
+            url = response.data['next']
+        return ids, page_queries
+
+    def test_pages_cover_every_row_once(self):
+        for url, total in [
+            ('/api/visits/?page_size=4', 25),
+            ('/api/restocks/?page_size=4', 25),
+            ('/api/purchases/?page_size=4', 25),
+            ('/api/product-costs/?page_size=4', 25),
+        ]:
+            with self.subTest(url=url):
+                ids, page_queries = self.walk(url)
+                self.assertEqual(len(ids), total)
+                self.assertEqual(len(set(ids)), total)
+                # the last page is as cheap as the first
+                self.assertEqual(len(set(page_queries)), 1)
+
+    def test_visits_are_newest_first(self):
+        response = self.client.get('/api/visits/')
+        dates = [row['visit_date'] for row in response.data['results']]
+        self.assertEqual(dates, sorted(dates, reverse=True))
+
+    def test_no_count_query_by_default(self):
+        with CaptureQueriesContext(connection) as context:
+            self.client.get('/api/purchases/')
+        self.assertFalse(any('COUNT(' in query['sql'].upper() for query in context.captured_queries))
+
+    def test_exact_count_opt_in(self):
+        response = self.client.get('/api/purchases/?count=true&page_size=5')
+        self.assertEqual(response.data['count'], 25)
+        self.assertEqual(len(response.data['results']), 5)
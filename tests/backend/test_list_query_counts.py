@@ -0,0 +1,196 @@
+import os
+import sys
+import django
+from decimal import Decimal
+from datetime import timedelta
+
+# Add the backend directory to the Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'backend'))
+
+# Set up Django
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'vendingapp.settings')
+django.setup()
+
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APITestCase
+from rest_framework import status
+
+from core.models import (
+    Location, Machine, Product, MachineItemPrice, WholesalePurchase,
+    Visit, VisitMachineRestock, Supplier, RestockEntry
+)
+
+
+class ListQueryCountMixin:
+    """Helpers to check that list endpoints cost a constant number of queries"""
+
+    def count_queries(self, url):
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return len(context.captured_queries), response
+
+    def assertConstantQueries(self, url, grow):
+        """Query count for ``url`` must not change after calling ``grow()`` to add rows"""
+        small_count, small_response = self.count_queries(url)
+        grow()
+        large_count, large_response = self.count_queries(url)
+        self.assertGreater(len(large_response.data['results']), len(small_response.data['results']))
+        self.assertEqual(small_count, large_count)
+        return large_count
+
+
+class PrefetchAwareSerializerQueryTest(ListQueryCountMixin, APITestCase):
+    """Machine, machine item and machine restock lists must not issue per-row queries"""
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='counter', password='testpass123')
+        self.client.force_authenticate(user=self.user)
+        self.location = Location.objects.create(name='Office', address='1 Main St', route='A')
+        self.products = [Product.objects.create(name=f'Product {i}') for i in range(5)]
+        for product in self.products:
+            WholesalePurchase.objects.create(
+                product=product, quantity=10, total_cost=Decimal('5.00'), purchased_at=timezone.now()
+            )
+
+    def add_machines(self, count):
+        for i in range(count):
+            machine = Machine.objects.create(name=f'M{i}', location=self.location, machine_type='Combo')
+            for slot, product in enumerate(self.products):
+                MachineItemPrice.objects.create(machine=machine, product=product, price=Decimal('1.00'), slot=slot)
+
+    def test_machine_list(self):
+        self.add_machines(2)
+        self.assertConstantQueries('/api/machines/', lambda: self.add_machines(8))
+
+    def test_machine_product_count_is_annotated(self):
+        self.add_machines(1)
+        response = self.client.get('/api/machines/')
+        self.assertEqual(response.data['results'][0]['product_count'], len(self.products))
+
+    def test_machine_item_list(self):
+        self.add_machines(1)
+        self.assertConstantQueries('/api/machine-items/', lambda: self.add_machines(5))
+
+    def test_machine_item_profit_margin_matches_model(self):
+        self.add_machines(1)
+        response = self.client.get('/api/machine-items/')
+        item = MachineItemPrice.objects.get(id=response.data['results'][0]['id'])
+        # average cost 0.50 on a 1.00 price
+        self.assertEqual(response.data['results'][0]['profit_margin'], item.profit_margin)
+        self.assertEqual(Decimal(response.data['results'][0]['profit_margin']), Decimal('50'))
+
+    def test_machine_restock_list(self):
+        self.add_machines(3)
+
+        def add_visits(count=5):
+            for _ in range(count):
+                visit = Visit.objects.create(location=self.location, user=self.user, visit_date=timezone.now())
+                for machine in Machine.objects.all():
+                    VisitMachineRestock.objects.create(visit=visit, machine=machine)
+
+        add_visits(1)
+        self.assertConstantQueries('/api/restocks/', add_visits)
+
+
+class SupplierStatisticsQueryTest(ListQueryCountMixin, APITestCase):
+    """Supplier purchase statistics come from one grouped query"""
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='buyer', password='testpass123')
+        self.client.force_authenticate(user=self.user)
+        self.product = Product.objects.create(name='Coke')
+        Supplier.objects.all().delete()
+
+    def add_suppliers(self, count, purchases_each=3):
+        for i in range(count):
+            supplier = Supplier.objects.create(name=f'Supplier {Supplier.objects.count()}')
+            for days_ago in range(purchases_each):
+                WholesalePurchase.objects.create(
+                    product=self.product, supplier=supplier, quantity=10, total_cost=Decimal('5.00'),
+                    purchased_at=timezone.now() - timedelta(days=days_ago * 30)
+                )
+
+    def test_supplier_list(self):
+        self.add_suppliers(2)
+        self.assertConstantQueries('/api/suppliers/', lambda: self.add_suppliers(8))
+
+    def test_supplier_detail_statistics(self):
+        self.add_suppliers(1)
+        supplier = Supplier.objects.get()
+        response = self.client.get(f'/api/suppliers/{supplier.id}/')
+        self.assertEqual(response.data['purchase_count'], 3)
+        self.assertEqual(response.data['total_spent'], Decimal('15.00'))
+        self.assertNotIn('period_total_spent', response.data)
+
+    def test_since_window(self):
+        self.add_suppliers(1)
+        since = (timezone.now() - timedelta(days=45)).date().isoformat()
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(f'/api/suppliers/?since={since}')
+        self.assertEqual(len(context.captured_queries), 2)  # page count + grouped rows
+        row = response.data['results'][0]
+        self.assertEqual(row['purchase_count'], 3)
+        self.assertEqual(row['period_purchase_count'], 2)
+        self.assertEqual(row['period_total_spent'], Decimal('10.00'))
+
+    def test_invalid_since(self):
+        response = self.client.get('/api/suppliers/?since=yesterday')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_destroy_with_purchases_is_blocked(self):
+        self.add_suppliers(1)
+        supplier = Supplier.objects.get()
+        response = self.client.delete(f'/api/suppliers/{supplier.id}/')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class PageSizeQueryCountTest(ListQueryCountMixin, APITestCase):
+    """Purchase and restock entry lists cost the same at page_size 10 and 500"""
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='pager', password='testpass123')
+        self.client.force_authenticate(user=self.user)
+        self.location = Location.objects.create(name='Office', address='1 Main St', route='A')
+        self.supplier = Supplier.objects.create(name='Page Size Supplier')
+        self.products = [Product.objects.create(name=f'Product {i}') for i in range(10)]
+        self.machines = [
+            Machine.objects.create(name=f'M{i}', location=self.location, machine_type='Combo') for i in range(5)
+        ]
+        for machine in self.machines:
+            for slot, product in enumerate(self.products):
+                MachineItemPrice.objects.create(machine=machine, product=product, price=Decimal('1.00'), slot=slot)
+
+    def assertSamePageCost(self, url, total):
+        small_count, small_response = self.count_queries(f'{url}?page_size=10')
+        large_count, large_response = self.count_queries(f'{url}?page_size=500')
+        self.assertEqual(len(small_response.data['results']), 10)
+        self.assertEqual(len(large_response.data['results']), total)
+        self.assertEqual(small_count, large_count)
+        return large_count
+
+    def test_purchase_list(self):
+        WholesalePurchase.objects.bulk_create(
+            WholesalePurchase(
+                product=self.products[i % 10], supplier=self.supplier if i % 2 else None,
+                quantity=10, total_cost=Decimal('5.00'), purchased_at=timezone.now()
+            )
+            for i in range(500)
+        )
+        # rows with product and supplier joined (cursor pages run no COUNT)
+        self.assertEqual(self.assertSamePageCost('/api/purchases/', 500), 1)
+
+    def test_restock_entry_list(self):
+        visit = Visit.objects.create(location=self.location, user=self.user, visit_date=timezone.now())
+        restocks = [VisitMachineRestock.objects.create(visit=visit, machine=machine) for machine in self.machines]
+        RestockEntry.objects.bulk_create(
+            RestockEntry(visit_machine_restock=restock, product=product, stock_before=2, restocked=8)
+            for _ in range(10)
+            for restock in restocks
+            for product in self.products
+        )
+        # rows with joins, the slot comes from a subquery
+        self.assertEqual(self.assertSamePageCost('/api/restock-entries/', 500), 1)
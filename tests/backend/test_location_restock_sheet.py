@@ -0,0 +1,84 @@
+import os
+import sys
+import django
+from decimal import Decimal
+
+# Add the backend directory to the Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'backend'))
+
+# Set up Django
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'vendingapp.settings')
+django.setup()
+
+from django.contrib.auth.models import User
+from rest_framework.test import APITestCase
+from rest_framework import status
+
+from core.models import Location, Machine, Product, MachineItemPrice
+
+
+class LocationRestockSheetTest(APITestCase):
+    """Test the locations/{id}/restock-sheet/ endpoint"""
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='restocker', password='testpass123')
+        self.client.force_authenticate(user=self.user)
+
+        self.location = Location.objects.create(name='Office', address='1 Main St', route='A')
+        self.other = Location.objects.create(name='School', address='2 Main St', route='B')
+        self.products = [Product.objects.create(name=f'Product {i}') for i in range(4)]
+        self.url = f'/api/locations/{self.location.id}/restock-sheet/'
+
+    def add_machines(self, count, location=None):
+        for i in range(count):
+            machine = Machine.objects.create(
+                name=f'Machine {Machine.objects.count()}', location=location or self.location, machine_type='Combo'
+            )
+            for slot, product in enumerate(self.products, start=1):
+                MachineItemPrice.objects.create(
+                    machine=machine, product=product, price=Decimal('1.25'), slot=slot, current_stock=slot
+                )
+
+    def test_sheet_contents(self):
+        self.add_machines(2)
+        self.add_machines(1, location=self.other)
+
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['location']['id'], self.location.id)
+        self.assertEqual(len(response.data['machines']), 2)
+
+        machine = response.data['machines'][0]
+        self.assertEqual(machine['product_count'], 4)
+        self.assertEqual([item['slot'] for item in machine['products']], [1, 2, 3, 4])
+        first = machine['products'][0]
+        self.assertEqual(first['id'], self.products[0].id)
+        self.assertEqual(first['name'], 'Product 0')
+        self.assertEqual(first['current_stock'], 1)
+        self.assertEqual(Decimal(first['price']), Decimal('1.25'))
+
+    def test_query_count_does_not_grow_with_machines(self):
+        self.add_machines(10)
+        # location, machines, item prices with products
+        with self.assertNumQueries(3):
+            response = self.client.get(self.url)
+        self.assertEqual(len(response.data['machines']), 10)
+
+    def test_etag_not_modified(self):
+        self.add_machines(1)
+        response = self.client.get(self.url)
+        etag = response['ETag']
+
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(response['ETag'], etag)
+
+    def test_etag_changes_with_stock(self):
+        self.add_machines(1)
+        etag = self.client.get(self.url)['ETag']
+
+        MachineItemPrice.objects.filter(slot=1).update(current_stock=9)
+
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response['ETag'], etag)
@@ -0,0 +1,122 @@
+import os
+import sys
+import django
+from decimal import Decimal
+
+# Add the backend directory to the Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'backend'))
+
+# Set up Django
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'vendingapp.settings')
+django.setup()
+
+from django.contrib.auth.models import User
+from rest_framework.test import APITestCase
+from rest_framework import status
+
+from core.models import Location, Machine, Product, MachineItemPrice
+
+
+class MachineItemPriceBulkUpdateTest(APITestCase):
+    """Test the machine-items/bulk-update/ endpoint"""
+
+    url = '/api/machine-items/bulk-update/'
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='pricer', password='testpass123')
+        self.client.force_authenticate(user=self.user)
+
+        self.route_a = Location.objects.create(name='Office', address='1 Main St', route='A')
+        self.route_b = Location.objects.create(name='School', address='2 Main St', route='B')
+        self.combo_a = Machine.objects.create(name='Combo A', location=self.route_a, machine_type='Combo')
+        self.snack_a = Machine.objects.create(name='Snack A', location=self.route_a, machine_type='Snack')
+        self.combo_b = Machine.objects.create(name='Combo B', location=self.route_b, machine_type='Combo')
+
+        self.coke = Product.objects.create(name='Coke', product_type='Soda')
+        self.chips = Product.objects.create(name='Chips', product_type='Snack')
+
+        for machine in [self.combo_a, self.snack_a, self.combo_b]:
+            MachineItemPrice.objects.create(machine=machine, product=self.coke, price=Decimal('1.50'), slot=1)
+
+    def test_explicit_changes_update_and_create(self):
+        response = self.client.post(self.url, {'changes': [
+            {'machine': self.combo_a.id, 'product': self.coke.id, 'price': '1.75', 'slot': 4},
+            {'machine': self.combo_a.id, 'product': self.chips.id, 'price': '1.25', 'slot': 5},
+            {'machine': self.combo_b.id, 'product': self.coke.id, 'price': '1.50'},
+        ]}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK, response.data)
+        self.assertEqual(response.data['updated'], 1)
+        self.assertEqual(response.data['created'], 1)
+        self.assertEqual(response.data['unchanged'], 1)
+
+        item = MachineItemPrice.objects.get(machine=self.combo_a, product=self.coke)
+        self.assertEqual(item.price, Decimal('1.75'))
+        self.assertEqual(item.slot, 4)
+        self.assertTrue(MachineItemPrice.objects.filter(machine=self.combo_a, product=self.chips, slot=5).exists())
+
+    def test_rule_updates_matching_machines_only(self):
+        response = self.client.post(self.url, {'rules': [
+            {'product': self.coke.id, 'price': '1.75', 'route': 'A', 'machine_type': 'Combo'},
+        ]}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK, response.data)
+        self.assertEqual(response.data['rule_updated'], 1)
+
+        prices = dict(MachineItemPrice.objects.values_list('machine_id', 'price'))
+        self.assertEqual(prices[self.combo_a.id], Decimal('1.75'))
+        self.assertEqual(prices[self.snack_a.id], Decimal('1.50'))
+        self.assertEqual(prices[self.combo_b.id], Decimal('1.50'))
+
+    def test_dry_run_does_not_write(self):
+        response = self.client.post(self.url + '?dry_run=true', {'rules': [
+            {'product': self.coke.id, 'price': '2.00'},
+        ]}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['rule_updated'], 3)
+        self.assertFalse(MachineItemPrice.objects.filter(price=Decimal('2.00')).exists())
+
+    def test_invalid_rows_are_reported_and_nothing_is_saved(self):
+        response = self.client.post(self.url, {'changes': [
+            {'machine': self.combo_a.id, 'product': self.coke.id, 'price': '1.75'},
+            {'machine': 99999, 'product': self.coke.id, 'price': '1.75'},
+        ]}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data['errors'][0]['row'], 2)
+        self.assertIn('machine', response.data['errors'][0]['errors'])
+        self.assertEqual(MachineItemPrice.objects.filter(price=Decimal('1.75')).count(), 0)
+
+    def test_empty_payload_is_rejected(self):
+        response = self.client.post(self.url, {}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_query_count_is_constant(self):
+        """Validation and writes cost the same for 3 or 30 changes"""
+        products = [Product.objects.create(name=f'P{i}') for i in range(30)]
+        changes = [
+            {'machine': self.combo_a.id, 'product': product.id, 'price': '1.00', 'slot': i}
+            for i, product in enumerate(products)
+        ]
+        # machines, products, existing rows, savepoint, insert, machine updated_at, release savepoint
+        with self.assertNumQueries(7):
+            response = self.client.post(self.url, {'changes': changes}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK, response.data)
+        self.assertEqual(response.data['created'], 30)
+
+    def test_fleet_wide_changes(self):
+        """More changes than the database allows terms in one expression"""
+        machines = [
+            Machine.objects.create(name=f'M{i}', location=self.route_a, machine_type='Combo') for i in range(40)
+        ]
+        products = [Product.objects.create(name=f'P{i}') for i in range(40)]
+        MachineItemPrice.objects.bulk_create([
+            MachineItemPrice(machine=machine, product=product, price=Decimal('1.50'), slot=slot)
+            for machine in machines for slot, product in enumerate(products[:20])
+        ])
+        changes = [
+            {'machine': machine.id, 'product': product.id, 'price': '1.60'}
+            for machine in machines for product in products
+        ]
+        response = self.client.post(self.url, {'changes': changes}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK, response.data)
+        self.assertEqual(response.data['updated'], 800)
+        self.assertEqual(response.data['created'], 800)
+        self.assertEqual(MachineItemPrice.objects.filter(price=Decimal('1.60')).count(), 1600)
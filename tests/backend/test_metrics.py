@@ -0,0 +1,129 @@
+import os
+import sys
+import django
+import subprocess
+import tempfile
+from unittest import mock
+
+# Add the backend directory to the Python path
+BACKEND_DIR = os.path.join(os.path.dirname(__file__), '..', '..', 'backend')
+sys.path.insert(0, BACKEND_DIR)
+
+# Set up Django
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'vendingapp.settings')
+django.setup()
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import SimpleTestCase, override_settings
+from prometheus_client import REGISTRY, generate_latest
+from rest_framework.test import APITestCase
+
+from core.metrics import MetricsSnapshot
+from core.models import Location, Machine, Product
+
+
+def sample(name, **labels):
+    return REGISTRY.get_sample_value(name, labels) or 0.0
+
+
+@override_settings(METRICS_TOKEN='scrape-token')
+class MetricsEndpointTest(APITestCase):
+    """Test the /metrics endpoint and the metrics recorded while serving requests"""
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username='metrics', password='testpass123')
+        self.client.force_authenticate(user=self.user)
+        location = Location.objects.create(name='Office', address='1 Main St', route='A')
+        Machine.objects.create(name='Combo', location=location, machine_type='Combo')
+        Product.objects.create(name='Coke', inventory_quantity=100)
+
+    def scrape(self):
+        response = self.client.get('/metrics', HTTP_AUTHORIZATION='Bearer scrape-token')
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response['Content-Type'].startswith('text/plain'))
+        return response.content.decode()
+
+    def test_token_is_required(self):
+        self.assertEqual(self.client.get('/metrics').status_code, 401)
+        self.assertEqual(self.client.get('/metrics', HTTP_AUTHORIZATION='Bearer wrong').status_code, 401)
+
+    @override_settings(METRICS_TOKEN='', DEBUG=False)
+    def test_hidden_without_token(self):
+        self.assertEqual(self.client.get('/metrics').status_code, 404)
+
+    def test_request_latency_by_route(self):
+        labels = {'method': 'GET', 'route': 'product-list', 'status': '200'}
+        before = sample('http_request_duration_seconds_count', **labels)
+        self.client.get('/api/products/')
+        self.assertEqual(sample('http_request_duration_seconds_count', **labels), before + 1)
+        self.assertIn('http_requests_in_progress', self.scrape())
+
+    def test_db_queries_are_counted(self):
+        before = sample('db_query_duration_seconds_count', database='default')
+        self.client.get('/api/products/')
+        self.assertGreater(sample('db_query_duration_seconds_count', database='default'), before)
+
+    def test_analytics_cache_hit_ratio(self):
+        labels = {'prefix': 'analytics_current_stock'}
+        hits = sample('analytics_cache_requests_total', result='hit', **labels)
+        misses = sample('analytics_cache_requests_total', result='miss', **labels)
+        self.client.get('/api/inventory/current-stock/')
+        self.client.get('/api/inventory/current-stock/')
+        self.assertEqual(sample('analytics_cache_requests_total', result='hit', **labels), hits + 1)
+        self.assertEqual(sample('analytics_cache_requests_total', result='miss', **labels), misses + 1)
+        self.assertIn('analytics_cache_hit_ratio{prefix="analytics_current_stock"}', self.scrape())
+
+    def test_bulk_import_rows(self):
+        before = sample('bulk_save_rows_total', kind='purchases')
+        product = Product.objects.get()
+        with self.captureOnCommitCallbacks() as callbacks:
+            response = self.client.post('/api/purchases/bulk-import/', {'purchases': [
+                {'product': product.id, 'quantity': 24, 'total_cost': '12.00'},
+                {'product': product.id, 'quantity': 12, 'total_cost': '6.00'},
+            ]}, format='json')
+        self.assertEqual(response.status_code, 201)
+        # Only counted once the rows are committed
+        self.assertEqual(sample('bulk_save_rows_total', kind='purchases'), before)
+        for callback in callbacks:
+            callback()
+        self.assertEqual(sample('bulk_save_rows_total', kind='purchases'), before + 2)
+
+    def test_bulk_price_rows_are_counted_on_commit(self):
+        before = sample('bulk_save_rows_total', kind='machine_item_prices')
+        machine, product = Machine.objects.get(), Product.objects.get()
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post('/api/machine-items/bulk-update/', {'changes': [
+                {'machine': machine.id, 'product': product.id, 'price': '1.75'},
+            ]}, format='json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(sample('bulk_save_rows_total', kind='machine_item_prices'), before + 1)
+
+
+WORKER_SCRIPT = """
+import os, sys
+sys.path.insert(0, sys.argv[1])
+os.environ['DJANGO_SETTINGS_MODULE'] = 'vendingapp.settings'
+import django
+django.setup()
+from core.metrics import record_analytics_cache, record_bulk_rows
+record_bulk_rows('restock_entries', 5)
+record_analytics_cache('analytics_dashboard_abc', hit=sys.argv[2] == 'hit')
+"""
+
+
+class MultiProcessMetricsTest(SimpleTestCase):
+    """Test that /metrics adds up the samples of all worker processes"""
+
+    def test_workers_are_aggregated(self):
+        with tempfile.TemporaryDirectory() as directory:
+            env = {**os.environ, 'PROMETHEUS_MULTIPROC_DIR': directory}
+            for result in ('hit', 'miss'):
+                subprocess.run([sys.executable, '-c', WORKER_SCRIPT, BACKEND_DIR, result], env=env, check=True)
+
+            with mock.patch.dict(os.environ, {'PROMETHEUS_MULTIPROC_DIR': directory}):
+                output = generate_latest(MetricsSnapshot()).decode()
+
+        self.assertIn('bulk_save_rows_total{kind="restock_entries"} 10.0', output)
+        self.assertIn('analytics_cache_hit_ratio{prefix="analytics_dashboard"} 0.5', output)
@@ -0,0 +1,114 @@
+import os
+import sys
+import django
+from decimal import Decimal
+
+# Add the backend directory to the Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'backend'))
+
+# Set up Django
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'vendingapp.settings')
+django.setup()
+
+from django.contrib.auth.models import User
+from django.core.cache import cache, caches
+from django.test import override_settings
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from core.models import Location, Machine, Product, MachineItemPrice, RestockEntry
+
+
+@override_settings(PROFILE_REQUESTS=True, PROFILE_RATE_LIMIT=3)
+class RequestProfilingTest(APITestCase):
+    """Test on-demand profiling of the analytics and bulk-save views"""
+
+    def setUp(self):
+        cache.clear()
+        caches['profiles'].clear()
+        self.staff = User.objects.create_user(username='ops', password='testpass123', is_staff=True)
+        self.driver = User.objects.create_user(username='driver', password='testpass123')
+        self.client.force_authenticate(user=self.staff)
+
+        self.location = Location.objects.create(name='Office', address='1 Main St', route='A')
+        self.machine = Machine.objects.create(name='Combo', location=self.location, machine_type='Combo')
+        self.coke = Product.objects.create(name='Coke', inventory_quantity=100)
+        MachineItemPrice.objects.create(machine=self.machine, product=self.coke, price=Decimal('1.50'), slot=1)
+
+    def test_report_replaces_response(self):
+        response = self.client.get('/api/inventory/current-stock/?_profile=1')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        report = response.json()
+        self.assertEqual(report['path'], '/api/inventory/current-stock/')
+        self.assertEqual(report['status'], 200)
+        self.assertTrue(report['functions'])
+        self.assertTrue(any('analytics_views.py' in entry['function'] for entry in report['functions']))
+
+        # Statements are grouped by the project line that ran them
+        self.assertEqual(report['queries'], sum(site['queries'] for site in report['sql']))
+        self.assertGreater(report['queries'], 0)
+        self.assertTrue(all(site['call_site'].startswith('core/') for site in report['sql']))
+
+    def test_header_switch(self):
+        response = self.client.get('/api/dashboard/', HTTP_X_PROFILE='1')
+        self.assertIn('functions', response.json())
+
+    def test_store_keeps_response(self):
+        response = self.client.get('/api/inventory/current-stock/?_profile=store')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotIn('functions', response.json())
+
+        report = self.client.get(f"/api/profiles/{response['X-Profile-Id']}/").json()
+        self.assertEqual(report['path'], '/api/inventory/current-stock/')
+        self.assertEqual(self.client.get('/api/profiles/missing/').status_code, status.HTTP_404_NOT_FOUND)
+
+        self.client.force_authenticate(user=self.driver)
+        self.assertEqual(
+            self.client.get(f"/api/profiles/{response['X-Profile-Id']}/").status_code, status.HTTP_403_FORBIDDEN
+        )
+
+    def test_staff_only(self):
+        self.client.force_authenticate(user=self.driver)
+        response = self.client.get('/api/inventory/current-stock/?_profile=1')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotIn('functions', response.json())
+        self.assertNotIn('X-Profile-Id', response)
+
+    def test_rate_limit(self):
+        for _ in range(3):
+            self.assertIn('functions', self.client.get('/api/dashboard/?_profile=1').json())
+        response = self.client.get('/api/dashboard/?_profile=1')
+        self.assertNotIn('functions', response.json())
+        self.assertEqual(response['X-Profile-Skipped'], 'rate limited')
+
+    def test_profiles_the_computation_not_a_cache_hit(self):
+        self.client.get('/api/inventory/current-stock/')
+        report = self.client.get('/api/inventory/current-stock/?_profile=1').json()
+        self.assertTrue(any('compute_stock_data' in entry['function'] for entry in report['functions']))
+        self.assertGreater(report['queries'], 0)
+
+    def test_rate_limit_is_shared_by_worker_processes(self):
+        for _ in range(3):
+            self.client.get('/api/dashboard/?_profile=1')
+        # A worker's own default cache knows nothing of the other workers' counts
+        cache.clear()
+        self.assertEqual(self.client.get('/api/dashboard/?_profile=1')['X-Profile-Skipped'], 'rate limited')
+
+    @override_settings(PROFILE_REQUESTS=False)
+    def test_disabled(self):
+        self.assertNotIn('functions', self.client.get('/api/dashboard/?_profile=1').json())
+
+    def test_bulk_save(self):
+        response = self.client.post('/api/visits/bulk-save/?_profile=store', {
+            'visit': {'location': self.location.id, 'visit_date': '2026-01-15T10:30:00Z'},
+            'machine_restocks': [{
+                'machine': self.machine.id,
+                'restock_entries': [{'product': self.coke.id, 'stock_before': 2, 'discarded': 0, 'restocked': 6}],
+            }],
+        }, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(RestockEntry.objects.count(), 1)
+
+        report = self.client.get(f"/api/profiles/{response['X-Profile-Id']}/").json()
+        self.assertEqual(report['status'], 201)
+        self.assertTrue(any('bulk_visit_views.py' in site['call_site'] for site in report['sql']))
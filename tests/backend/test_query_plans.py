@@ -0,0 +1,63 @@
+import os
+import sys
+import django
+from io import StringIO
+from unittest import mock
+
+# Add the backend directory to the Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'backend'))
+
+# Set up Django
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'vendingapp.settings')
+django.setup()
+
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db import connection
+from django.test import TestCase
+
+from core.models import RestockEntry, Visit
+from core.query_plans import sequential_scans, table_aliases
+
+
+class QueryPlanTest(TestCase):
+    """Test sequential scan detection and the explain_queries command"""
+
+    def test_table_aliases(self):
+        aliases = table_aliases(
+            'SELECT * FROM core_restockentry a LEFT JOIN "core_visit" ON a.id = 1 INNER JOIN "core_machine" U0 ON true'
+        )
+        self.assertEqual(aliases['a'], 'core_restockentry')
+        self.assertEqual(aliases['U0'], 'core_machine')
+        self.assertEqual(aliases['core_visit'], 'core_visit')
+        self.assertNotIn('ON', aliases)
+
+    def test_unindexed_filter_is_a_sequential_scan(self):
+        queryset = RestockEntry.objects.filter(restocked__gt=5)
+        self.assertEqual(sequential_scans(*queryset.query.sql_with_params()), ['core_restockentry'])
+
+    def test_denormalized_date_window_uses_an_index(self):
+        queryset = RestockEntry.objects.filter(location_id=1, visit_date__gte='2026-01-01')
+        self.assertEqual(sequential_scans(*queryset.query.sql_with_params()), [])
+
+    def test_cursor_pagination_of_visits_uses_an_index(self):
+        queryset = Visit.objects.filter(location_id=1).order_by('-visit_date', '-id')[:50]
+        self.assertEqual(sequential_scans(*queryset.query.sql_with_params()), [])
+
+    def test_command_passes_on_generated_fleet_and_rolls_it_back(self):
+        out = StringIO()
+        call_command('explain_queries', '--generate', '--locations', '2', '--weeks', '2', stdout=out)
+        self.assertIn('No sequential scans over the row threshold', out.getvalue())
+        self.assertFalse(Visit.objects.exists())
+
+    def test_command_fails_over_the_row_threshold(self):
+        with self.assertRaises(CommandError):
+            call_command(
+                'explain_queries', '--generate', '--locations', '2', '--weeks', '2',
+                '--max-seq-scan-rows', '0', stdout=StringIO()
+            )
+
+    def test_command_rejects_unsupported_databases(self):
+        with mock.patch.object(connection, 'vendor', 'oracle'):
+            with self.assertRaisesMessage(CommandError, 'does not support the oracle database'):
+                call_command('explain_queries', stdout=StringIO())
@@ -0,0 +1,98 @@
+import os
+import sys
+import django
+import json
+import tempfile
+from io import StringIO
+
+# Add the backend directory to the Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'backend'))
+
+# Set up Django
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'vendingapp.settings')
+django.setup()
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import LiveServerTestCase, SimpleTestCase, override_settings
+
+from core.fleet_generator import generate_fleet
+from core.management.commands.replay_traffic import endpoint_name, load_mix, parse_record
+from core.models import RestockEntry
+
+
+class RequestMixTest(SimpleTestCase):
+    """Test reading a request mix from request_timing logs and mix files"""
+
+    def write_lines(self, lines):
+        log = tempfile.NamedTemporaryFile('w', suffix='.log', delete=False)
+        with log:
+            log.write('\n'.join(lines) + '\n')
+        self.addCleanup(os.unlink, log.name)
+        return log.name
+
+    def test_request_timing_line(self):
+        line = 'INFO {"event": "request_timing", "method": "GET", "path": "/api/dashboard/", "query": "days=30"}'
+        self.assertEqual(parse_record(line), ('GET', '/api/dashboard/?days=30', 1.0))
+
+    def test_mix_line(self):
+        self.assertEqual(
+            parse_record('{"method": "post", "path": "/api/visits/bulk-save/", "weight": 3}'),
+            ('POST', '/api/visits/bulk-save/', 3.0)
+        )
+
+    def test_load_mix_merges_and_filters(self):
+        path = self.write_lines([
+            'not json',
+            '{"event": "request_timing", "method": "GET", "path": "/api/products/", "query": ""}',
+            '{"event": "request_timing", "method": "GET", "path": "/api/products/", "query": ""}',
+            '{"event": "request_timing", "method": "POST", "path": "/api/visits/bulk-save/"}',
+            '{"event": "request_timing", "method": "POST", "path": "/api/token/"}',
+            '{"event": "request_timing", "method": "PATCH", "path": "/api/products/1/"}',
+            '{"event": "request_timing", "method": "GET", "path": "/metrics"}',
+        ])
+        self.assertEqual(sorted(load_mix([path])), [
+            ('GET', '/api/products/', 2.0),
+            ('POST', '/api/visits/bulk-save/', 1.0),
+        ])
+
+    def test_endpoint_name_groups_ids(self):
+        self.assertEqual(endpoint_name('GET', '/api/visits/12/?fields=id'), 'GET /api/visits/{id}/')
+
+
+@override_settings(ALLOWED_HOSTS=['*'])
+class ReplayTrafficTest(LiveServerTestCase):
+    """Test replaying the built-in mix against a live server"""
+
+    def setUp(self):
+        User.objects.create_user(username='replayer', password='testpass123')
+        generate_fleet(locations=1, machines_per_location=1, products=3, slots=2, weeks=2)
+
+    def replay(self, *args):
+        out = StringIO()
+        call_command(
+            'replay_traffic', '--url', self.live_server_url, '--username', 'replayer', '--password', 'testpass123',
+            '--threads', '1', *args, stdout=out
+        )
+        return out.getvalue()
+
+    def test_replay_reports_every_endpoint(self):
+        entries = RestockEntry.objects.count()
+        report = json.loads(self.replay('--requests', '40', '--json'))
+        self.assertEqual(report['total']['count'], 40)
+        self.assertEqual(report['total']['errors'], 0)
+        self.assertIn('GET /api/dashboard/', report['endpoints'])
+        bulk_saves = report['endpoints']['POST /api/visits/bulk-save/']['count']
+        self.assertEqual(RestockEntry.objects.count(), entries + bulk_saves * 2)
+
+    def test_read_only(self):
+        report = json.loads(self.replay('--requests', '10', '--read-only', '--json'))
+        self.assertNotIn('POST /api/visits/bulk-save/', report['endpoints'])
+
+    def test_bad_login(self):
+        with self.assertRaisesMessage(CommandError, 'Login failed with 401'):
+            call_command(
+                'replay_traffic', '--url', self.live_server_url, '--username', 'replayer', '--password', 'wrong',
+                stdout=StringIO()
+            )
@@ -0,0 +1,87 @@
+import os
+import sys
+import django
+import importlib
+from datetime import timedelta
+
+# Add the backend directory to the Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'backend'))
+
+# Set up Django
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'vendingapp.settings')
+django.setup()
+
+from django.apps import apps
+from django.db import connection
+from django.contrib.auth.models import User
+from django.test import TestCase
+from django.utils import timezone
+
+from core.models import Location, Machine, Product, Visit, VisitMachineRestock, RestockEntry
+
+
+class RestockEntryDenormalizationTest(TestCase):
+    """Test visit_date, machine and location copied onto restock entries"""
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='driver', password='testpass123')
+        self.office = Location.objects.create(name='Office', address='1 Main St', route='A')
+        self.mall = Location.objects.create(name='Mall', address='2 Main St', route='B')
+        self.machine = Machine.objects.create(name='Combo', location=self.office, machine_type='Combo')
+        self.product = Product.objects.create(name='Coke', inventory_quantity=100)
+        self.visit = Visit.objects.create(location=self.office, user=self.user, visit_date=timezone.now() - timedelta(days=3))
+        self.restock = VisitMachineRestock.objects.create(visit=self.visit, machine=self.machine)
+        RestockEntry.objects.bulk_create([
+            RestockEntry(visit_machine_restock=self.restock, product=self.product, stock_before=2, restocked=8)
+        ])
+
+    def assertEntryMatches(self, visit_date, machine, location):
+        entry = RestockEntry.objects.get()
+        self.assertEqual(entry.visit_date, visit_date)
+        self.assertEqual(entry.machine_id, machine.id)
+        self.assertEqual(entry.location_id, location.id)
+
+    def test_bulk_create_fills_copied_columns(self):
+        self.assertEntryMatches(self.visit.visit_date, self.machine, self.office)
+
+    def test_visit_date_change_updates_entries(self):
+        self.visit.visit_date = timezone.now() - timedelta(days=1)
+        self.visit.save()
+        self.assertEntryMatches(self.visit.visit_date, self.machine, self.office)
+
+    def test_machine_move_updates_entries(self):
+        self.machine.location = self.mall
+        self.machine.save()
+        self.assertEntryMatches(self.visit.visit_date, self.machine, self.mall)
+
+    def test_visit_machine_restock_change_updates_entries(self):
+        other = Machine.objects.create(name='Snacks', location=self.mall, machine_type='Snack')
+        self.restock.machine = other
+        self.restock.save()
+        self.assertEntryMatches(self.visit.visit_date, other, self.mall)
+
+    def test_save_copies_columns_only_when_needed(self):
+        entry = RestockEntry.objects.get()
+        entry.restocked = 6
+        # The UPDATE alone; the columns are already right
+        with self.assertNumQueries(1):
+            entry.save()
+
+        other_visit = Visit.objects.create(location=self.mall, user=self.user, visit_date=timezone.now())
+        other_machine = Machine.objects.create(name='Snacks', location=self.mall, machine_type='Snack')
+        entry.visit_machine_restock = VisitMachineRestock.objects.create(visit=other_visit, machine=other_machine)
+        entry.save()
+        self.assertEntryMatches(other_visit.visit_date, other_machine, self.mall)
+
+    def test_date_window_filters_without_joins(self):
+        entries = RestockEntry.objects.filter(
+            location_id=self.office.id, visit_date__gte=timezone.now() - timedelta(days=7)
+        )
+        self.assertNotIn('JOIN', str(entries.query))
+        self.assertEqual(entries.count(), 1)
+
+    def test_backfill_migration(self):
+        RestockEntry.objects.update(visit_date=None, machine=None, location=None)
+        migration = importlib.import_module('core.migrations.0012_restock_entry_denormalized')
+        migration.backfill_denormalized_fields(apps, connection.schema_editor())
+        self.assertEntryMatches(self.visit.visit_date, self.machine, self.office)
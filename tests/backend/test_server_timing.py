@@ -0,0 +1,113 @@
+import os
+import sys
+import django
+import json
+import re
+
+# Add the backend directory to the Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'backend'))
+
+# Set up Django
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'vendingapp.settings')
+django.setup()
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APITestCase
+
+from core.models import Location, Machine, Product
+from core.query_timing import time_query
+
+
+def parse_server_timing(header):
+    metrics = {}
+    for metric in header.split(', '):
+        name, *params = metric.split(';')
+        metrics[name] = dict(re.match(r'(\w+)=(.*)', param).groups() for param in params)
+    return metrics
+
+
+@override_settings(SERVER_TIMING_LOG_SAMPLE_RATE=0, SERVER_TIMING_SLOW_MS=60000)
+class ServerTimingTest(APITestCase):
+    """Test the Server-Timing header and request timing log lines"""
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username='timer', password='testpass123', is_staff=True)
+        self.client.force_authenticate(user=self.user)
+        location = Location.objects.create(name='Office', address='1 Main St', route='A')
+        Machine.objects.create(name='Combo', location=location, machine_type='Combo')
+        Product.objects.create(name='Coke', inventory_quantity=100)
+
+    def test_header_counts_queries(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get('/api/products/')
+        metrics = parse_server_timing(response['Server-Timing'])
+        self.assertEqual(metrics['db']['desc'], f'"{len(queries.captured_queries)} queries"')
+        self.assertIn('render', metrics)
+        self.assertIn('total', metrics)
+
+    def test_one_wrapper_times_every_statement(self):
+        self.client.get('/api/products/')
+        # Request timing, metrics and the slow query log share it
+        self.assertEqual(connection.execute_wrappers, [time_query])
+
+    def test_analytics_cache_miss_then_hit(self):
+        first = parse_server_timing(self.client.get('/api/inventory/current-stock/')['Server-Timing'])
+        self.assertEqual(first['cache']['desc'], '"hit=0 miss=1"')
+        self.assertIn('compute', first)
+
+        second = parse_server_timing(self.client.get('/api/inventory/current-stock/')['Server-Timing'])
+        self.assertEqual(second['cache']['desc'], '"hit=1 miss=0"')
+        self.assertNotIn('compute', second)
+        self.assertEqual(second['db']['desc'], '"0 queries"')
+
+    def test_batch_sub_requests_are_counted(self):
+        response = self.client.post('/api/batch/', {'requests': [
+            {'id': 'products', 'url': '/products/'},
+            {'id': 'locations', 'url': '/locations/'},
+        ]}, format='json')
+        self.assertEqual(response.status_code, 200)
+        metrics = parse_server_timing(response['Server-Timing'])
+        self.assertNotEqual(metrics['db']['desc'], '"0 queries"')
+
+    @override_settings(SERVER_TIMING_LOG_SAMPLE_RATE=1)
+    def test_sampled_requests_are_logged(self):
+        with self.assertLogs('core.server_timing', level='INFO') as logs:
+            self.client.get('/api/products/?page=1')
+        line = json.loads(logs.records[0].getMessage())
+        self.assertEqual(line['event'], 'request_timing')
+        self.assertEqual(line['path'], '/api/products/')
+        self.assertEqual(line['query'], 'page=1')
+        self.assertEqual(line['status'], 200)
+        self.assertGreater(line['db_queries'], 0)
+
+    @override_settings(SERVER_TIMING_LOG_SAMPLE_RATE=1)
+    def test_credentials_are_not_logged(self):
+        with self.assertLogs('core.server_timing', level='INFO') as logs:
+            self.client.get('/api/products/?search=coke&token=eyJhbGciOi.x.y&api_key=secret&Password=1')
+        line = json.loads(logs.records[0].getMessage())
+        self.assertEqual(line['query'], 'search=coke')
+
+    def test_unsampled_fast_requests_are_not_logged(self):
+        with self.assertNoLogs('core.server_timing', level='INFO'):
+            self.client.get('/api/products/')
+
+    @override_settings(SERVER_TIMING_SLOW_MS=0)
+    def test_slow_requests_are_always_logged(self):
+        with self.assertLogs('core.server_timing', level='INFO'):
+            self.client.get('/api/products/')
+
+    def test_header_is_only_shown_to_staff(self):
+        self.client.force_authenticate(user=User.objects.create_user(username='driver', password='testpass123'))
+        self.assertNotIn('Server-Timing', self.client.get('/api/products/'))
+        self.client.force_authenticate(user=None)
+        self.assertNotIn('Server-Timing', self.client.get('/api/products/'))
+
+    @override_settings(SERVER_TIMING_HEADER=True)
+    def test_header_can_be_shown_to_everyone(self):
+        self.client.force_authenticate(user=None)
+        self.assertIn('Server-Timing', self.client.get('/api/products/'))
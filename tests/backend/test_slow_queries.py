@@ -0,0 +1,120 @@
+import os
+import sys
+import django
+import json
+import tempfile
+from io import StringIO
+
+# Add the backend directory to the Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'backend'))
+
+# Set up Django
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'vendingapp.settings')
+django.setup()
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.test import SimpleTestCase, override_settings
+from rest_framework.test import APITestCase
+
+from core import slow_queries
+from core.models import Product
+from core.query_timing import query_observer
+from core.slow_queries import fingerprint, fingerprint_id, log_slow_query
+
+
+class FingerprintTest(SimpleTestCase):
+    """Test statement normalization"""
+
+    def test_literals_and_parameters_are_replaced(self):
+        self.assertEqual(
+            fingerprint("SELECT * FROM core_product WHERE name = 'Coke' AND id > 10 AND price < %s"),
+            'SELECT * FROM core_product WHERE name = ? AND id > ? AND price < ?'
+        )
+
+    def test_in_lists_of_any_length_match(self):
+        short = fingerprint('SELECT * FROM core_product WHERE id IN (%s, %s)')
+        long = fingerprint('SELECT * FROM core_product WHERE id IN (%s, %s, %s, %s)')
+        self.assertEqual(short, long)
+        self.assertEqual(fingerprint_id(short), fingerprint_id(long))
+
+
+@override_settings(SLOW_QUERY_THRESHOLD_MS=0, SLOW_QUERY_EXPLAIN_SAMPLE_RATE=1)
+class SlowQueryLogTest(APITestCase):
+    """Test logging of slow statements with their view and sampled plans"""
+
+    def setUp(self):
+        slow_queries._explained_at.clear()
+        self.user = User.objects.create_user(username='slow', password='testpass123')
+        self.client.force_authenticate(user=self.user)
+        Product.objects.create(name='Coke', inventory_quantity=100)
+
+    def logged(self):
+        with self.assertLogs('core.slow_queries', level='WARNING') as logs, \
+                query_observer(log_slow_query):
+            self.client.get('/api/products/')
+        return [json.loads(record.getMessage()) for record in logs.records]
+
+    def test_statements_name_their_view(self):
+        lines = self.logged()
+        product_queries = [line for line in lines if 'core_product' in line['sql']]
+        self.assertTrue(product_queries)
+        self.assertEqual(product_queries[0]['view'], 'product-list')
+        self.assertGreaterEqual(product_queries[0]['duration_ms'], 0)
+
+    def test_sampled_select_has_plan(self):
+        selects = [line for line in self.logged() if line['sql'].startswith('SELECT')]
+        self.assertTrue(any(line.get('plan') for line in selects))
+
+    def test_each_fingerprint_is_explained_once_per_interval(self):
+        self.logged()
+        second = [line for line in self.logged() if line['sql'].startswith('SELECT')]
+        self.assertFalse(any('plan' in line for line in second))
+
+    @override_settings(SLOW_QUERY_THRESHOLD_MS=60000)
+    def test_fast_statements_are_not_logged(self):
+        with self.assertNoLogs('core.slow_queries', level='WARNING'), query_observer(log_slow_query):
+            self.client.get('/api/products/')
+
+
+class SlowQueryReportTest(SimpleTestCase):
+    """Test the slow_query_report command"""
+
+    def setUp(self):
+        records = [
+            {'fingerprint_id': 'a', 'fingerprint': 'SELECT a', 'duration_ms': 300, 'view': 'product-list'},
+            {'fingerprint_id': 'a', 'fingerprint': 'SELECT a', 'duration_ms': 500, 'view': 'product-list',
+             'plan': 'SCAN core_product'},
+            {'fingerprint_id': 'b', 'fingerprint': 'SELECT b', 'duration_ms': 700, 'view': 'dashboard'},
+        ]
+        log = tempfile.NamedTemporaryFile('w', suffix='.log', delete=False)
+        with log:
+            log.write('INFO unrelated line\n')
+            for record in records:
+                log.write('WARNING ' + json.dumps({'event': 'slow_query', 'sql': record['fingerprint'], **record}) + '\n')
+        self.path = log.name
+        self.addCleanup(os.unlink, self.path)
+
+    def report(self, *args):
+        out = StringIO()
+        call_command('slow_query_report', self.path, '--json', *args, stdout=out)
+        return json.loads(out.getvalue())
+
+    def test_ranked_by_total_time(self):
+        report = self.report()
+        self.assertEqual([stats['fingerprint_id'] for stats in report], ['a', 'b'])
+        self.assertEqual(report[0]['count'], 2)
+        self.assertEqual(report[0]['total_ms'], 800)
+        self.assertEqual(report[0]['max_ms'], 500)
+        self.assertEqual(report[0]['views'], {'product-list': 2})
+        self.assertEqual(report[0]['plan'], 'SCAN core_product')
+
+    def test_top_and_sort(self):
+        report = self.report('--sort', 'max', '--top', '1')
+        self.assertEqual([stats['fingerprint_id'] for stats in report], ['b'])
+
+    def test_text_report(self):
+        out = StringIO()
+        call_command('slow_query_report', self.path, '--plans', stdout=out)
+        self.assertIn('[a] 2x, total 800ms', out.getvalue())
+        self.assertIn('SCAN core_product', out.getvalue())
@@ -0,0 +1,98 @@
+import os
+import sys
+import django
+from decimal import Decimal
+
+# Add the backend directory to the Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'backend'))
+
+# Set up Django
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'vendingapp.settings')
+django.setup()
+
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APITestCase
+from rest_framework import status
+
+from core.models import (
+    Location, Machine, Product, MachineItemPrice, WholesalePurchase, ProductCost,
+    Visit, VisitMachineRestock, RestockEntry
+)
+
+
+class SparseFieldsetTest(APITestCase):
+    """?fields= and ?omit= trim both the response and the queries behind it"""
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='sparse', password='testpass123')
+        self.client.force_authenticate(user=self.user)
+
+        location = Location.objects.create(name='Office', address='1 Main St', route='A')
+        self.machine = Machine.objects.create(name='M1', location=location, machine_type='Snack')
+        self.products = [Product.objects.create(name=f'Product {i}', inventory_quantity=5) for i in range(5)]
+        for product in self.products:
+            purchase = WholesalePurchase.objects.create(
+                product=product, quantity=10, total_cost=Decimal('5.00'), purchased_at=timezone.now()
+            )
+            ProductCost.objects.filter(purchase=purchase).update(unit_cost=Decimal('0.60'))
+            MachineItemPrice.objects.create(machine=self.machine, product=product, price=Decimal('1.00'), slot=1)
+
+        visit = Visit.objects.create(location=location, user=self.user, visit_date=timezone.now())
+        restock = VisitMachineRestock.objects.create(visit=visit, machine=self.machine)
+        RestockEntry.objects.bulk_create(
+            RestockEntry(visit_machine_restock=restock, product=product, stock_before=1, restocked=4)
+            for product in self.products
+        )
+
+    def get(self, url):
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response, [query['sql'] for query in context.captured_queries]
+
+    def test_product_dropdown_fields(self):
+        response, queries = self.get('/api/products/all/?fields=id,name')
+        self.assertEqual(set(response.data[0]), {'id', 'name'})
+        self.assertEqual(len(queries), 1)
+        self.assertNotIn('inventory_quantity', queries[0])
+        self.assertNotIn('core_wholesalepurchase', queries[0])
+
+    def test_product_costs_are_annotated(self):
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get('/api/products/all/')
+        self.assertEqual(len(context.captured_queries), 1)
+
+        product = Product.objects.get(id=response.data[0]['id'])
+        self.assertEqual(response.data[0]['average_cost'], product.average_cost)
+        self.assertEqual(response.data[0]['latest_cost'], product.latest_unit_cost)
+        self.assertEqual(response.data[0]['latest_cost'], Decimal('0.60'))
+        self.assertEqual(response.data[0]['cost_price'], Decimal('0.60'))
+
+    def test_omit_skips_annotation(self):
+        response, queries = self.get('/api/machine-items/?omit=profit_margin,machine_info')
+        self.assertNotIn('profit_margin', response.data['results'][0])
+        self.assertIn('product_name', response.data['results'][0])
+        self.assertEqual(len(queries), 2)  # page count + rows
+        self.assertNotIn('core_wholesalepurchase', queries[1])
+        self.assertNotIn('"core_location"."address"', queries[1])
+
+    def test_history_rows_without_joins(self):
+        response, queries = self.get('/api/purchases/?fields=id,quantity,total_cost')
+        self.assertEqual(set(response.data['results'][0]), {'id', 'quantity', 'total_cost'})
+        self.assertEqual(len(queries), 1)
+        self.assertNotIn('core_product', queries[0])
+
+        response, queries = self.get('/api/restock-entries/?omit=slot')
+        self.assertNotIn('slot', response.data['results'][0])
+        self.assertEqual(response.data['results'][0]['product_name'], 'Product 4')  # newest id first
+        self.assertEqual(len(queries), 1)
+
+    def test_writes_return_every_field(self):
+        response = self.client.post('/api/locations/?fields=id', {
+            'name': 'School', 'address': '2 Main St', 'route': 'B'
+        }, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data['name'], 'School')
@@ -0,0 +1,147 @@
+import os
+import sys
+import time
+import django
+from decimal import Decimal
+from datetime import timedelta
+
+# Add the backend directory to the Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'backend'))
+
+# Set up Django
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'vendingapp.settings')
+django.setup()
+
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APITestCase
+
+from core.models import (
+    Location, Machine, Product, MachineItemPrice, WholesalePurchase, ProductCost,
+    Visit, VisitMachineRestock, RestockEntry
+)
+from core.views import ProductViewSet, MachineItemPriceViewSet, RestockEntryViewSet
+
+
+class ValuesSerializerEquivalenceTest(APITestCase):
+    """The values() list path returns byte-identical JSON to the ModelSerializer path"""
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='equal', password='testpass123')
+        self.client.force_authenticate(user=self.user)
+
+        routed = Location.objects.create(name='Office', address='1 Main St', route='A')
+        unrouted = Location.objects.create(name='School', address='2 Main St')
+        machines = [
+            Machine.objects.create(name='Snack 1', location=routed, machine_type='Snack', model='X1'),
+            Machine.objects.create(name='Combo 1', location=unrouted, machine_type='Combo'),
+        ]
+
+        now = timezone.now().replace(microsecond=123456)
+        products = [
+            Product.objects.create(name='Coke', product_type='Soda', inventory_quantity=12),
+            Product.objects.create(name='Chips', product_type='Snack', image_url='https://example.com/c.png'),
+            Product.objects.create(name='Gum', product_type='Snack'),  # no purchases or costs
+        ]
+        for days_ago, (quantity, total) in enumerate([(24, '12.00'), (7, '10.00')]):
+            for product in products[:2]:
+                WholesalePurchase.objects.create(
+                    product=product, quantity=quantity, total_cost=Decimal(total),
+                    purchased_at=now - timedelta(days=days_ago)
+                )
+        # a product whose latest cost record is zero falls back to the average cost
+        ProductCost.objects.filter(product=products[1]).update(unit_cost=Decimal('0.00'))
+
+        for machine in machines:
+            for slot, product in enumerate(products, start=1):
+                MachineItemPrice.objects.create(
+                    machine=machine, product=product, price=Decimal('1.25') if slot != 3 else Decimal('0'),
+                    slot=slot, current_stock=None if slot == 2 else slot
+                )
+
+        for days_ago in range(3):
+            visit = Visit.objects.create(location=routed, user=self.user, visit_date=now - timedelta(days=days_ago))
+            for machine in machines:
+                restock = VisitMachineRestock.objects.create(visit=visit, machine=machine)
+                RestockEntry.objects.bulk_create(
+                    RestockEntry(visit_machine_restock=restock, product=product, stock_before=1,
+                                 discarded=days_ago, restocked=5)
+                    for product in products
+                )
+        # an entry for a product the machine no longer carries has no slot
+        MachineItemPrice.objects.filter(machine=machines[1], product=products[2]).delete()
+
+    def assertSameJSON(self, viewset, url):
+        fast = self.client.get(url)
+        original = viewset.values_serializer_class
+        viewset.values_serializer_class = None
+        try:
+            slow = self.client.get(url)
+        finally:
+            viewset.values_serializer_class = original
+        self.assertEqual(fast.status_code, 200)
+        self.assertEqual(fast.content, slow.content)
+
+    def test_products(self):
+        for url in ['/api/products/', '/api/products/all/', '/api/products/all/?fields=id,name,cost_price',
+                    '/api/products/?omit=average_cost&product_type=Snack']:
+            with self.subTest(url=url):
+                self.assertSameJSON(ProductViewSet, url)
+
+    def test_machine_items(self):
+        for url in ['/api/machine-items/', '/api/machine-items/?page_size=2&page=2',
+                    '/api/machine-items/?fields=id,price,profit_margin']:
+            with self.subTest(url=url):
+                self.assertSameJSON(MachineItemPriceViewSet, url)
+
+    def test_restock_entries(self):
+        for url in ['/api/restock-entries/', '/api/restock-entries/?page_size=4&count=true',
+                    '/api/restock-entries/?omit=slot,visit_date']:
+            with self.subTest(url=url):
+                self.assertSameJSON(RestockEntryViewSet, url)
+
+    def test_restock_entries_use_values_path(self):
+        with CaptureQueriesContext(connection) as context:
+            self.client.get('/api/restock-entries/')
+        # one values() query with the slot subquery instead of a prefetch
+        self.assertEqual(len(context.captured_queries), 1)
+        self.assertIn('machine_slot', context.captured_queries[0]['sql'])
+
+    def test_cursor_pages_match(self):
+        next_url = self.client.get('/api/restock-entries/?page_size=5').data['next']
+        self.assertSameJSON(RestockEntryViewSet, next_url)
+
+
+class ValuesSerializerSpeedTest(APITestCase):
+    """Rendering 1000 rows from values() is much cheaper than the ModelSerializer"""
+
+    def test_machine_items_render_time(self):
+        location = Location.objects.create(name='Office', address='1 Main St', route='A')
+        products = [Product.objects.create(name=f'Product {i}') for i in range(50)]
+        for i in range(20):
+            machine = Machine.objects.create(name=f'M{i}', location=location, machine_type='Combo')
+            MachineItemPrice.objects.bulk_create(
+                MachineItemPrice(machine=machine, product=product, price=Decimal('1.50'), slot=slot)
+                for slot, product in enumerate(products)
+            )
+
+        queryset = MachineItemPrice.objects.select_related('product', 'machine__location').annotate(
+            **Product.purchase_total_annotations('product')
+        )
+        instances = list(queryset)
+        values_serializer = MachineItemPriceViewSet.values_serializer_class()
+        rows = list(values_serializer.values(queryset))
+
+        def best_of(function, runs=3):
+            timings = []
+            for _ in range(runs):
+                start = time.perf_counter()
+                function()
+                timings.append(time.perf_counter() - start)
+            return min(timings)
+
+        slow = best_of(lambda: MachineItemPriceViewSet.serializer_class(instances, many=True).data)
+        fast = best_of(lambda: values_serializer.render(rows))
+        self.assertLess(fast * 2, slow)
@@ -0,0 +1,83 @@
+import os
+import sys
+import django
+from decimal import Decimal
+
+# Add the backend directory to the Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'backend'))
+
+# Set up Django
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'vendingapp.settings')
+django.setup()
+
+from django.contrib.auth.models import User
+from django.utils import timezone
+from rest_framework.test import APITestCase
+from rest_framework import status
+
+from core.models import Location, Machine, Product, MachineItemPrice, Visit, VisitMachineRestock, RestockEntry
+
+
+class VisitFullTest(APITestCase):
+    """Test the visits/{id}/full/ endpoint"""
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='driver', password='testpass123')
+        self.client.force_authenticate(user=self.user)
+
+        self.location = Location.objects.create(name='Office', address='1 Main St', route='A')
+        self.products = [Product.objects.create(name=f'Product {i}') for i in range(3)]
+        self.visit = Visit.objects.create(location=self.location, user=self.user, visit_date=timezone.now())
+        self.url = f'/api/visits/{self.visit.id}/full/'
+
+    def add_machine_restocks(self, count):
+        for i in range(count):
+            machine = Machine.objects.create(
+                name=f'Machine {Machine.objects.count()}', location=self.location, machine_type='Snack', model='X1'
+            )
+            for slot, product in enumerate(self.products, start=1):
+                MachineItemPrice.objects.create(
+                    machine=machine, product=product, price=Decimal('1.50'), slot=slot, current_stock=10
+                )
+            restock = VisitMachineRestock.objects.create(visit=self.visit, machine=machine)
+            RestockEntry.objects.bulk_create(
+                RestockEntry(visit_machine_restock=restock, product=product, stock_before=2, discarded=1, restocked=9)
+                for product in self.products
+            )
+
+    def test_nested_response(self):
+        self.add_machine_restocks(2)
+
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['id'], self.visit.id)
+        self.assertEqual(response.data['location_name'], 'Office')
+        self.assertEqual(len(response.data['machine_restocks']), 2)
+
+        restock = response.data['machine_restocks'][0]
+        self.assertEqual(restock['machine_name'], 'Machine 0')
+        self.assertEqual(restock['machine_model'], 'X1')
+        self.assertEqual(len(restock['entries']), 3)
+
+        entry = restock['entries'][1]
+        self.assertEqual(entry['product'], self.products[1].id)
+        self.assertEqual(entry['product_name'], 'Product 1')
+        self.assertEqual(entry['slot'], 2)
+        self.assertEqual(entry['price'], '1.50')
+        self.assertEqual(entry['current_stock'], 10)
+        self.assertEqual(entry['restocked'], 9)
+
+    def test_entry_without_machine_item(self):
+        self.add_machine_restocks(1)
+        MachineItemPrice.objects.filter(product=self.products[0]).delete()
+
+        entry = self.client.get(self.url).data['machine_restocks'][0]['entries'][0]
+        self.assertIsNone(entry['slot'])
+        self.assertIsNone(entry['price'])
+
+    def test_query_count_does_not_grow_with_machines(self):
+        self.add_machine_restocks(8)
+        # visit, machine restocks, entries, item prices
+        with self.assertNumQueries(4):
+            response = self.client.get(self.url)
+        self.assertEqual(len(response.data['machine_restocks']), 8)